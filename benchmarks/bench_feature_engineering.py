@@ -0,0 +1,90 @@
+"""
+Rows/sec of ``util.feature_engineering.feature_engineering`` before and after
+vectorizing the row-wise ``DataFrame.apply`` features.
+
+"before" replays the five original ``df.apply(..., axis=1)`` expressions on
+the intermediate frame; "after" runs the vectorized replacements on the same
+frame.  The full function is timed as well.
+
+Usage:
+    python -m benchmarks.bench_feature_engineering --sizes 100000 1000000 10000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_hotel_bookings
+from util.feature_engineering import (
+    NO_MEAL_TYPES,
+    SPECIAL_DAYS,
+    _is_special_day,
+    feature_engineering,
+)
+
+
+def _prepare(df):
+    # Columns the row-wise features read, built the same way feature_engineering does
+    month_mapping = {m: i for i, m in enumerate(
+        ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+         'August', 'September', 'October', 'November', 'December'], start=1)}
+    arrival = pd.to_datetime(
+        df['arrival_date_year'].astype(str) + '-' + df['arrival_date_month'] + '-'
+        + df['arrival_date_day_of_month'].astype(str))
+    booking = arrival - pd.to_timedelta(df['lead_time'], unit='d')
+    df['booking_date_month_integer_version'] = booking.dt.month
+    df['booking_date_day_of_month'] = booking.dt.day
+    df['arrival_date_month_integer_version'] = df['arrival_date_month'].map(month_mapping)
+    df['total_previous_bookings'] = df['previous_cancellations'] + df['previous_bookings_not_canceled']
+    return df
+
+
+def _rowwise(df):
+    df.apply(lambda x: int((x['booking_date_month_integer_version'], x['booking_date_day_of_month']) in SPECIAL_DAYS), axis=1)
+    df.apply(lambda x: int((x['arrival_date_month_integer_version'], x['arrival_date_day_of_month']) in SPECIAL_DAYS), axis=1)
+    df.apply(lambda x: (x['previous_cancellations'] / x['total_previous_bookings'] * 100)
+             if x['total_previous_bookings'] > 0 else 0, axis=1)
+    df.apply(lambda x: (x['meal'] in NO_MEAL_TYPES) and ((x['stays_in_weekend_nights'] + x['stays_in_week_nights']) > 3),
+             axis=1).astype(int)
+    df.apply(lambda x: ((x['children'] + x['babies']) > 0) and (x['meal'] in NO_MEAL_TYPES), axis=1).astype(int)
+
+
+def _vectorized(df):
+    _is_special_day(df['booking_date_month_integer_version'], df['booking_date_day_of_month'])
+    _is_special_day(df['arrival_date_month_integer_version'], df['arrival_date_day_of_month'])
+    previous_cancellations = df['previous_cancellations'].to_numpy(dtype=np.float64)
+    total_previous_bookings = df['total_previous_bookings'].to_numpy(dtype=np.float64)
+    percentage = np.zeros(len(df), dtype=np.float64)
+    np.divide(previous_cancellations, total_previous_bookings, out=percentage, where=total_previous_bookings > 0)
+    no_meal = df['meal'].isin(NO_MEAL_TYPES)
+    (no_meal & ((df['stays_in_weekend_nights'] + df['stays_in_week_nights']) > 3)).astype(int)
+    (((df['children'] + df['babies']) > 0) & no_meal).astype(int)
+
+
+def _rate(fn, df):
+    start = time.perf_counter()
+    fn(df)
+    return len(df) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--rowwise-limit", type=int, default=1_000_000,
+                        help="skip the row-wise baseline above this many rows (it takes minutes)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'rowwise rows/s':>16} {'vectorized rows/s':>18} {'speedup':>9} {'full fe rows/s':>16}")
+    for n in args.sizes:
+        df = _prepare(make_hotel_bookings(n))
+        before = _rate(_rowwise, df) if n <= args.rowwise_limit else float("nan")
+        after = _rate(_vectorized, df)
+        full = _rate(feature_engineering, make_hotel_bookings(n))
+        speedup = f"{after / before:>8.0f}x" if before == before else f"{'n/a':>9}"
+        rowwise = f"{before:>16,.0f}" if before == before else f"{'n/a':>16}"
+        print(f"{n:>12,} {rowwise} {after:>18,.0f} {speedup} {full:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
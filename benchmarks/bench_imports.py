@@ -0,0 +1,87 @@
+"""
+Import-time benchmark for the ``util`` modules, the visualization module
+and the command-line entry points.
+
+Every module is imported in a fresh interpreter (``python -c "import ..."``),
+so nothing is shared with earlier measurements.  Two times are reported:
+
+- total: the whole import, including pandas / NumPy;
+- own: the import after pandas and NumPy are already loaded, i.e. what the
+  module adds on top of the libraries every worker needs anyway.
+
+The heavy libraries that ended up in ``sys.modules`` are listed as well, so
+an eager sklearn / matplotlib import sneaking back in shows up directly:
+
+    python -m benchmarks.bench_imports
+    python -m benchmarks.bench_imports --modules util.scoring --max-own-ms 50
+
+With ``--max-own-ms`` the exit status is 1 if any module's own import time
+exceeds the limit.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "util.feature_engineering",
+    "util.encode",
+    "util.data_cleaning",
+    "util.handle_outlier",
+    "util.data_scaling",
+    "util.split",
+    "util.smote_function",
+    "util.preprocessor",
+    "util.scoring",
+    "util.booking_cube",
+    "util.daily_trends",
+    "some_visualization_functions",
+    "scoring_service",
+    "eda_report",
+]
+HEAVY = ["sklearn", "scipy", "imblearn", "joblib", "matplotlib", "seaborn", "xgboost"]
+
+_PROBE = """
+import sys, time
+{preload}
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def time_import(module, preload=False, repeat=5):
+    # best-of-repeat import time (seconds) in fresh interpreters, and the heavy modules it loaded
+    code = _PROBE.format(module=module, heavy=HEAVY, preload="import numpy, pandas" if preload else "")
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        elapsed, _, loaded = out.stdout.strip().partition(" ")
+        times.append(float(elapsed))
+    return min(times), statistics.median(times), loaded.split(",") if loaded else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module; the best run is kept")
+    parser.add_argument("--max-own-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    print(f"{'module':<32}{'total ms':>10}{'own ms':>10}  heavy imports")
+    slow = []
+    for module in args.modules:
+        total, _, _ = time_import(module, repeat=args.repeat)
+        own, _, loaded = time_import(module, preload=True, repeat=args.repeat)
+        print(f"{module:<32}{total * 1000:>10.1f}{own * 1000:>10.1f}  {', '.join(loaded) or '-'}")
+        if args.max_own_ms is not None and own * 1000 > args.max_own_ms:
+            slow.append(module)
+
+    if slow:
+        print(f"\nover {args.max_own_ms:g} ms: {', '.join(slow)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Throughput and memory benchmark for every ``util`` stage and the full
+``main.py`` pipeline, on synthetic hotel-booking frames of several sizes.
+
+Each stage is timed on the output of the previous one (inputs are prepared
+and copied outside the timed region).  Peak memory is the tracemalloc peak
+of a separate call, which covers NumPy and pandas buffers; tracing is off
+while timing because it slows Python-level code down considerably.
+
+Results are written as JSON (one file per run, named after the git commit)
+so runs can be compared across commits:
+
+    python -m benchmarks.bench_stages --sizes 100000 1000000
+    python -m benchmarks.bench_stages --sizes 100000 --compare benchmarks/results/<old>.json
+
+With ``--compare`` the exit status is 1 if any stage got slower than
+``--tolerance`` (default 1.2x) or used more than ``--tolerance`` times the
+memory of the baseline.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from benchmarks.synthetic import make_hotel_bookings
+from util.feature_engineering import feature_engineering
+from util.encode import encode, ONEHOT_COLS, FREQUENCY_COLS, CIRCULAR_COLS
+from util.split import split_df
+from util.data_cleaning import data_cleaning
+from util.handle_outlier import handle_outlier
+from util.data_scaling import scale
+from util.preprocessor import BookingPreprocessor
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _time(fn, data):
+    # wall time of one call on a fresh copy of data
+    frame = data.copy()
+    start = time.perf_counter()
+    fn(frame)
+    return time.perf_counter() - start
+
+
+def _peak_memory(fn, data):
+    # bytes allocated at the peak of one call on a fresh copy of data
+    frame = data.copy()
+    tracemalloc.start()
+    fn(frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def _pipeline(raw):
+    # the main.py flow without file IO
+    train_data, temp_test_data = split_df(raw, test_size=0.30, random_state=42)
+    val_data, holdout_test_data = split_df(temp_test_data, test_size=0.50, random_state=42)
+    preprocessor = BookingPreprocessor(scaling_method="minmax")
+    return (
+        preprocessor.fit_transform(train_data),
+        preprocessor.transform(val_data),
+        preprocessor.transform(holdout_test_data),
+    )
+
+
+def run_stages(n_rows, repeat=1, seed=0):
+    """
+    Benchmark every stage on *n_rows* synthetic bookings.
+
+    Returns
+    -------
+    list[dict]
+        One record per stage: stage, rows (*n_rows*, the dataset size),
+        stage_rows (rows of the frame the stage processed: the ~70 % training
+        split for data_cleaning, handle_outlier and scale), seconds (best of
+        *repeat*), rows_per_sec (stage_rows / seconds), peak_mb.
+    """
+    raw = make_hotel_bookings(n_rows, seed=seed)
+
+    engineered = feature_engineering(raw.copy())
+    onehot = encode(engineered, method="onehot", columns=ONEHOT_COLS)
+    frequency = encode(onehot, method="frequency", columns=FREQUENCY_COLS)
+    encoded = encode(frequency, method="circular", columns=CIRCULAR_COLS)
+    train, _ = split_df(encoded, test_size=0.30, random_state=42)
+    cleaned = data_cleaning(train_df=train.copy(), df=train.copy())
+    filtered = handle_outlier(cleaned)
+
+    # (stage name, callable run on a copy of its input, input)
+    stages = [
+        ("feature_engineering", lambda df: feature_engineering(df), raw),
+        ("encode_onehot", lambda df: encode(df, method="onehot", columns=ONEHOT_COLS), engineered),
+        ("encode_frequency", lambda df: encode(df, method="frequency", columns=FREQUENCY_COLS), onehot),
+        ("encode_circular", lambda df: encode(df, method="circular", columns=CIRCULAR_COLS), frequency),
+        ("split_df", lambda df: split_df(df, test_size=0.30, random_state=42), encoded),
+        ("data_cleaning", lambda df: data_cleaning(train_df=df, df=df), train),
+        ("handle_outlier", lambda df: handle_outlier(df), cleaned),
+        ("scale", lambda df: scale(df, method="minmax"), filtered),
+        ("pipeline", _pipeline, raw),
+    ]
+
+    records = []
+    for name, fn, data in stages:
+        seconds = min(_time(fn, data) for _ in range(repeat))
+        peak = _peak_memory(fn, data)
+        records.append({
+            "stage": name,
+            "rows": n_rows,
+            "stage_rows": len(data),
+            "seconds": seconds,
+            "rows_per_sec": len(data) / seconds,
+            "peak_mb": peak / 2**20,
+        })
+    return records
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, baseline, tolerance):
+    """
+    Print current vs. baseline per (stage, rows) and return the regressions.
+    """
+    base = {(r["stage"], r["rows"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\n{'stage':<22} {'rows':>11} {'time x':>8} {'memory x':>9}")
+    for record in current["results"]:
+        old = base.get((record["stage"], record["rows"]))
+        if old is None:
+            continue
+        time_ratio = record["seconds"] / old["seconds"]
+        memory_ratio = record["peak_mb"] / old["peak_mb"] if old["peak_mb"] else 1.0
+        flag = "  <-- regression" if time_ratio > tolerance or memory_ratio > tolerance else ""
+        print(f"{record['stage']:<22} {record['rows']:>11,} {time_ratio:>8.2f} {memory_ratio:>9.2f}{flag}")
+        if flag:
+            regressions.append(record["stage"])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=1, help="runs per stage; the best one is kept")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="baseline result file")
+    parser.add_argument("--tolerance", type=float, default=1.2)
+    args = parser.parse_args()
+
+    commit = _git_commit()
+    print(f"{'stage':<22} {'rows':>11} {'stage rows':>11} {'seconds':>9} {'rows/s':>13} {'peak MB':>9}")
+    results = []
+    for n_rows in args.sizes:
+        for record in run_stages(n_rows, repeat=args.repeat):
+            print(f"{record['stage']:<22} {record['rows']:>11,} {record['stage_rows']:>11,} {record['seconds']:>9.3f} "
+                  f"{record['rows_per_sec']:>13,.0f} {record['peak_mb']:>9.1f}")
+            results.append(record)
+
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": {"numpy": np.__version__, "pandas": pd.__version__, "sklearn": sklearn.__version__},
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nresults written to {output}")
+
+    if args.compare is not None:
+        regressions = compare(report, json.loads(args.compare.read_text()), args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
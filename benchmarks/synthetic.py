@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+# Categories and rough frequencies observed in hotel_bookings.csv
+HOTELS = (["City Hotel", "Resort Hotel"], [0.66, 0.34])
+MEALS = (["BB", "HB", "SC", "Undefined", "FB"], [0.77, 0.12, 0.09, 0.01, 0.01])
+MARKET_SEGMENTS = (
+    ["Online TA", "Offline TA/TO", "Groups", "Direct", "Corporate", "Complementary", "Aviation"],
+    [0.47, 0.20, 0.17, 0.11, 0.04, 0.006, 0.004],
+)
+DISTRIBUTION_CHANNELS = (["TA/TO", "Direct", "Corporate", "GDS", "Undefined"], [0.82, 0.12, 0.055, 0.004, 0.001])
+ROOM_TYPES = (["A", "D", "E", "F", "G", "B", "C", "H", "L", "P"],
+              [0.72, 0.16, 0.055, 0.024, 0.018, 0.009, 0.008, 0.005, 0.0005, 0.0005])
+DEPOSIT_TYPES = (["No Deposit", "Non Refund", "Refundable"], [0.876, 0.122, 0.002])
+CUSTOMER_TYPES = (["Transient", "Transient-Party", "Contract", "Group"], [0.75, 0.21, 0.035, 0.005])
+COUNTRIES = (["PRT", "GBR", "FRA", "ESP", "DEU", "ITA", "IRL", "BEL", "BRA", "NLD", "USA", "CHE", "CN", "AUT", "SWE"],
+             [0.41, 0.10, 0.09, 0.07, 0.06, 0.035, 0.03, 0.02, 0.02, 0.02, 0.02, 0.015, 0.013, 0.011, 0.131])
+AGENTS = ([9.0, 240.0, 1.0, 14.0, 7.0, 6.0, 250.0, 241.0, 28.0, 8.0, 3.0, 37.0, 19.0, 40.0, 314.0],
+          [0.27, 0.12, 0.06, 0.03, 0.03, 0.03, 0.025, 0.015, 0.014, 0.013, 0.012, 0.01, 0.01, 0.009, 0.349])
+
+
+def _choice(rng, spec, size):
+    values, p = spec
+    p = np.asarray(p, dtype=float)
+    return rng.choice(np.asarray(values, dtype=object), size=size, p=p / p.sum())
+
+
+def make_hotel_bookings(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a synthetic frame with the schema of ``hotel_bookings.csv``.
+
+    Column names, dtypes and missing-value patterns (NaN in ``children``,
+    ``country``, ``agent`` and ``company``) follow the Kaggle file so that
+    every ``util`` stage runs on it unchanged.  Values are drawn from rough
+    marginal distributions of the real data; they are meant for timing and
+    memory measurements, not for modelling.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of bookings to generate.
+    seed : int, default=0
+        Seed for the random generator.
+
+    Returns
+    -------
+    pd.DataFrame
+        Synthetic bookings with the 32 raw columns.
+    """
+    rng = np.random.default_rng(seed)
+
+    start = np.datetime64("2015-07-01")
+    arrival = start + rng.integers(0, 793, size=n_rows).astype("timedelta64[D]")
+    arrival = pd.DatetimeIndex(arrival)
+    lead_time = np.minimum(rng.exponential(100, size=n_rows).astype(np.int64), 737)
+
+    weekend = np.minimum(rng.poisson(0.9, size=n_rows), 19)
+    week = np.minimum(rng.poisson(2.4, size=n_rows), 50)
+    adults = rng.choice([0, 1, 2, 3, 4], size=n_rows, p=[0.004, 0.19, 0.75, 0.05, 0.006])
+    children = rng.choice([0.0, 1.0, 2.0, 3.0], size=n_rows, p=[0.93, 0.04, 0.029, 0.001])
+    children[rng.random(n_rows) < 0.00005] = np.nan
+    babies = rng.choice([0, 1, 2], size=n_rows, p=[0.992, 0.0075, 0.0005])
+
+    reserved = _choice(rng, ROOM_TYPES, n_rows)
+    assigned = np.where(rng.random(n_rows) < 0.87, reserved, _choice(rng, ROOM_TYPES, n_rows))
+
+    country = _choice(rng, COUNTRIES, n_rows)
+    country[rng.random(n_rows) < 0.004] = np.nan
+    agent = _choice(rng, AGENTS, n_rows).astype(float)
+    agent[rng.random(n_rows) < 0.137] = np.nan
+    company = np.where(rng.random(n_rows) < 0.057, rng.integers(6, 544, size=n_rows).astype(float), np.nan)
+
+    adr = np.round(rng.gamma(4.0, 25.0, size=n_rows), 2)
+    adr[rng.random(n_rows) < 0.016] = 0.0
+
+    is_canceled = (rng.random(n_rows) < 0.37).astype(np.int64)
+    status = np.where(is_canceled == 1,
+                      np.where(rng.random(n_rows) < 0.97, "Canceled", "No-Show"),
+                      "Check-Out")
+
+    df = pd.DataFrame({
+        "hotel": _choice(rng, HOTELS, n_rows),
+        "is_canceled": is_canceled,
+        "lead_time": lead_time,
+        "arrival_date_year": arrival.year.astype(np.int64),
+        "arrival_date_month": arrival.month_name(),
+        "arrival_date_week_number": arrival.isocalendar().week.to_numpy().astype(np.int64),
+        "arrival_date_day_of_month": arrival.day.astype(np.int64),
+        "stays_in_weekend_nights": weekend.astype(np.int64),
+        "stays_in_week_nights": week.astype(np.int64),
+        "adults": adults.astype(np.int64),
+        "children": children,
+        "babies": babies.astype(np.int64),
+        "meal": _choice(rng, MEALS, n_rows),
+        "country": country,
+        "market_segment": _choice(rng, MARKET_SEGMENTS, n_rows),
+        "distribution_channel": _choice(rng, DISTRIBUTION_CHANNELS, n_rows),
+        "is_repeated_guest": (rng.random(n_rows) < 0.032).astype(np.int64),
+        "previous_cancellations": np.minimum(rng.geometric(0.9, size=n_rows) - 1, 26).astype(np.int64),
+        "previous_bookings_not_canceled": np.minimum(rng.geometric(0.85, size=n_rows) - 1, 72).astype(np.int64),
+        "reserved_room_type": reserved,
+        "assigned_room_type": assigned,
+        "booking_changes": np.minimum(rng.geometric(0.8, size=n_rows) - 1, 21).astype(np.int64),
+        "deposit_type": _choice(rng, DEPOSIT_TYPES, n_rows),
+        "agent": agent,
+        "company": company,
+        "days_in_waiting_list": np.where(rng.random(n_rows) < 0.03, rng.integers(1, 391, size=n_rows), 0).astype(np.int64),
+        "customer_type": _choice(rng, CUSTOMER_TYPES, n_rows),
+        "adr": adr,
+        "required_car_parking_spaces": rng.choice([0, 1, 2], size=n_rows, p=[0.937, 0.0625, 0.0005]).astype(np.int64),
+        "total_of_special_requests": rng.choice([0, 1, 2, 3, 4], size=n_rows, p=[0.59, 0.28, 0.11, 0.018, 0.002]).astype(np.int64),
+        "reservation_status": status,
+        "reservation_status_date": arrival.strftime("%Y-%m-%d"),
+    })
+    return df
@@ -0,0 +1,245 @@
+"""
+EDA report: render the plots of some_visualization_functions.py to image
+files, in parallel and with a headless backend, and collect them in one
+HTML page.
+
+Every figure is cached under a hash of the input data, the plot function's
+name and arguments and the source code of the plotting modules
+(``PLOT_MODULES``: the plot functions, their shared helpers and the
+aggregation code); re-running the report only renders the plots whose
+inputs changed.
+
+    python eda_report.py cleaned_data.csv --out eda_report --jobs 4
+
+or from Python / a notebook:
+
+    from eda_report import render_report
+    render_report(data, out_dir="eda_report")
+"""
+import argparse
+import html
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from util.stage_cache import fingerprint, source_digest
+
+# modules whose code determines what the figures look like
+PLOT_MODULES = ["some_visualization_functions", "util.booking_cube", "util.daily_trends", "util.lazy"]
+
+# (plot function name, keyword arguments besides data): the calls of explore_and_vis_time.ipynb
+HOTEL_PALETTE = {'Resort Hotel': '#99badf', 'City Hotel': '#29a15c'}
+DEFAULT_PLOTS = [
+    ("plot_cancellation_distribution_general_overview_bar", {}),
+    ("plot_cancellation_by_category_general_for_categorical_data", {"column": "hotel"}),
+    ("plot_cancellation_by_category_general_for_categorical_data", {"column": "market_segment"}),
+    ("plot_cancellation_by_category_general_for_categorical_data", {"column": "distribution_channel"}),
+    ("plot_cancellation_by_category_general_for_categorical_data", {"column": "deposit_type"}),
+] + [
+    ("plot_cancellation_by_hotel_for_categorical_data",
+     {"x": x, "hue": "hotel", "col": "is_canceled", "title": title, "palette": HOTEL_PALETTE})
+    for x, title in [
+        ("deposit_type", "Hotel vs. Deposit Type vs. Cancellation"),
+        ("market_segment", "Market Segment vs. Hotel vs. Cancellation"),
+        ("distribution_channel", "Distribution Channel vs. Hotel vs. Cancellation"),
+        ("meal", "Meal Type vs. Hotel vs. Cancellation"),
+    ]
+] + [
+    (name, {}) for name in [
+        "plot_temporal_trends_smoothed_14daysavg_bookings_cancellations_both_hotels",
+        "plot_temporal_trends_monthly_bookings_cancellations_both_hotels",
+        "plot_temporal_trends_smoothed_14daysavg_bookings_cancellations_split_by_hotels",
+        "plot_temporal_trend_monthly_bookings_cancellations_split_by_hotel",
+        "plot_development_bookings_by_month_by_hotels",
+        "plot_development_cancellation_rate_by_month_by_hotel",
+        "plot_development_bookings_by_weekday_by_hotel",
+        "plot_development_cancellation_rate_by_weekday_by_hotel",
+        "plot_guest_information_patterns_in_respect_to_cancellation_both_hotels",
+        "plot_guest_information_patterns_in_respect_to_cancellation_split_by_hotels",
+        "plot_stays_in_week_nights_of_guest_in_respect_to_cancellation_split_by_hotels",
+        "plot_lead_time_and_adr_relationship_with_cancellation_both_hotels",
+        "plot_specific_guest_needs_in_respect_to_cancellation_both_hotels",
+        "plot_lead_time_and_adr_relationship_with_cancellation_split_by_hotels",
+        "plot_specific_guest_needs_in_respect_to_cancellation_split_by_hotels",
+    ]
+]
+
+
+def _plot_function(name):
+    import some_visualization_functions
+    return getattr(some_visualization_functions, name)
+
+
+def figure_key(data_key, name, kwargs, fmt, dpi, code_key=None):
+    # changes to the data, the arguments or the plotting code (also shared helpers) give a new key
+    code_key = code_key or source_digest(PLOT_MODULES)
+    return fingerprint({"data": data_key, "name": name, "code": code_key,
+                        "kwargs": repr(sorted(kwargs.items())), "fmt": fmt, "dpi": dpi})[:16]
+
+
+# ---- worker side ----
+
+_DATA = None
+
+
+def _init_worker(data, headless=True):
+    global _DATA
+    if headless:
+        import matplotlib
+        matplotlib.use("Agg")  # no windows, no GUI event loop
+    _DATA = data
+
+
+def _render(name, kwargs, out_dir, fmt, dpi):
+    # run one plot function; every figure it shows is saved instead of displayed
+    import matplotlib.pyplot as plt
+
+    out_dir = Path(out_dir)
+    saved = []
+
+    def save_open_figures(*args, **show_kwargs):
+        for number in plt.get_fignums():
+            path = out_dir / f"figure_{len(saved):02d}.{fmt}"
+            plt.figure(number).savefig(path, dpi=dpi, bbox_inches="tight")
+            saved.append(path.name)
+        plt.close("all")
+
+    show = plt.show
+    plt.show = save_open_figures
+    try:
+        # plot functions add helper columns to their input, so each gets its own copy
+        _plot_function(name)(data=_DATA.copy(), **kwargs)
+        save_open_figures()
+    finally:
+        plt.show = show
+        plt.close("all")
+    return saved
+
+
+def _render_into_cache(name, kwargs, entry, fmt, dpi):
+    # render into a temporary directory and move it into place, so an
+    # interrupted render never leaves a half-written cache entry
+    tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=entry.parent))
+    try:
+        _render(name, kwargs, tmp, fmt, dpi)
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            if not entry.is_dir():
+                raise
+            # another render of the same key finished first: keep its figures
+            shutil.rmtree(tmp, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return name
+
+
+# ---- driver ----
+
+def render_report(
+    data: pd.DataFrame,
+    plots: list[tuple[str, dict]] | None = None,
+    out_dir: str | Path = "eda_report",
+    cache_dir: str | Path = ".figure_cache",
+    n_jobs: int = -1,
+    fmt: str = "png",
+    dpi: int = 100,
+    verbose: bool = True,
+) -> dict[str, list[Path]]:
+    """
+    Render *plots* on *data* and write ``<out_dir>/index.html``.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Booking rows as used in the EDA notebook (``arrival_date`` as datetime).
+    plots : list[tuple[str, dict]] | None, default=None
+        (function name in some_visualization_functions, keyword arguments
+        besides *data*); defaults to ``DEFAULT_PLOTS``.
+    out_dir : str | Path, default='eda_report'
+    cache_dir : str | Path, default='.figure_cache'
+        Rendered figures, one directory per cache key.
+    n_jobs : int, default=-1
+        Worker processes for the plots to (re-)render; -1 uses all CPU cores.
+    fmt : str, default='png'
+    dpi : int, default=100
+
+    Returns
+    -------
+    dict[str, list[Path]]
+        {plot label: figure files in *out_dir*}, in *plots* order.
+    """
+    plots = DEFAULT_PLOTS if plots is None else plots
+    out_dir, cache_dir = Path(out_dir), Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    data_key, code_key = fingerprint(data), source_digest(PLOT_MODULES)
+    entries = [cache_dir / figure_key(data_key, name, kwargs, fmt, dpi, code_key) for name, kwargs in plots]
+    missing = {entry: (name, kwargs) for entry, (name, kwargs) in zip(entries, plots) if not entry.exists()}
+
+    start = time.perf_counter()
+    if missing:
+        if n_jobs is None or n_jobs < 1:
+            n_jobs = os.cpu_count() or 1
+        n_jobs = min(n_jobs, len(missing))
+        tasks = [(name, kwargs, entry, fmt, dpi) for entry, (name, kwargs) in missing.items()]
+        if n_jobs == 1:
+            # in-process: keep the caller's backend (figures are closed, never shown)
+            _init_worker(data, headless=False)
+            for task in tasks:
+                _render_into_cache(*task)
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(data,)) as pool:
+                for future in [pool.submit(_render_into_cache, *task) for task in tasks]:
+                    future.result()
+    if verbose:
+        print(f"{len(missing)} of {len(plots)} plots rendered, {len(plots) - len(missing)} from cache "
+              f"({time.perf_counter() - start:.1f}s)")
+
+    # copy the figures into the report directory and write the page
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+    report = {}
+    sections = []
+    for i, ((name, kwargs), entry) in enumerate(zip(plots, entries)):
+        label = name + (f" ({', '.join(f'{k}={v}' for k, v in kwargs.items() if k != 'palette')})" if kwargs else "")
+        files = []
+        for figure in sorted(entry.iterdir()):
+            target = out_dir / f"{i:02d}_{figure.name}"
+            shutil.copyfile(figure, target)
+            files.append(target)
+        report[label] = files
+        images = "\n".join(f'<img src="{f.name}" style="max-width:100%">' for f in files)
+        sections.append(f"<h2>{html.escape(label)}</h2>\n{images}")
+    (out_dir / "index.html").write_text(
+        "<!DOCTYPE html>\n<html><head><meta charset='utf-8'><title>EDA report</title></head><body>\n"
+        + "\n".join(sections) + "\n</body></html>\n")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("data", help="booking CSV (e.g. the cleaned data used by the EDA notebook)")
+    parser.add_argument("--out", default="eda_report")
+    parser.add_argument("--cache", default=".figure_cache")
+    parser.add_argument("--jobs", type=int, default=-1)
+    parser.add_argument("--format", default="png")
+    parser.add_argument("--dpi", type=int, default=100)
+    args = parser.parse_args()
+
+    data = pd.read_csv(args.data)
+    if "arrival_date" in data:
+        data["arrival_date"] = pd.to_datetime(data["arrival_date"], errors="coerce")
+    render_report(data, out_dir=args.out, cache_dir=args.cache, n_jobs=args.jobs, fmt=args.format, dpi=args.dpi)
+    print(f"report written to {Path(args.out) / 'index.html'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Cancellation scoring service.
+
+Loads the fitted preprocessor and model once and keeps them warm.
+
+Serve over HTTP (POST raw booking rows as JSON, get probabilities back):
+
+    python scoring_service.py serve --preprocessor prepared_datasets/<key>/preprocessor.joblib \
+        --model Model_training/random_forest_best_model.pkl --port 8000
+
+    curl -X POST localhost:8000/score -d '{"records": [{"hotel": "City Hotel", "lead_time": 30, ...}]}'
+    -> {"probabilities": [0.41]}
+
+Score a CSV file in chunks (same schema as hotel_bookings.csv):
+
+    python scoring_service.py score --preprocessor ... --model ... --input new.csv --output scores.csv
+
+Compile a fitted Random Forest into flat NumPy arrays for low-latency
+serving (pass the .npz as --model; see util/compiled_forest.py):
+
+    python scoring_service.py compile Model_training/random_forest_best_model.pkl random_forest.npz
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from util.compiled_forest import compile_model
+from util.scoring import CancellationScorer, MicroBatcher
+
+
+class _LatencyLog:
+    # rolling window of request latencies for /stats; handler threads share it
+    def __init__(self, size=10_000):
+        self.values = np.zeros(size)
+        self.count = 0
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def add(self, seconds, rows):
+        with self._lock:
+            self.values[self.count % len(self.values)] = seconds
+            self.count += 1
+            self.rows += rows
+
+    def summary(self):
+        with self._lock:
+            count, rows = self.count, self.rows
+            window = self.values[:min(count, len(self.values))].copy()
+        if not len(window):
+            return {"requests": 0, "rows": 0}
+        p50, p99 = np.percentile(window, [50, 99]) * 1000
+        return {"requests": count, "rows": rows, "p50_ms": p50, "p99_ms": p99}
+
+
+def make_handler(batcher, latencies):
+    class ScoringHandler(BaseHTTPRequestHandler):
+        def _reply(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._reply(200, {"status": "ok"})
+            elif self.path == "/stats":
+                self._reply(200, latencies.summary())
+            else:
+                self._reply(404, {"error": "unknown path"})
+
+        def do_POST(self):
+            if self.path != "/score":
+                self._reply(404, {"error": "unknown path"})
+                return
+            start = time.perf_counter()
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                records = payload["records"] if isinstance(payload, dict) else payload
+                batch = pd.DataFrame.from_records(records)
+                probabilities = batcher.score(batch)
+            except (ValueError, KeyError, TypeError) as exc:
+                self._reply(400, {"error": str(exc)})
+                return
+            except Exception as exc:
+                # any other failure of the model or preprocessor: the client still gets an answer
+                self._reply(500, {"error": f"{type(exc).__name__}: {exc}"})
+                return
+            latencies.add(time.perf_counter() - start, len(batch))
+            self._reply(200, {"probabilities": probabilities.tolist()})
+
+        def log_message(self, format, *args):
+            pass  # keep the hot path quiet; use /stats instead
+
+    return ScoringHandler
+
+
+class _ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default of 5 resets connections under concurrent load
+
+
+def serve(scorer, host, port, max_batch_rows, max_wait_ms):
+    batcher = MicroBatcher(scorer.score, max_batch_rows=max_batch_rows, max_wait_ms=max_wait_ms)
+    server = _ScoringServer((host, port), make_handler(batcher, _LatencyLog()))
+    print(f"scoring service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+
+
+def score_file(scorer, input_path, output_path, chunksize):
+    n_rows = 0
+    start = time.perf_counter()
+    for i, chunk in enumerate(pd.read_csv(input_path, chunksize=chunksize)):
+        out = pd.DataFrame({"cancellation_probability": scorer.score(chunk)})
+        out.to_csv(output_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        n_rows += len(chunk)
+    seconds = time.perf_counter() - start
+    print(f"scored {n_rows:,} rows in {seconds:.2f}s ({n_rows / seconds:,.0f} rows/s) -> {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("serve", "score"):
+        cmd = sub.add_parser(name)
+        cmd.add_argument("--preprocessor", required=True, help="fitted BookingPreprocessor (joblib)")
+        cmd.add_argument("--model", required=True, help="fitted classifier (joblib or pickle)")
+    sub.choices["serve"].add_argument("--host", default="127.0.0.1")
+    sub.choices["serve"].add_argument("--port", type=int, default=8000)
+    sub.choices["serve"].add_argument("--max-batch-rows", type=int, default=4096)
+    sub.choices["serve"].add_argument("--max-wait-ms", type=float, default=5.0)
+    sub.choices["score"].add_argument("--input", required=True)
+    sub.choices["score"].add_argument("--output", required=True)
+    sub.choices["score"].add_argument("--chunksize", type=int, default=50_000)
+    cmd = sub.add_parser("compile")
+    cmd.add_argument("model", help="fitted tree ensemble (joblib or pickle)")
+    cmd.add_argument("output", help="compiled forest (.npz)")
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        compiled = compile_model(args.model, args.output)
+        print(f"compiled {compiled.n_trees} trees ({compiled.nbytes / 2**20:.1f} MiB) -> {args.output}")
+        return
+
+    scorer = CancellationScorer.load(args.preprocessor, args.model)
+    if args.command == "serve":
+        serve(scorer, args.host, args.port, args.max_batch_rows, args.max_wait_ms)
+    else:
+        score_file(scorer, args.input, args.output, args.chunksize)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,15 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
-from matplotlib.patches import Patch
 import calendar
-from scipy.stats import pointbiserialr
-import matplotlib.patches as mpatches
 import warnings
+from util.booking_cube import BookingCube
+from util.daily_trends import DailyTrends
+from util.lazy import LazyModule
+
+# plotting libraries are imported by the first plot, not by importing this module
+sns = LazyModule("seaborn")
+plt = LazyModule("matplotlib.pyplot")
+mpatches = LazyModule("matplotlib.patches")
 warnings.filterwarnings("ignore", category=FutureWarning)
 
 
@@ -26,6 +29,10 @@ warnings.filterwarnings("ignore", category=FutureWarning)
     # - plot_development_cancellation_rate_by_month_by_hotel
     # - plot_development_bookings_by_weekday_by_hotel
     # - plot_development_cancellation_rate_by_weekday_by_hotel
+    # They accept the booking rows or a BookingCube (util.booking_cube); build the cube once with
+    # cube = BookingCube.from_frame(data) and pass it to all of them to scan the bookings only once.
+    # The smoothed plots also accept a DailyTrends (util.daily_trends), which answers any window
+    # from daily prefix sums and can be updated with new bookings.
 
 # 3. Functions for displaying guest level information are:
     # - plot_guest_information_patterns_in_respect_to_cancellation_both_hotels
@@ -35,6 +42,8 @@ warnings.filterwarnings("ignore", category=FutureWarning)
     # - plot_specific_guest_needs_in_respect_to_cancellation_both_hotels
     # - plot_lead_time_and_adr_relationship_with_cancellation_split_by_hotels
     # - plot_specific_guest_needs_in_respect_to_cancellation_split_by_hotels
+    # The rate and box plots among them take large_data=None|True|False: above LARGE_DATA_ROWS rows
+    # (or if True) they draw from group summaries, so render time no longer grows with the data.
 
 
 
@@ -148,12 +157,7 @@ def plot_cancellation_by_hotel_for_categorical_data(x, hue, col, title, data, pa
 # Example usage: plot_temporal_trends_smoothed_14daysavg_bookings_cancellations_both_hotels(data)
 def plot_temporal_trends_smoothed_14daysavg_bookings_cancellations_both_hotels(data, window=14):
     # Daily aggregation
-    daily = data.groupby('arrival_date')['is_canceled'].agg(
-        total_bookings='count',
-        cancellations='sum'
-    )
-    daily['cancellation_rate'] = daily['cancellations'] / daily['total_bookings']
-    daily_rolling = daily.rolling(window=window).mean()
+    daily_rolling = DailyTrends.of(data).rolling(window)
 
     fig, ax1 = plt.subplots(figsize=(12, 5))
     ax1.plot(daily_rolling.index, daily_rolling['total_bookings'], label='Total Bookings (Smoothed)', color='#073E7F')
@@ -180,12 +184,7 @@ def plot_temporal_trends_smoothed_14daysavg_bookings_cancellations_both_hotels(d
 
 # Example usage: plot_temporal_trends_monthly_bookings_cancellations_both_hotels(data)
 def plot_temporal_trends_monthly_bookings_cancellations_both_hotels(data):
-    data['arrival_month'] = data['arrival_date'].dt.to_period('M')
-    monthly = data.groupby('arrival_month')['is_canceled'].agg(
-        total_bookings='count',
-        cancellations='sum'
-    ).astype(int)
-    monthly['cancellation_rate'] = monthly['cancellations'] / monthly['total_bookings']
+    monthly = BookingCube.of(data).aggregate(['arrival_month'])
 
     fig, ax1 = plt.subplots(figsize=(12, 5))
     ax1.plot(monthly.index.to_timestamp(), monthly['total_bookings'], label='Total Bookings', color='#073E7F', marker='o')
@@ -214,28 +213,19 @@ def plot_temporal_trends_monthly_bookings_cancellations_both_hotels(data):
 def plot_temporal_trends_smoothed_14daysavg_bookings_cancellations_split_by_hotels(data, window=14):
     fig, axes = plt.subplots(2, 1, figsize=(14, 8), sharex=True)
 
+    trends = DailyTrends.of(data)
+    rolling_by_hotel = {}
     y1_max, y2_max = 0, 0
     for hotel in ['Resort Hotel', 'City Hotel']:
-        hotel_data = data[data['hotel'] == hotel]
-        daily = hotel_data.groupby('arrival_date')['is_canceled'].agg(
-            total_bookings='count',
-            cancellations='sum'
-        )
-        daily['cancellation_rate'] = daily['cancellations'] / daily['total_bookings']
-        rolling = daily.rolling(window=window).mean()
+        rolling = trends.rolling(window, hotel=hotel)
+        rolling_by_hotel[hotel] = rolling
         y1_max = max(y1_max, rolling[['total_bookings', 'cancellations']].max().max())
         y2_max = max(y2_max, rolling['cancellation_rate'].max())
     y1_max = int((y1_max + 10) // 10 * 10)
     y2_max = round(y2_max + 0.05, 2)
 
     for i, hotel in enumerate(['Resort Hotel', 'City Hotel']):
-        hotel_data = data[data['hotel'] == hotel]
-        daily = hotel_data.groupby('arrival_date')['is_canceled'].agg(
-            total_bookings='count',
-            cancellations='sum'
-        )
-        daily['cancellation_rate'] = daily['cancellations'] / daily['total_bookings']
-        rolling = daily.rolling(window=window).mean()
+        rolling = rolling_by_hotel[hotel]
         ax = axes[i]
         ax.plot(rolling.index, rolling['total_bookings'], label='Total Bookings', color='#073E7F')
         ax.plot(rolling.index, rolling['cancellations'], label='Cancellations', color='#29A15C')
@@ -263,29 +253,21 @@ def plot_temporal_trends_smoothed_14daysavg_bookings_cancellations_split_by_hote
 
 # Example usage: plot_temporal_trend_monthly_bookings_cancellations_split_by_hotel(data)
 def plot_temporal_trend_monthly_bookings_cancellations_split_by_hotel(data):
-    data['arrival_month'] = data['arrival_date'].dt.to_period('M')
+    cube = BookingCube.of(data)
     fig, axes = plt.subplots(2, 1, figsize=(14, 8), sharex=True)
+    monthly_by_hotel = {}
     y1_max, y2_max = 0, 0
 
     for hotel in ['Resort Hotel', 'City Hotel']:
-        hotel_data = data[data['hotel'] == hotel]
-        monthly = hotel_data.groupby('arrival_month')['is_canceled'].agg(
-            total_bookings='count',
-            cancellations='sum'
-        ).astype(int)
-        monthly['cancellation_rate'] = monthly['cancellations'] / monthly['total_bookings']
+        monthly = cube.aggregate(['arrival_month'], hotel=hotel)
+        monthly_by_hotel[hotel] = monthly
         y1_max = max(y1_max, monthly[['total_bookings', 'cancellations']].max().max())
         y2_max = max(y2_max, monthly['cancellation_rate'].max())
     y1_max = int((y1_max + 100) // 100 * 100)
     y2_max = round(y2_max + 0.05, 2)
 
     for i, hotel in enumerate(['Resort Hotel', 'City Hotel']):
-        hotel_data = data[data['hotel'] == hotel]
-        monthly = hotel_data.groupby('arrival_month')['is_canceled'].agg(
-            total_bookings='count',
-            cancellations='sum'
-        ).astype(int)
-        monthly['cancellation_rate'] = monthly['cancellations'] / monthly['total_bookings']
+        monthly = monthly_by_hotel[hotel]
         ax = axes[i]
         ax.plot(monthly.index.to_timestamp(), monthly['total_bookings'], label='Total Bookings', color='#073E7F', marker='o')
         ax.plot(monthly.index.to_timestamp(), monthly['cancellations'], label='Cancellations', color='#29A15C', marker='o')
@@ -358,7 +340,7 @@ def plot_temporal_trend_monthly_bookings_cancellations_split_by_hotel(data):
 
 def plot_development_bookings_by_month_by_hotels(data):
     month_order = list(calendar.month_name)[1:]
-    booking_counts = data.groupby(['arrival_date_month', 'hotel']).size().unstack().reindex(month_order)
+    booking_counts = BookingCube.of(data).aggregate(['arrival_date_month', 'hotel'])['total_bookings'].unstack().reindex(month_order)
     fig, ax = plt.subplots(figsize=(10, 5))
     booking_counts.plot(kind='bar', width=0.8, ax=ax, color=['#99badf', '#29a15c'])
     booking_counts.plot(marker='o', linewidth=2, ax=ax)
@@ -392,7 +374,7 @@ def plot_development_bookings_by_month_by_hotels(data):
 
 
 def plot_development_cancellation_rate_by_month_by_hotel(data):
-    cancel_rate = data.groupby(['arrival_date_month', 'hotel'])['is_canceled'].mean().unstack().reindex(list(calendar.month_name)[1:])
+    cancel_rate = BookingCube.of(data).aggregate(['arrival_date_month', 'hotel'])['cancellation_rate'].unstack().reindex(list(calendar.month_name)[1:])
     fig, ax = plt.subplots(figsize=(10, 5))
     cancel_rate.plot(kind='bar', width=0.8, ax=ax, color=['#99badf', '#29a15c'])
     cancel_rate.plot(marker='o', linewidth=2, ax=ax)
@@ -423,9 +405,8 @@ def plot_development_cancellation_rate_by_month_by_hotel(data):
 
 
 def plot_development_bookings_by_weekday_by_hotel(data):
-    data['weekday'] = data['arrival_date'].dt.day_name()
     weekday_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    weekday_counts = data.groupby(['weekday', 'hotel']).size().unstack().reindex(weekday_order)
+    weekday_counts = BookingCube.of(data).aggregate(['weekday', 'hotel'])['total_bookings'].unstack().reindex(weekday_order)
     fig, ax = plt.subplots(figsize=(10, 4))
     weekday_counts.plot(kind='bar', ax=ax, color=['#99badf', '#29a15c'])
     weekday_counts.plot(marker='o', ax=ax, linewidth=2)
@@ -444,12 +425,9 @@ def plot_development_bookings_by_weekday_by_hotel(data):
 def plot_development_cancellation_rate_by_weekday_by_hotel(data):
     import matplotlib.pyplot as plt
     import seaborn as sns
-    data['arrival_date'] = pd.to_datetime(data['arrival_date'])
-    data['weekday'] = data['arrival_date'].dt.day_name()
     weekday_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
     cancel_rate = (
-        data.groupby(['weekday', 'hotel'])['is_canceled']
-        .mean()
+        BookingCube.of(data).aggregate(['weekday', 'hotel'])['cancellation_rate']
         .unstack()
         .reindex(weekday_order)
     )
@@ -473,12 +451,80 @@ def plot_development_cancellation_rate_by_weekday_by_hotel(data):
 ## ------------------------------------------- Functions for displaying guest level information -------------------------------------------------------- ##
 
 
-
-
-
-
-
-def plot_guest_information_patterns_in_respect_to_cancellation_both_hotels(data):
+# Above this many rows the guest-level rate and box plots switch to their large-data mode
+LARGE_DATA_ROWS = 250_000
+# Most outlier points drawn per box in large-data mode
+LARGE_DATA_POINT_BUDGET = 2_000
+
+
+def _use_large_data_mode(data, large_data):
+    return len(data) > LARGE_DATA_ROWS if large_data is None else large_data
+
+
+# Cancellation rate per x (and hue) with 95% CI; in large-data mode the means come from one groupby and
+# the CI from the normal approximation of a proportion instead of seaborn's bootstrap over all rows
+def _rate_barplot(data, x, palette, ax, large_data, hue=None):
+    if not large_data:
+        sns.barplot(data=data, x=x, y='is_canceled', hue=hue, palette=palette, ci=95, ax=ax)
+        return
+    stats = data.groupby([x] if hue is None else [x, hue], observed=False)['is_canceled'].agg(['mean', 'count'])
+    stats['ci'] = 1.96 * np.sqrt(stats['mean'] * (1 - stats['mean']) / stats['count'])
+    if hue is None:
+        positions = np.arange(len(stats))
+        ax.bar(positions, stats['mean'], yerr=stats['ci'], width=0.8, color=sns.color_palette(palette, len(stats)), ecolor='#424242')
+        ax.set_xticks(positions)
+        ax.set_xticklabels([str(value) for value in stats.index])
+    else:
+        means, errors = stats['mean'].unstack(hue), stats['ci'].unstack(hue)
+        width = 0.8 / means.shape[1]
+        colors = sns.color_palette(palette, means.shape[1])
+        for j, level in enumerate(means.columns):
+            positions = np.arange(len(means)) - 0.4 + width * (j + 0.5)
+            ax.bar(positions, means[level], width, yerr=errors[level], color=colors[j], ecolor='#424242', label=level)
+        ax.set_xticks(np.arange(len(means)))
+        ax.set_xticklabels([str(value) for value in means.index])
+        ax.legend(title=hue)
+    ax.set_xlabel(x)
+    ax.set_ylabel('is_canceled')
+
+
+# Box plot of y per cancellation status; in large-data mode the boxes and whiskers are computed from all
+# rows, but at most LARGE_DATA_POINT_BUDGET outliers (a random sample) are drawn per box
+def _cancellation_boxplot(data, y, palette, ax, large_data):
+    if not large_data:
+        sns.boxplot(data=data, x='is_canceled', y=y, palette=palette, ax=ax)
+        return
+    rng = np.random.default_rng(42)
+    stats, positions = [], []
+    for status in sorted(data['is_canceled'].dropna().unique()):
+        values = data.loc[data['is_canceled'] == status, y].dropna().to_numpy()
+        if not len(values):
+            continue  # nothing to summarise, e.g. a hotel without canceled bookings
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        low = values[values >= q1 - 1.5 * (q3 - q1)].min()
+        high = values[values <= q3 + 1.5 * (q3 - q1)].max()
+        fliers = values[(values < low) | (values > high)]
+        if len(fliers) > LARGE_DATA_POINT_BUDGET:
+            fliers = rng.choice(fliers, LARGE_DATA_POINT_BUDGET, replace=False)
+        stats.append({'med': median, 'q1': q1, 'q3': q3, 'whislo': low, 'whishi': high, 'fliers': fliers})
+        positions.append(int(status))  # box of status s at x = s, like seaborn's 0 / 1 categories
+    if stats:
+        boxes = ax.bxp(stats, positions=positions, widths=0.8, patch_artist=True,
+                       medianprops={'color': '#424242'}, flierprops={'marker': 'd', 'markersize': 4})
+        colors = sns.color_palette(palette, max(positions) + 1)
+        for box, position in zip(boxes['boxes'], positions):
+            box.set_facecolor(colors[position])
+    ax.set_xlabel('is_canceled')
+    ax.set_ylabel(y)
+
+
+
+
+
+
+
+def plot_guest_information_patterns_in_respect_to_cancellation_both_hotels(data, large_data=None):
+    large_data = _use_large_data_mode(data, large_data)
     # Prep features
     data['total_guests'] = data['adults'] + data['children'] + data['babies']
     data['has_children'] = (data['children'] + data['babies']) > 0
@@ -486,39 +532,19 @@ def plot_guest_information_patterns_in_respect_to_cancellation_both_hotels(data)
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
 
     # 1. Cancellation rate vs. adults
-    sns.barplot(
-        data=data,
-        x='adults', y='is_canceled',
-        palette='pastel', ax=axes[0, 0],
-        ci=95
-    )
+    _rate_barplot(data, 'adults', 'pastel', axes[0, 0], large_data)
     axes[0, 0].set_title('Cancellation Rate by Number of Adults')
 
     # 2. Cancellation rate vs. children
-    sns.barplot(
-        data=data,
-        x='children', y='is_canceled',
-        palette='pastel', ax=axes[0, 1],
-        ci=95
-    )
+    _rate_barplot(data, 'children', 'pastel', axes[0, 1], large_data)
     axes[0, 1].set_title('Cancellation Rate by Number of Children')
 
     # 3. Cancellation rate vs. babies
-    sns.barplot(
-        data=data,
-        x='babies', y='is_canceled',
-        palette='pastel', ax=axes[1, 0],
-        ci=95
-    )
+    _rate_barplot(data, 'babies', 'pastel', axes[1, 0], large_data)
     axes[1, 0].set_title('Cancellation Rate by Number of Babies')
 
     # 4. Cancellation rate vs. total guests
-    sns.barplot(
-        data=data,
-        x='total_guests', y='is_canceled',
-        palette='pastel', ax=axes[1, 1],
-        ci=95
-    )
+    _rate_barplot(data, 'total_guests', 'pastel', axes[1, 1], large_data)
     axes[1, 1].set_title('Cancellation Rate by Total Guests')
 
     for ax in axes.flat:
@@ -531,7 +557,7 @@ def plot_guest_information_patterns_in_respect_to_cancellation_both_hotels(data)
     plt.show()
     # --- With vs. without children ---
     plt.figure(figsize=(6, 4))
-    sns.barplot(data=data, x='has_children', y='is_canceled', palette='Set2', ci=95)
+    _rate_barplot(data, 'has_children', 'Set2', plt.gca(), large_data)
     plt.xticks([0, 1], ['No Children', 'With Children'])
     plt.ylabel('Cancellation Rate')
     plt.title('Cancellation Rate: With vs. Without Children (95% CI)')
@@ -539,7 +565,7 @@ def plot_guest_information_patterns_in_respect_to_cancellation_both_hotels(data)
     plt.show()
     # --- Repeated guest vs. new guest ---
     plt.figure(figsize=(6, 4))
-    sns.barplot(data=data, x='is_repeated_guest', y='is_canceled', palette='Set3', ci=95)
+    _rate_barplot(data, 'is_repeated_guest', 'Set3', plt.gca(), large_data)
     plt.xticks([0, 1], ['New Guest', 'Repeated Guest'])
     plt.ylabel('Cancellation Rate')
     plt.title('Cancellation Rate: New vs. Repeated Guest (95% CI)')
@@ -552,7 +578,8 @@ def plot_guest_information_patterns_in_respect_to_cancellation_both_hotels(data)
 
 
 
-def plot_guest_information_patterns_in_respect_to_cancellation_split_by_hotels(data):
+def plot_guest_information_patterns_in_respect_to_cancellation_split_by_hotels(data, large_data=None):
+    large_data = _use_large_data_mode(data, large_data)
     # Prep features
     data['total_guests'] = data['adults'] + data['children'] + data['babies']
     data['has_children'] = (data['children'] + data['babies']) > 0
@@ -567,14 +594,7 @@ def plot_guest_information_patterns_in_respect_to_cancellation_split_by_hotels(d
 
         fig, axes = plt.subplots(1, 4, figsize=(20, 4), sharey=True)
         for ax, feature, title in zip(axes, features, feature_titles):
-            sns.barplot(
-                data=hotel_data,
-                x=feature,
-                y='is_canceled',
-                palette='pastel',
-                ci=95,
-                ax=ax
-            )
+            _rate_barplot(hotel_data, feature, 'pastel', ax, large_data)
             ax.set_title(f'{title} (95% CI)')
             ax.set_xlabel('')
             ax.set_ylabel('Cancellation Rate')
@@ -586,13 +606,13 @@ def plot_guest_information_patterns_in_respect_to_cancellation_split_by_hotels(d
     for hotel in hotels:
         fig, axes = plt.subplots(1, 2, figsize=(12, 4), sharey=True)
         hotel_data = data[data['hotel'] == hotel]
-        sns.barplot(data=hotel_data, x='has_children', y='is_canceled', palette='Set2', ci=95, ax=axes[0])
+        _rate_barplot(hotel_data, 'has_children', 'Set2', axes[0], large_data)
         axes[0].set_xticks([0, 1])
         axes[0].set_xticklabels(['No Children', 'With Children'])
         axes[0].set_title('With vs. Without Children')
         axes[0].set_ylabel('Cancellation Rate')
         axes[0].set_ylim(0, 1)
-        sns.barplot(data=hotel_data, x='is_repeated_guest', y='is_canceled', palette='Set3', ci=95, ax=axes[1])
+        _rate_barplot(hotel_data, 'is_repeated_guest', 'Set3', axes[1], large_data)
         axes[1].set_xticks([0, 1])
         axes[1].set_xticklabels(['New Guest', 'Repeated Guest'])
         axes[1].set_title('New vs. Repeated Guest')
@@ -606,22 +626,16 @@ def plot_guest_information_patterns_in_respect_to_cancellation_split_by_hotels(d
 
 
 
-def plot_stays_in_week_nights_of_guest_in_respect_to_cancellation_split_by_hotels(data):
-    data = data.copy()
+def plot_stays_in_week_nights_of_guest_in_respect_to_cancellation_split_by_hotels(data, large_data=None):
+    large_data = _use_large_data_mode(data, large_data)
+    data = data[['stays_in_week_nights', 'hotel', 'is_canceled']].copy()
     data['stay_bin'] = pd.cut(
         data['stays_in_week_nights'],
         bins=[0, 2, 4, 6, 10, 30],
         labels=['0–2', '3–4', '5–6', '7–10', '11+']
     )
     plt.figure(figsize=(8, 5))
-    sns.barplot(
-        data=data,
-        x='stay_bin',
-        y='is_canceled',
-        hue='hotel',
-        ci=95,
-        palette='pastel'
-    )
+    _rate_barplot(data, 'stay_bin', 'pastel', plt.gca(), large_data, hue='hotel')
     plt.title("Cancellation Rate by Weeknight Stay Duration")
     plt.ylabel("Cancellation Rate")
     plt.xlabel("Weeknight Stay Duration (Binned)")
@@ -633,26 +647,15 @@ def plot_stays_in_week_nights_of_guest_in_respect_to_cancellation_split_by_hotel
 
 
 
-def plot_lead_time_and_adr_relationship_with_cancellation_both_hotels(data):
+def plot_lead_time_and_adr_relationship_with_cancellation_both_hotels(data, large_data=None):
+    large_data = _use_large_data_mode(data, large_data)
     fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-    sns.boxplot(
-        data=data,
-        x='is_canceled',
-        y='lead_time',
-        palette=['#99badf', '#29a15c'],
-        ax=axes[0]
-    )
+    _cancellation_boxplot(data, 'lead_time', ['#99badf', '#29a15c'], axes[0], large_data)
     axes[0].set_title('Lead Time vs. Cancellation')
     axes[0].set_xticks([0, 1])
     axes[0].set_xticklabels(['Not Canceled', 'Canceled'])
     axes[0].set_ylabel('Lead Time')
-    sns.boxplot(
-        data=data,
-        x='is_canceled',
-        y='adr',
-        palette=['#99badf', '#29a15c'],
-        ax=axes[1]
-    )
+    _cancellation_boxplot(data, 'adr', ['#99badf', '#29a15c'], axes[1], large_data)
     axes[1].set_title('Average Daily Rate (ADR) vs. Cancellation')
     axes[1].set_xticks([0, 1])
     axes[1].set_xticklabels(['Not Canceled', 'Canceled'])
@@ -709,9 +712,10 @@ def plot_specific_guest_needs_in_respect_to_cancellation_both_hotels(data):
 
 
 
-def plot_lead_time_and_adr_relationship_with_cancellation_split_by_hotels(data):
+def plot_lead_time_and_adr_relationship_with_cancellation_split_by_hotels(data, large_data=None):
     import seaborn as sns
     import matplotlib.pyplot as plt
+    large_data = _use_large_data_mode(data, large_data)
 
     sns.set(style="whitegrid")
     hotels = ['Resort Hotel', 'City Hotel']
@@ -721,13 +725,7 @@ def plot_lead_time_and_adr_relationship_with_cancellation_split_by_hotels(data):
     fig, axes = plt.subplots(1, 2, figsize=(14, 5), sharey=True)
     for i, hotel in enumerate(hotels):
         subset = data[data['hotel'] == hotel]
-        sns.boxplot(
-            data=subset,
-            x='is_canceled',
-            y='lead_time',
-            palette=palette,
-            ax=axes[i]
-        )
+        _cancellation_boxplot(subset, 'lead_time', palette, axes[i], large_data)
         axes[i].set_title(f'{hotel} — Lead Time vs. Cancellation')
         axes[i].set_xticks([0, 1])
         axes[i].set_xticklabels(['Not Canceled', 'Canceled'])
@@ -740,13 +738,7 @@ def plot_lead_time_and_adr_relationship_with_cancellation_split_by_hotels(data):
     fig, axes = plt.subplots(1, 2, figsize=(14, 5), sharey=True)
     for i, hotel in enumerate(hotels):
         subset = data[data['hotel'] == hotel]
-        sns.boxplot(
-            data=subset,
-            x='is_canceled',
-            y='adr',
-            palette=palette,
-            ax=axes[i]
-        )
+        _cancellation_boxplot(subset, 'adr', palette, axes[i], large_data)
         axes[i].set_title(f'{hotel} — ADR vs. Cancellation')
         axes[i].set_xticks([0, 1])
         axes[i].set_xticklabels(['Not Canceled', 'Canceled'])
@@ -0,0 +1,14 @@
+import pytest
+
+from benchmarks.synthetic import make_hotel_bookings
+
+
+@pytest.fixture(scope="session")
+def _bookings():
+    return make_hotel_bookings(4000, seed=0)
+
+
+@pytest.fixture
+def bookings(_bookings):
+    # fresh copy per test: several stages modify their input
+    return _bookings.copy()
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from util.booking_cube import BookingCube
+
+
+@pytest.fixture
+def data(bookings):
+    bookings.loc[bookings.index[:15], "market_segment"] = np.nan
+    bookings.loc[bookings.index[15:20], "arrival_date_day_of_month"] = 31  # some become invalid dates
+    return bookings
+
+
+def _arrival_dates(df):
+    # independent of the cube: parse "<year>-<month name>-<day>"; invalid dates become NaT
+    text = (df["arrival_date_year"].astype(str) + "-" + df["arrival_date_month"]
+            + "-" + df["arrival_date_day_of_month"].astype(str))
+    return pd.to_datetime(text, format="%Y-%B-%d", errors="coerce")
+
+
+def _direct(df, by):
+    df = df.assign(arrival_date=_arrival_dates(df))
+    df = df.assign(weekday=df["arrival_date"].dt.day_name(), arrival_date_month=df["arrival_date"].dt.month_name())
+    grouped = df.groupby(by)["is_canceled"].agg(["count", "sum"])
+    grouped.columns = ["total_bookings", "cancellations"]
+    grouped["cancellation_rate"] = grouped["cancellations"] / grouped["total_bookings"]
+    return grouped
+
+
+@pytest.mark.parametrize("by", [["hotel"], ["weekday", "hotel"], ["arrival_date_month"], ["market_segment"]])
+def test_aggregate_matches_groupby_on_the_rows(data, by):
+    cube = BookingCube.from_frame(data)
+    pd.testing.assert_frame_equal(cube.aggregate(by), _direct(data, by), check_dtype=False)
+
+
+def test_missing_keys_are_kept(data):
+    cube = BookingCube.from_frame(data)
+    assert cube.counts["total_bookings"].sum() == len(data)
+    assert cube.aggregate(["hotel"])["total_bookings"].sum() == len(data)
+
+
+def test_chunks_build_the_same_cube(data):
+    expected = BookingCube.from_frame(data).aggregate(["arrival_date", "hotel"])
+    chunked = BookingCube.from_chunks(data.iloc[i:i + 900] for i in range(0, len(data), 900))
+    assert chunked.counts["total_bookings"].sum() == len(data)
+    pd.testing.assert_frame_equal(chunked.aggregate(["arrival_date", "hotel"]), expected)
+
+
+def test_filters(data):
+    cube = BookingCube.from_frame(data)
+    city = cube.aggregate(["weekday"], hotel="City Hotel")
+    expected = _direct(data[data["hotel"] == "City Hotel"], ["weekday"])
+    pd.testing.assert_frame_equal(city, expected, check_dtype=False)
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from util.compact import compact_dtypes, memory_footprint
+
+
+def test_compact_dtypes_keeps_values(bookings):
+    out = compact_dtypes(bookings)
+    assert memory_footprint(out) < memory_footprint(bookings)
+    assert list(out.columns) == list(bookings.columns)
+    for col in bookings.columns:
+        if isinstance(out[col].dtype, pd.CategoricalDtype):
+            assert (out[col].astype(object).fillna("<na>") == bookings[col].fillna("<na>")).all(), col
+        elif pd.api.types.is_float_dtype(bookings[col]):
+            np.testing.assert_allclose(out[col], bookings[col], rtol=1e-6, err_msg=col)
+        else:
+            assert (out[col].to_numpy() == bookings[col].to_numpy()).all(), col
+
+
+def test_compact_dtypes_choices():
+    df = pd.DataFrame({
+        "flag": [0, 1, 1, 0],
+        "small": [2, 200, 3, 4],
+        "negative": [-5, 3, 100, 0],
+        "missing": pd.array([1, None, 3, 4], dtype="Int64"),
+        "ratio": [0.5, 1.5, 2.5, 3.5],
+        "boolean": [True, False, True, True],
+        "label": ["a", "b", "a", "a"],
+        "unique": ["w", "x", "y", "z"],
+    })
+    out = compact_dtypes(df)
+    assert out["flag"].dtype == np.uint8
+    assert out["small"].dtype == np.uint8
+    assert out["negative"].dtype == np.int8
+    assert out["missing"].dtype == "Int64"
+    assert out["ratio"].dtype == np.float32
+    assert out["boolean"].dtype == bool
+    assert isinstance(out["label"].dtype, pd.CategoricalDtype)
+    assert out["unique"].dtype == object
+    assert df["flag"].dtype == np.int64  # input left unmodified
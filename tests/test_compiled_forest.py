@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from util.compiled_forest import CompiledForest
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(600, 6)), columns=[f"x{i}" for i in range(6)])
+    X["x5"] = rng.integers(0, 3, size=len(X))  # repeated values: ties at the thresholds
+    y = ((X["x0"] + X["x1"] * X["x2"] + rng.normal(scale=0.5, size=len(X))) > 0).astype(int)
+    return X, y
+
+
+@pytest.mark.parametrize("model", [
+    RandomForestClassifier(n_estimators=20, max_depth=8, random_state=0),
+    ExtraTreesClassifier(n_estimators=20, random_state=0),
+    DecisionTreeClassifier(random_state=0),
+])
+def test_predict_proba_matches_estimator(data, model):
+    X, y = data
+    model.fit(X, y)
+    compiled = CompiledForest.from_estimator(model)
+    np.testing.assert_allclose(compiled.predict_proba(X), model.predict_proba(X), atol=1e-12)
+    np.testing.assert_array_equal(compiled.predict(X.iloc[:50]), model.predict(X.iloc[:50]))
+    # small batches take the same path
+    np.testing.assert_allclose(compiled.predict_proba(X, batch_size=7), model.predict_proba(X), atol=1e-12)
+
+
+def test_apply_reaches_the_estimators_leaves(data):
+    X, y = data
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    compiled = CompiledForest.from_estimator(model)
+    leaves = compiled.apply(X)
+    assert leaves.shape == (len(X), 5)
+    # same partition of the rows as sklearn's apply, tree by tree
+    for j, node in enumerate(model.apply(X).T):
+        assert len(pd.crosstab(node, leaves[:, j])) == len(np.unique(node))
+        assert (pd.crosstab(node, leaves[:, j]) > 0).sum(axis=1).eq(1).all()
+
+
+def test_columns_are_reordered_by_name(data):
+    X, y = data
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    compiled = CompiledForest.from_estimator(model)
+    np.testing.assert_allclose(compiled.predict_proba(X[X.columns[::-1]]), model.predict_proba(X))
+
+
+def test_save_and_load(data, tmp_path):
+    X, y = data
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    compiled = CompiledForest.from_estimator(model)
+    loaded = CompiledForest.load(compiled.save(tmp_path / "forest.npz"))
+    np.testing.assert_allclose(loaded.predict_proba(X), compiled.predict_proba(X))
+    assert list(loaded.feature_names_in_) == list(X.columns)
+    assert loaded.allow_nan == compiled.allow_nan
+
+
+def test_nan_follows_the_estimator(data, tmp_path):
+    X, y = data
+    X_missing = X.copy()
+    X_missing.iloc[::5, 0] = np.nan
+
+    forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X_missing, y)
+    compiled = CompiledForest.from_estimator(forest)
+    assert compiled.allow_nan
+    np.testing.assert_allclose(compiled.predict_proba(X_missing), forest.predict_proba(X_missing), atol=1e-12)
+
+    # the random splitter has no missing-value support: sklearn rejects NaN, so does the compiled model
+    extra = ExtraTreesClassifier(n_estimators=10, random_state=0).fit(X, y)
+    with pytest.raises(ValueError):
+        extra.predict_proba(X_missing)
+    compiled = CompiledForest.from_estimator(extra)
+    assert not compiled.allow_nan
+    with pytest.raises(ValueError, match="NaN"):
+        compiled.predict_proba(X_missing)
+    with pytest.raises(ValueError, match="NaN"):
+        CompiledForest.load(compiled.save(tmp_path / "extra.npz")).predict_proba(X_missing)
+
+
+def test_rejects_infinity_and_unfitted_models(data):
+    X, y = data
+    compiled = CompiledForest.from_estimator(RandomForestClassifier(n_estimators=3, random_state=0).fit(X, y))
+    X_inf = X.copy()
+    X_inf.iloc[0, 0] = np.inf
+    with pytest.raises(ValueError, match="infinity"):
+        compiled.predict_proba(X_inf)
+    with pytest.raises(TypeError):
+        CompiledForest.from_estimator(RandomForestClassifier())
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from util.booking_cube import BookingCube, arrival_dates
+from util.daily_trends import DailyTrends
+
+
+@pytest.fixture
+def data(bookings):
+    # in arrival order, so later chunks mostly add new days
+    return bookings.assign(_date=arrival_dates(bookings)).sort_values("_date", kind="stable").drop(columns="_date")
+
+
+@pytest.mark.parametrize("hotel", [None, "City Hotel", "Resort Hotel"])
+@pytest.mark.parametrize("window", [1, 7, 30])
+def test_rolling_matches_pandas_rolling(data, hotel, window):
+    trends = DailyTrends.from_frame(data)
+    daily = trends.daily(hotel)
+    expected = daily.rolling(window).mean()
+    pd.testing.assert_frame_equal(trends.rolling(window, hotel), expected, check_freq=False)
+
+
+def test_incremental_updates_match_a_full_build(data):
+    expected = DailyTrends.from_frame(data)
+    trends = DailyTrends()
+    for start in range(0, len(data), 700):
+        trends.update(data.iloc[start:start + 700])  # later days, plus days already seen
+    trends.update(data.iloc[:0])
+    for hotel in [None] + expected.hotels:
+        pd.testing.assert_frame_equal(trends.daily(hotel), expected.daily(hotel))
+        pd.testing.assert_frame_equal(trends.rolling(14, hotel), expected.rolling(14, hotel))
+
+
+def test_from_cube_matches_from_frame(data):
+    expected = DailyTrends.from_frame(data)
+    trends = DailyTrends.of(BookingCube.from_frame(data))
+    assert sorted(trends.hotels) == sorted(expected.hotels)
+    for hotel in [None] + expected.hotels:
+        pd.testing.assert_frame_equal(trends.daily(hotel), expected.daily(hotel))
+
+
+def test_window_must_be_positive(data):
+    with pytest.raises(ValueError):
+        DailyTrends.from_frame(data).rolling(0)
+
+
+def test_hotel_without_bookings_has_no_days(data):
+    city = data[data["hotel"] == "City Hotel"]
+    trends = DailyTrends.from_frame(city)
+    assert trends.hotels == ["City Hotel"]
+    for frame in (trends.daily("Resort Hotel"), trends.rolling(14, "Resort Hotel"), DailyTrends().rolling(7)):
+        assert frame.empty
+        assert list(frame.columns) == ["total_bookings", "cancellations", "cancellation_rate"]
+    # the hotel appears once it has bookings
+    resort = data[data["hotel"] == "Resort Hotel"]
+    trends.update(resort)
+    pd.testing.assert_frame_equal(trends.daily("Resort Hotel"), DailyTrends.from_frame(resort).daily("Resort Hotel"))
+
+
+def test_smoothed_hotel_plot_with_one_hotel_missing(data, monkeypatch):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    import some_visualization_functions as viz
+
+    monkeypatch.setattr(plt, "show", lambda *args, **kwargs: plt.close("all"))
+    city = data[data["hotel"] == "City Hotel"]
+    viz.plot_temporal_trends_smoothed_14daysavg_bookings_cancellations_split_by_hotels(DailyTrends.from_frame(city))
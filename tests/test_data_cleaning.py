@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from util.data_cleaning import MODE_COLS, apply_cleaning, data_cleaning, fit_cleaning
+from util.feature_engineering import feature_engineering
+
+
+def _engineered(bookings):
+    df = feature_engineering(bookings)
+    df.loc[df.index[:20], "children"] = np.nan
+    df.loc[df.index[:20], "total_people"] = np.nan
+    df.loc[df.index[:20], "is_solo_traveler"] = pd.NA
+    df.loc[df.index[20:25], ["adults", "babies"]] = [0, 1]
+    return df
+
+
+def test_cleaning_matches_fill_then_drop(bookings):
+    df = _engineered(bookings)
+    modes = {col: df[col].mode()[0] for col in MODE_COLS}
+    expected = df.fillna(modes)
+    expected = expected[~((expected["adults"] == 0) & (expected["babies"] > 0))]
+
+    pd.testing.assert_frame_equal(data_cleaning(train_df=df, df=df), expected)
+    assert fit_cleaning(df) == modes
+
+
+def test_cleaning_leaves_inputs_unmodified(bookings):
+    df = _engineered(bookings)
+    before = df.copy()
+    cleaned = apply_cleaning(df, fit_cleaning(df))
+    pd.testing.assert_frame_equal(df, before)
+    assert cleaned[MODE_COLS].notna().all().all()
+
+
+def test_keep_invalid_rows_when_scoring(bookings):
+    df = _engineered(bookings)
+    assert len(apply_cleaning(df, fit_cleaning(df), drop_invalid_rows=False)) == len(df)
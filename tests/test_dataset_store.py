@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+import util.dataset_store as dataset_store
+from util.dataset_store import dataset_key, has_splits, load_splits, prepare_splits, save_splits
+
+
+@pytest.fixture
+def raw_csv(bookings, tmp_path):
+    path = tmp_path / "hotel_bookings.csv"
+    bookings.head(1500).to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_save_load_roundtrip_keeps_index(tmp_path, fmt):
+    df = pd.DataFrame({"a": [1.5, 2.5, 3.5], "b": [0, 1, 0]}, index=[17, 3, 42])
+    save_splits({"train_data": df}, tmp_path, "k", fmt=fmt)
+    assert has_splits(tmp_path, "k")
+    pd.testing.assert_frame_equal(load_splits(tmp_path, "k")["train_data"], df)
+    pd.testing.assert_frame_equal(load_splits(tmp_path, "k", columns=["b"])["train_data"], df[["b"]])
+
+
+def test_prepare_splits_reloads_from_store(raw_csv, tmp_path):
+    splits, _ = prepare_splits(raw_csv, tmp_path / "store")
+    reloaded, preprocessor = prepare_splits(raw_csv, tmp_path / "store")
+    for name in dataset_store.SPLIT_NAMES:
+        pd.testing.assert_frame_equal(reloaded[name], splits[name])
+    assert hasattr(preprocessor, "scaler_")
+
+    # the index points back at the raw rows, and the splits do not overlap
+    indexes = [set(splits[name].index) for name in dataset_store.SPLIT_NAMES]
+    assert set().union(*indexes) <= set(range(1500))
+    assert sum(map(len, indexes)) == len(set().union(*indexes))
+
+
+def test_dataset_key_depends_on_pipeline_code(raw_csv, monkeypatch):
+    key = dataset_key(raw_csv, {"test_size": 0.3})
+    assert dataset_key(raw_csv, {"test_size": 0.3}) == key
+    assert dataset_key(raw_csv, {"test_size": 0.2}) != key
+    monkeypatch.setattr(dataset_store, "source_digest", lambda modules: "changed")
+    assert dataset_key(raw_csv, {"test_size": 0.3}) != key
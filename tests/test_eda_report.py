@@ -0,0 +1,67 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import eda_report
+from eda_report import figure_key, render_report
+from util.stage_cache import fingerprint
+
+PLOTS = [
+    ("plot_cancellation_distribution_general_overview_bar", {}),
+    ("plot_cancellation_by_category_general_for_categorical_data", {"column": "hotel"}),
+]
+
+
+def test_figure_key_is_stable_and_depends_on_inputs():
+    key = figure_key("data", "plot", {"column": "hotel"}, "png", 100)
+    assert key == figure_key("data", "plot", {"column": "hotel"}, "png", 100)
+    assert key != figure_key("other", "plot", {"column": "hotel"}, "png", 100)
+    assert key != figure_key("data", "plot", {"column": "meal"}, "png", 100)
+    assert key != figure_key("data", "plot", {"column": "hotel"}, "svg", 100)
+
+
+def test_figure_key_changes_with_plot_module_source(monkeypatch):
+    key = figure_key("data", "plot", {}, "png", 100)
+    # the key covers every module in PLOT_MODULES, not only the plot function itself
+    monkeypatch.setattr(eda_report, "source_digest", lambda modules: "edited " + ",".join(modules))
+    assert figure_key("data", "plot", {}, "png", 100) != key
+
+
+def test_render_report_reuses_cached_figures(bookings, tmp_path, capsys):
+    cache_dir = tmp_path / "cache"
+    report = render_report(bookings, PLOTS, tmp_path / "report", cache_dir, n_jobs=1)
+    assert "2 of 2 plots rendered" in capsys.readouterr().out
+    assert len(report) == 2 and all(files for files in report.values())
+    assert (tmp_path / "report" / "index.html").exists()
+
+    again = render_report(bookings, PLOTS, tmp_path / "report", cache_dir, n_jobs=1)
+    assert "0 of 2 plots rendered" in capsys.readouterr().out
+    assert [len(files) for files in again.values()] == [len(files) for files in report.values()]
+
+    bookings.loc[bookings.index[0], "is_canceled"] = 1 - bookings.loc[bookings.index[0], "is_canceled"]
+    render_report(bookings, PLOTS, tmp_path / "report", cache_dir, n_jobs=1)
+    assert "2 of 2 plots rendered" in capsys.readouterr().out
+
+
+def test_render_report_in_worker_processes(bookings, tmp_path, capsys):
+    report = render_report(bookings, PLOTS, tmp_path / "report", tmp_path / "cache", n_jobs=2)
+    assert "2 of 2 plots rendered" in capsys.readouterr().out
+    in_process = render_report(bookings, PLOTS, tmp_path / "serial", tmp_path / "serial_cache", n_jobs=1)
+    # same figures, whichever way they were rendered
+    assert [[f.name for f in files] for files in report.values()] == \
+        [[f.name for f in files] for files in in_process.values()]
+    assert all(f.stat().st_size > 0 for files in report.values() for f in files)
+
+
+def test_concurrent_render_of_the_same_key_keeps_the_first(bookings, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    name, kwargs = PLOTS[0]
+    entry = cache_dir / figure_key(fingerprint(bookings), name, kwargs, "png", 100)
+    eda_report._init_worker(bookings)
+    eda_report._render_into_cache(name, kwargs, entry, "png", 100)
+    first = sorted(path.stat().st_mtime_ns for path in entry.iterdir())
+    # a second render of the key finishing later is a cache hit, not an error
+    eda_report._render_into_cache(name, kwargs, entry, "png", 100)
+    assert sorted(path.stat().st_mtime_ns for path in entry.iterdir()) == first
+    assert [path.name for path in cache_dir.iterdir()] == [entry.name]  # no temporary directory left
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from util.encode import encode, encode_sparse
+
+
+def _frame():
+    return pd.DataFrame({
+        "lead_time": [10, 20, 30, 40],
+        "adr": [1.5, np.nan, 3.0, 4.0],
+        "hotel": ["City", "Resort", "City", "Resort"],
+        "meal": ["BB", "HB", "SC", "BB"],
+    })
+
+
+def test_encode_sparse_matches_dense_onehot():
+    df = _frame()
+    dense = encode(df.copy(), method="onehot", columns=["hotel", "meal"])
+    X, names = encode_sparse(df, ["hotel", "meal"])
+    assert names == dense.columns.tolist()
+    np.testing.assert_array_equal(X.toarray(), dense.to_numpy(dtype=float, na_value=np.nan))
+
+
+def test_encode_sparse_unseen_categories_get_zero_rows():
+    df = _frame()
+    _, names, params = encode_sparse(df, ["hotel", "meal"], return_params=True)
+    batch = df.assign(meal=["FB", None, "HB", "BB"])
+    X, batch_names = encode_sparse(batch, ["hotel", "meal"], params=params)
+    assert batch_names == names
+    meal = X[:, [names.index("meal_HB"), names.index("meal_SC")]].toarray()
+    np.testing.assert_array_equal(meal, [[0, 0], [0, 0], [1, 0], [0, 0]])
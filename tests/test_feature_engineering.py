@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_feature_engineering import _prepare
+from util.feature_engineering import NO_MEAL_TYPES, SPECIAL_DAYS, feature_engineering
+
+
+def test_vectorized_features_match_rowwise(bookings):
+    # the row-wise DataFrame.apply expressions the vectorized features replaced
+    reference = _prepare(bookings.copy())
+    features = feature_engineering(bookings.copy())
+
+    expected = {
+        "is_booking_on_special_day": reference.apply(
+            lambda x: int((x["booking_date_month_integer_version"], x["booking_date_day_of_month"]) in SPECIAL_DAYS),
+            axis=1),
+        "is_arrival_on_special_day": reference.apply(
+            lambda x: int((x["arrival_date_month_integer_version"], x["arrival_date_day_of_month"]) in SPECIAL_DAYS),
+            axis=1),
+        "previous_cancellation_percentage": reference.apply(
+            lambda x: (x["previous_cancellations"] / x["total_previous_bookings"] * 100)
+            if x["total_previous_bookings"] > 0 else 0, axis=1),
+        "is_long_stay_no_meal": reference.apply(
+            lambda x: (x["meal"] in NO_MEAL_TYPES) and ((x["stays_in_weekend_nights"] + x["stays_in_week_nights"]) > 3),
+            axis=1).astype(int),
+        "has_kids_but_no_meal": reference.apply(
+            lambda x: ((x["children"] + x["babies"]) > 0) and (x["meal"] in NO_MEAL_TYPES), axis=1).astype(int),
+    }
+    for column, values in expected.items():
+        np.testing.assert_allclose(features[column].to_numpy(dtype=float), values.to_numpy(dtype=float),
+                                   err_msg=column)
+
+
+def test_special_days_are_flagged():
+    df = pd.DataFrame({"month": [12, 12, 7], "day": [25, 26, 1]})
+    from util.feature_engineering import _is_special_day
+    assert _is_special_day(df["month"], df["day"]).tolist() == [1, 0, 0]
+
+
+def test_parallel_matches_serial_and_reuses_pool(bookings):
+    import util.feature_engineering as fe
+
+    expected = feature_engineering(bookings.copy())
+    first = fe.parallel_feature_engineering(bookings, n_jobs=2, min_rows=0)
+    pool = fe._POOL
+    second = fe.parallel_feature_engineering(bookings, n_jobs=2, n_partitions=3, min_rows=0)
+    assert pool is not None and fe._POOL is pool
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected)
+
+
+def test_parallel_runs_small_frames_in_process(bookings, monkeypatch):
+    import util.feature_engineering as fe
+
+    def no_pool(n_workers):
+        raise AssertionError("small frames must not use the process pool")
+
+    monkeypatch.setattr(fe, "_worker_pool", no_pool)
+    out = fe.parallel_feature_engineering(bookings, n_jobs=2, min_rows=len(bookings) + 1)
+    pd.testing.assert_frame_equal(out, feature_engineering(bookings.copy()))
+
+
+def test_calendar_features_match_pandas_accessors():
+    from util.feature_engineering import SEASON_MAPPING, calendar_features
+
+    days = pd.to_datetime(["2015-07-01", "2016-02-29", "2015-07-01", "2017-01-01", "2016-12-31"])
+    features = calendar_features(days.to_numpy())
+    assert features["year"].tolist() == days.year.tolist()
+    assert features["day"].tolist() == days.day.tolist()
+    assert features["week"].tolist() == days.isocalendar().week.tolist()
+    assert features["day_name"].tolist() == days.day_name().tolist()
+    assert features["month_name"].tolist() == days.month_name().tolist()
+    assert features["season"].tolist() == [SEASON_MAPPING[m] for m in days.month]
+    assert features["is_weekend"].tolist() == (days.weekday >= 5).astype(int).tolist()
+
+
+def test_days_from_parts_matches_string_parsing():
+    from util.feature_engineering import _days_from_parts
+
+    year, month, day = [2015, 2016, 2017], [7, 2, 12], [1, 29, 31]
+    expected = pd.to_datetime([f"{y}-{m}-{d}" for y, m, d in zip(year, month, day)]).to_numpy("datetime64[D]")
+    np.testing.assert_array_equal(_days_from_parts(year, month, day), expected)
+    with pytest.raises(ValueError):
+        _days_from_parts([2015], [2], [30])
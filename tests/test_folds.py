@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import cross_val_score
+from sklearn.tree import DecisionTreeClassifier
+
+from util.folds import FoldCache, stratified_folds
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(600, 4)), columns=list("abcd"), index=np.arange(600) * 3)
+    y = pd.Series((X["a"] + rng.normal(scale=0.5, size=600) > 0.8).astype(int), index=X.index)
+    return X, y
+
+
+def test_stratified_folds_partition_the_rows(data):
+    _, y = data
+    folds = stratified_folds(y, n_splits=5)
+    assert np.array_equal(np.sort(np.concatenate(folds)), np.arange(len(y)))
+    assert max(map(len, folds)) - min(map(len, folds)) <= 1
+    rates = [y.iloc[fold].mean() for fold in folds]
+    assert max(rates) - min(rates) < 0.02
+
+
+def test_splitter_matches_evaluate(data):
+    X, y = data
+    folds = FoldCache(X, y, n_splits=4)
+    model = DecisionTreeClassifier(max_depth=3, random_state=0)
+    np.testing.assert_allclose(folds.evaluate(model, scoring="f1"),
+                               cross_val_score(model, X, y, cv=folds, scoring="f1"))
+
+
+def test_fold_artifacts_are_cached(data):
+    X, y = data
+    folds = FoldCache(X, y, n_splits=4)
+    assert folds.fold(0, "minmax") is folds.fold(0, "minmax")
+    X_train, _, X_test, _ = folds.fold(0, "minmax")
+    assert X_train.min().min() == 0 and X_train.max().max() == 1  # fitted on the training part only
+    assert X_test.index.equals(X.index[folds.folds_[0]])
+
+
+@pytest.mark.parametrize("smote", [True, {}, {"k_neighbors": 3}])
+def test_smote_settings_resample(data, smote):
+    X, y = data
+    X_train, y_train, _, _ = FoldCache(X, y, n_splits=4).fold(1, smote=smote)
+    assert y_train.value_counts().nunique() == 1  # balanced
+
+
+@pytest.mark.parametrize("smote", [None, False])
+def test_no_smote_settings(data, smote):
+    X, y = data
+    folds = FoldCache(X, y, n_splits=4)
+    assert folds.fold(1, smote=smote) is folds.fold(1)
+
+
+def test_smote_defaults_to_imblearn(data):
+    from util.smote_function import apply_smote
+
+    X, y = data
+    folds = FoldCache(X, y, n_splits=4)
+    X_raw, y_raw, _, _ = folds.fold(2)
+    X_expected, y_expected = apply_smote(X_raw, y_raw, k_neighbors=3)
+    X_train, y_train, _, _ = folds.fold(2, smote={"k_neighbors": 3})
+    pd.testing.assert_frame_equal(X_train, X_expected)
+    pd.testing.assert_series_equal(y_train, y_expected)
+
+
+def test_fast_smote_backend_reuses_the_neighbour_graph(data):
+    X, y = data
+    folds = FoldCache(X, y, n_splits=4, smote_backend="fast")
+    _, y_auto, _, _ = folds.fold(0, smote=True)
+    _, y_half, _, _ = folds.fold(0, smote={"sampling_strategy": 0.5})
+    assert y_auto.value_counts().nunique() == 1
+    assert y_half.value_counts()[1] == int(0.5 * y_half.value_counts()[0])
+    assert len([key for key in folds._cache if key[0] == "smote"]) == 1
+
+
+def test_unknown_smote_backend_raises(data):
+    with pytest.raises(ValueError):
+        FoldCache(*data, smote_backend="other")
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from util.feature_engineering import feature_engineering
+from util.handle_outlier import OUTLIER_RULES, handle_outlier, outlier_audit, outlier_mask, outlier_report
+
+
+def _sequential(df):
+    # the original one-filter-per-rule implementation
+    for column, comparison, threshold in OUTLIER_RULES:
+        values = df[column]
+        kept = {"<=": values <= threshold, ">=": values >= threshold, "!=": values != threshold}[comparison]
+        df = df[kept]
+    return df
+
+
+@pytest.fixture
+def engineered(bookings):
+    df = feature_engineering(bookings)
+    rows = df.index[:6]
+    df.loc[rows, ["adr", "adults", "babies", "booking_changes", "stays_in_week_nights", "total_people"]] = [
+        -1, 7, 6, 11, 21, 7]
+    df.loc[df.index[6], "adr"] = 5400
+    df.loc[df.index[7:9], "adr"] = np.nan
+    return df
+
+
+def test_single_pass_matches_sequential_filters(engineered):
+    pd.testing.assert_frame_equal(handle_outlier(engineered), _sequential(engineered))
+
+
+def test_report_and_audit_agree_with_mask(engineered):
+    mask = outlier_mask(engineered)
+    report = outlier_report(engineered)
+    audit = outlier_audit(engineered)
+    assert report["dropped"].sum() == (~mask).sum()
+    assert audit.isna().to_numpy().tolist() == mask.tolist()
+    assert audit.value_counts().to_dict() == report.loc[report["dropped"] > 0, "dropped"].to_dict()
+
+
+def test_missing_values_are_handled_alike_for_float_and_nullable_int():
+    # missing values fail every rule except '!='
+    rules = [("x", "<=", 5), ("y", "!=", 3)]
+    df = pd.DataFrame({"x": [1.0, np.nan, 1.0, 9.0], "y": [np.nan, 1.0, 3.0, 1.0]})
+    expected = [True, False, False, False]
+    assert outlier_mask(df, rules).tolist() == expected
+    assert outlier_mask(df.astype("Int64"), rules).tolist() == expected
+
+
+def test_unknown_comparison_raises(engineered):
+    with pytest.raises(ValueError):
+        outlier_mask(engineered, [("adr", "~", 0)])
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+import util.hyperparameter_search as search
+from util.dataset_store import save_splits
+from util.hyperparameter_search import best_trials, halving_fractions, run_search
+from util.preprocessor import BookingPreprocessor
+
+
+@pytest.fixture
+def store(bookings, tmp_path):
+    preprocessor = BookingPreprocessor()
+    splits = {"train_data": preprocessor.fit_transform(bookings.iloc[:2400]),
+              "val_data": preprocessor.transform(bookings.iloc[2400:3200])}
+    save_splits(splits, tmp_path / "store", "k")
+    return tmp_path / "store"
+
+
+def test_halving_fractions():
+    assert halving_fractions(1 / 9, 3) == pytest.approx([1 / 9, 1 / 3, 1.0])
+    assert halving_fractions(1.0, 3) == [1.0]
+
+
+def test_search_halves_and_resumes_from_checkpoint(store, tmp_path, monkeypatch):
+    options = dict(models=["decision_tree", "logistic_regression"], n_iter=4, n_jobs=1, eta=2, min_fraction=0.25,
+                   checkpoint_dir=tmp_path / "checkpoints", verbose=False)
+    results = run_search(store, "k", **options)
+
+    # 4 trials per family on rung 0, then 2, then 1
+    assert results.groupby(["model", "rung"]).size().tolist() == [4, 2, 1] * 2
+    assert results["n_train_rows"].max() == 2400
+    best = best_trials(results)
+    assert set(best.index) == {"decision_tree", "logistic_regression"}
+    assert (best["rung"] == 2).all()
+
+    def no_training(*args):
+        raise AssertionError("all trials should come from the checkpoint")
+
+    monkeypatch.setattr(search, "_run_trial", no_training)
+    pd.testing.assert_frame_equal(run_search(store, "k", **options), results)
+
+
+def test_default_models_skip_missing_optional_packages(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(search.importlib.util, "find_spec", lambda name: None)
+    assert search.available_models(list(search.SEARCH_SPACES)) == [
+        name for name in search.SEARCH_SPACES if name != "xgboost"]
+
+    spaces = {"decision_tree": search.SEARCH_SPACES["decision_tree"], "xgboost": search.SEARCH_SPACES["xgboost"]}
+    with pytest.warns(UserWarning, match="xgboost"):
+        results = run_search(store, "k", search_spaces=spaces, n_iter=2, n_jobs=1, min_fraction=1.0,
+                             checkpoint_dir=tmp_path / "checkpoints", verbose=False)
+    assert set(results["model"]) == {"decision_tree"}
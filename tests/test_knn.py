@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import f1_score
+from sklearn.neighbors import KNeighborsClassifier
+
+from util.folds import FoldCache
+from util.knn import KNeighborsIndex, knn_sweep
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(500, 3)), columns=list("abc"))
+    y = pd.Series((X["a"] - X["b"] + rng.normal(scale=0.7, size=500) > 0.5).astype(int))
+    return X, y
+
+
+@pytest.mark.parametrize("metric", ["euclidean", "manhattan"])
+def test_index_matches_kneighbors_classifier(data, metric):
+    X, y = data
+    X_train, y_train, X_test = X.iloc[:400], y.iloc[:400], X.iloc[400:]
+    index = KNeighborsIndex(metric=metric).fit(X_train, y_train)
+    for k in (25, 1, 5, 10):  # the largest k first: the others are slices of one search
+        for weights in ("uniform", "distance"):
+            expected = KNeighborsClassifier(n_neighbors=k, weights=weights, metric=metric).fit(X_train, y_train)
+            np.testing.assert_allclose(index.predict_proba(X_test, k, weights), expected.predict_proba(X_test))
+            np.testing.assert_array_equal(index.predict(X_test, k, weights), expected.predict(X_test))
+
+
+def test_distance_weights_give_exact_matches_all_weight(data):
+    X, y = data
+    index = KNeighborsIndex().fit(X, y)
+    proba = index.predict_proba(X.iloc[:20], n_neighbors=7, weights="distance")
+    np.testing.assert_array_equal(proba[np.arange(20), y.iloc[:20]], 1.0)
+
+
+def test_sweep_matches_per_setting_cross_validation(data):
+    X, y = data
+    folds = FoldCache(X, y, n_splits=3)
+    results = knn_sweep(folds, [3, 9], scoring="f1").set_index(["n_neighbors", "weights"])
+    for (k, weights), row in results.iterrows():
+        expected = folds.evaluate(KNeighborsClassifier(n_neighbors=k, weights=weights), scoring="f1")
+        np.testing.assert_allclose(row[[f"fold{i}_score" for i in range(3)]].to_numpy(dtype=float), expected)
+
+
+@pytest.fixture
+def binary_data():
+    # one-hot-like features: many training rows at exactly the same distance
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.integers(0, 2, size=(900, 10)).astype(float), columns=[f"f{i}" for i in range(10)])
+    y = pd.Series((X["f0"] + X["f1"] + rng.integers(0, 2, size=900) >= 2).astype(int))
+    return X, y
+
+
+@pytest.mark.parametrize("algorithm", ["auto", "brute", "kd_tree", "ball_tree"])
+def test_ties_are_broken_by_training_order(binary_data, algorithm):
+    X, y = binary_data
+    X_train, y_train, X_test = X.iloc[:700], y.iloc[:700], X.iloc[700:]
+    diff = X_test.to_numpy()[:, None, :] - X_train.to_numpy()[None, :, :]
+    expected = np.argsort(np.sqrt((diff ** 2).sum(axis=2)), axis=1, kind="stable")
+    index = KNeighborsIndex(algorithm=algorithm).fit(X_train, y_train)
+    _, indices = index.kneighbors(X_test, 40)
+    np.testing.assert_array_equal(indices, expected[:, :40])
+
+
+def test_slices_equal_a_search_at_each_k(binary_data):
+    X, y = binary_data
+    X_train, y_train, X_test = X.iloc[:700], y.iloc[:700], X.iloc[700:]
+    index = KNeighborsIndex().fit(X_train, y_train)
+    index.kneighbors(X_test, 50)
+    for k in (1, 5, 15, 50):
+        for weights in ("uniform", "distance"):
+            fresh = KNeighborsIndex().fit(X_train, y_train)
+            np.testing.assert_array_equal(index.predict_proba(X_test, k, weights),
+                                          fresh.predict_proba(X_test, k, weights))
+
+
+def test_sweep_on_binary_features_matches_per_k_scores(binary_data):
+    X, y = binary_data
+    folds = FoldCache(X, y, n_splits=3)
+    results = knn_sweep(folds, [5, 15, 50], scoring="f1").set_index(["n_neighbors", "weights"])
+    for (k, weights), row in results.iterrows():
+        expected = []
+        for i in range(3):
+            X_train, y_train, X_test, y_test = folds.fold(i)
+            predicted = KNeighborsIndex().fit(X_train, y_train).predict(X_test, k, weights)
+            expected.append(f1_score(y_test, predicted))
+        np.testing.assert_allclose(row[[f"fold{i}_score" for i in range(3)]].to_numpy(dtype=float), expected)
@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.bench_imports import time_import
+from util.lazy import LazyModule
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def plain_module(tmp_path, monkeypatch):
+    (tmp_path / "lazy_probe.py").write_text("VALUE = 42\n\ndef double(x):\n    return 2 * x\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_probe", raising=False)
+    yield "lazy_probe"
+    sys.modules.pop("lazy_probe", None)
+
+
+def test_lazy_module_imports_on_first_attribute_access(plain_module):
+    proxy = LazyModule(plain_module)
+    assert plain_module not in sys.modules
+    assert "not loaded" in repr(proxy)
+
+    assert proxy.VALUE == 42
+    assert proxy.double(3) == 6
+    assert plain_module in sys.modules
+    assert "(loaded)" in repr(proxy)
+    assert "double" in dir(proxy)
+
+
+def test_lazy_module_sees_patches_of_the_real_module(plain_module, monkeypatch):
+    proxy = LazyModule(plain_module)
+    monkeypatch.setattr(proxy._load(), "double", lambda x: -x)
+    assert proxy.double(3) == -3
+
+
+def test_lazy_module_missing_attribute():
+    with pytest.raises(AttributeError):
+        LazyModule("json").no_such_function
+
+
+@pytest.mark.parametrize("module", [
+    "util.scoring",
+    "util.preprocessor",
+    "util.encode",
+    "util.data_scaling",
+    "util.split",
+    "util.smote_function",
+    "some_visualization_functions",
+    "eda_report",
+])
+def test_import_does_not_load_heavy_libraries(module, monkeypatch):
+    # fresh interpreter: sklearn / matplotlib / seaborn are only imported when first used
+    monkeypatch.chdir(ROOT)
+    _, _, loaded = time_import(module, repeat=1)
+    assert loaded == []
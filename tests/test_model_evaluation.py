@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+from util.model_evaluation import METRICS, HoldoutEvaluator
+from util.stage_cache import StageCache
+
+SKLEARN_METRICS = {"accuracy": accuracy_score, "precision": precision_score, "recall": recall_score,
+                   "f1": f1_score}
+
+
+@pytest.fixture(scope="module")
+def holdout():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, size=500)
+    # model "a" is informative, "b" weaker, "c" has tied scores
+    probabilities = pd.DataFrame({
+        "a": np.clip(0.5 * y + rng.uniform(0, 0.6, size=len(y)), 0, 1),
+        "b": np.clip(0.2 * y + rng.uniform(0, 0.8, size=len(y)), 0, 1),
+        "c": np.round(rng.uniform(size=len(y)), 1),
+    })
+    return probabilities, y
+
+
+def test_metrics_match_sklearn(holdout):
+    probabilities, y = holdout
+    metrics = HoldoutEvaluator(probabilities, y).metrics()
+    for name in probabilities:
+        predicted = probabilities[name] > 0.5
+        for metric, score in SKLEARN_METRICS.items():
+            assert metrics.loc[name, metric] == pytest.approx(score(y, predicted, zero_division=0)
+                                                              if metric != "accuracy" else score(y, predicted))
+        assert metrics.loc[name, "roc_auc"] == pytest.approx(roc_auc_score(y, probabilities[name]))
+
+
+def test_resample_scores_match_weighted_sklearn(holdout):
+    probabilities, y = holdout
+    evaluator = HoldoutEvaluator(probabilities, y)
+    weights = np.bincount(np.random.default_rng(1).integers(len(y), size=len(y)), minlength=len(y))
+    scores = evaluator._scores(weights[None, :].astype(np.float64))
+    for j, name in enumerate(probabilities):
+        predicted = probabilities[name] > 0.5
+        assert scores["f1"][0, j] == pytest.approx(f1_score(y, predicted, sample_weight=weights))
+        assert scores["roc_auc"][0, j] == pytest.approx(roc_auc_score(y, probabilities[name], sample_weight=weights))
+
+
+def test_bootstrap_does_not_depend_on_threads(holdout):
+    probabilities, y = holdout
+    one = HoldoutEvaluator(probabilities, y).bootstrap(200, n_jobs=1, block_size=30).bootstrap_
+    many = HoldoutEvaluator(probabilities, y).bootstrap(200, n_jobs=4, block_size=30).bootstrap_
+    for metric in METRICS:
+        assert one[metric].shape == (200, 3)
+        np.testing.assert_array_equal(one[metric], many[metric])
+
+
+def test_confidence_intervals_contain_estimate(holdout):
+    probabilities, y = holdout
+    intervals = HoldoutEvaluator(probabilities, y).bootstrap(300).confidence_intervals()
+    assert len(intervals) == 3 * len(METRICS)
+    assert ((intervals["lower"] <= intervals["estimate"]) & (intervals["estimate"] <= intervals["upper"])).all()
+
+
+def test_compare_p_value_is_never_zero(holdout):
+    probabilities, y = holdout
+    comparison = HoldoutEvaluator(probabilities, y).bootstrap(200).compare([("a", "b")])
+    # "a" is better on every resample: the smallest p-value B resamples can give
+    assert comparison.loc[("a", "b", "roc_auc"), "upper"] > comparison.loc[("a", "b", "roc_auc"), "lower"] > 0
+    assert comparison.loc[("a", "b", "roc_auc"), "p_value"] == pytest.approx(2 / 201)
+    assert (comparison["p_value"] > 0).all() and (comparison["p_value"] <= 1).all()
+
+
+def test_compare_all_nan_metric(holdout):
+    probabilities, _ = holdout
+    # a single class: ROC-AUC is undefined on every resample
+    evaluator = HoldoutEvaluator(probabilities, np.zeros(len(probabilities), dtype=int)).bootstrap(50)
+    comparison = evaluator.compare([("a", "b")])
+    assert comparison.loc[("a", "b", "roc_auc"), ["lower", "upper", "p_value"]].isna().all()
+    assert comparison.loc[("a", "b", "accuracy"), ["lower", "upper", "p_value"]].notna().all()
+
+
+def test_compare_requires_bootstrap(holdout):
+    probabilities, y = holdout
+    with pytest.raises(RuntimeError):
+        HoldoutEvaluator(probabilities, y).compare()
+
+
+def test_from_models_uses_cache(tmp_path, monkeypatch):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 3)), columns=["x0", "x1", "x2"])
+    y = (X["x0"] > 0).astype(int)
+    models = {"lr": LogisticRegression().fit(X, y), "lr_c": LogisticRegression(C=0.01).fit(X, y)}
+    cache = StageCache(tmp_path)
+    first = HoldoutEvaluator.from_models(models, X, y, cache=cache)
+    np.testing.assert_allclose(first.probabilities_["lr"], models["lr"].predict_proba(X)[:, 1])
+    assert cache.size() > 0
+
+    def no_predict(self, X):
+        raise AssertionError("predicted again")
+
+    monkeypatch.setattr(LogisticRegression, "predict_proba", no_predict)
+    second = HoldoutEvaluator.from_models(models, X, y, cache=cache)
+    pd.testing.assert_frame_equal(first.probabilities_, second.probabilities_)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.neighbors import NearestNeighbors
+
+from util.oversampling import FastSMOTE, fast_smote
+from util.smote_function import apply_smote
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(400, 3)), columns=list("abc"))
+    y = pd.Series((X["a"] > 0.9).astype(int), name="is_canceled")
+    return X, y
+
+
+def test_synthetic_samples_follow_the_smote_rule(data):
+    X, y = data
+    X_res, y_res = FastSMOTE(k_neighbors=5).fit_resample(X, y)
+    assert list(X_res.columns) == list(X.columns) and y_res.name == "is_canceled"
+    pd.testing.assert_frame_equal(X_res.iloc[:len(X)], X)
+    assert y_res.value_counts().nunique() == 1
+
+    # every synthetic sample lies on the segment between a minority sample and one of its 5 neighbours
+    minority = X[y == 1].to_numpy()
+    neighbours = NearestNeighbors(n_neighbors=6).fit(minority).kneighbors(minority, return_distance=False)[:, 1:]
+    for point in X_res.iloc[len(X):].to_numpy()[:50]:
+        on_segment = False
+        for b in range(len(minority)):
+            for n in neighbours[b]:
+                direction = minority[n] - minority[b]
+                gap = np.dot(point - minority[b], direction) / np.dot(direction, direction)
+                on_segment |= 0 <= gap <= 1 and np.allclose(minority[b] + gap * direction, point)
+        assert on_segment
+
+
+def test_same_class_counts_as_imblearn(data):
+    X, y = data
+    for strategy in ("auto", 0.5, {1: 150}):
+        _, y_fast = fast_smote(X, y, sampling_strategy=strategy)
+        _, y_imblearn = apply_smote(X, y, sampling_strategy=strategy)
+        assert y_fast.value_counts().to_dict() == y_imblearn.value_counts().to_dict()
+
+
+def test_result_does_not_depend_on_threads(data):
+    X, y = data
+    expected = FastSMOTE(chunk_size=7).fit_resample(X, y)
+    result = FastSMOTE(chunk_size=7, n_jobs=2).fit_resample(X, y)
+    pd.testing.assert_frame_equal(result[0], expected[0])
+    pd.testing.assert_series_equal(result[1], expected[1])
+
+
+def test_float32_and_array_input(data):
+    X, y = data
+    X_res, y_res = FastSMOTE(dtype=np.float32).fit_resample(X.to_numpy(), y.to_numpy())
+    assert X_res.dtype == np.float32 and isinstance(y_res, np.ndarray)
+
+
+def test_too_few_minority_samples(data):
+    X, y = data
+    with pytest.raises(ValueError):
+        FastSMOTE(k_neighbors=5).fit(X.iloc[:10], pd.Series([1, 1, 1] + [0] * 7))
+
+
+def test_apply_smote_accepts_n_jobs(data):
+    X, y = data
+    pd.testing.assert_frame_equal(apply_smote(X, y, n_jobs=2)[0], apply_smote(X, y)[0])
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from util.preprocessor import BookingPreprocessor
+
+
+def test_transform_matches_fit_transform(bookings):
+    preprocessor = BookingPreprocessor(drop_outliers=False)
+    fitted = preprocessor.fit_transform(bookings)
+    pd.testing.assert_frame_equal(preprocessor.transform(bookings), fitted)
+
+
+def test_transform_keeps_columns_for_unseen_categories(bookings):
+    preprocessor = BookingPreprocessor().fit(bookings)
+    batch = bookings.head(50).drop(columns="is_canceled")
+    batch["market_segment"] = "Unseen Segment"
+    out = preprocessor.transform(batch, drop_invalid_rows=False)
+    assert list(out.columns) == [col for col in preprocessor.columns_ if col != "is_canceled"]
+    assert len(out) == len(batch)
+    dummies = [col for col in out.columns if col.startswith("market_segment_")]
+    assert dummies and (out[dummies] == 0).all().all()  # min-max keeps a 0 dummy at 0
+
+
+def test_fit_leaves_input_unmodified(bookings):
+    before = bookings.copy()
+    BookingPreprocessor().fit(bookings)
+    pd.testing.assert_frame_equal(bookings, before)
+
+
+def test_transform_requires_fit(bookings):
+    with pytest.raises(RuntimeError):
+        BookingPreprocessor().transform(bookings)
+
+
+@pytest.fixture
+def bookings_csv(bookings, tmp_path):
+    # first chunk without missing agents / children: read naively, they would parse as int
+    bookings = bookings.sort_values("agent", na_position="last", kind="stable").reset_index(drop=True)
+    bookings = bookings.astype({"agent": "Int64", "children": "Int64", "company": "Int64"})  # "9", not "9.0"
+    path = tmp_path / "bookings.csv"
+    bookings.to_csv(path, index=False)
+    return path
+
+
+def test_fit_csv_matches_fit(bookings_csv):
+    raw = pd.read_csv(bookings_csv)
+    expected = BookingPreprocessor(scaling_method="standard").fit(raw)
+    streamed = BookingPreprocessor(scaling_method="standard").fit_csv(bookings_csv, chunksize=700)
+
+    assert set(streamed.rare_agents_) == set(expected.rare_agents_)
+    assert streamed.encoding_params_ == expected.encoding_params_
+    assert streamed.modes_ == expected.modes_
+    assert streamed.columns_ == expected.columns_
+    pd.testing.assert_frame_equal(streamed.transform(raw), expected.transform(raw), rtol=1e-9)
+
+
+def test_transform_csv_matches_transform(bookings_csv, tmp_path):
+    raw = pd.read_csv(bookings_csv)
+    preprocessor = BookingPreprocessor().fit(raw)
+    out_path = tmp_path / "prepared.csv"
+    n_rows = preprocessor.transform_csv(bookings_csv, out_path, chunksize=700)
+
+    expected = preprocessor.transform(raw).reset_index(drop=True)
+    assert n_rows == len(expected)
+    pd.testing.assert_frame_equal(pd.read_csv(out_path), expected, check_dtype=False)
+
+
+def test_failed_fit_csv_leaves_preprocessor_unchanged(bookings, tmp_path):
+    path = tmp_path / "bad.csv"
+    bookings.drop(columns="adults").to_csv(path, index=False)
+    preprocessor = BookingPreprocessor()
+    with pytest.raises(KeyError):
+        preprocessor.fit_csv(path, chunksize=700)
+    assert not hasattr(preprocessor, "rare_agents_")
+
+
+@pytest.mark.parametrize("scaling_method", ["minmax", "standard", "robust"])
+def test_compact_matches_default_output(bookings, scaling_method):
+    train, batch = bookings.iloc[:3000].copy(), bookings.iloc[3000:].copy()
+    train["is_repeated_guest"] = 1  # a flag that is constant in training
+    train["babies"] = train["babies"].clip(upper=1)  # 0/1 in training, but not a flag
+    batch.loc[batch.index[:5], ["adults", "babies"]] = [2, 2]
+
+    default = BookingPreprocessor(scaling_method=scaling_method).fit(train)
+    compact = BookingPreprocessor(scaling_method=scaling_method, compact=True).fit(train)
+    expected, out = default.transform(batch), compact.transform(batch)
+
+    pd.testing.assert_frame_equal(out, expected, check_dtype=False, rtol=1e-5, atol=1e-5)
+    assert out["babies"].dtype == np.float32  # not a flag: a 2 after training on 0 / 1 must not wrap
+    assert set(compact.exact_binary_columns_) <= set(compact.binary_columns_)
+    if scaling_method == "minmax":
+        assert "is_repeated_guest" not in compact.exact_binary_columns_
+        assert (out.loc[batch["is_repeated_guest"] == 1, "is_repeated_guest"] == 0).all()
+        assert "is_late_booking" in compact.exact_binary_columns_
+    else:
+        assert compact.exact_binary_columns_ == []
+    for col in compact.scaled_columns_:
+        assert out[col].dtype == (np.uint8 if col in compact.exact_binary_columns_ else np.float32), col
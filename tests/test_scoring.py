@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from util.preprocessor import BookingPreprocessor
+from util.scoring import CancellationScorer, MicroBatcher, _with_optional_columns
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    from benchmarks.synthetic import make_hotel_bookings
+
+    train = make_hotel_bookings(3000, seed=1)
+    preprocessor = BookingPreprocessor()
+    data = preprocessor.fit_transform(train)
+    model = RandomForestClassifier(n_estimators=10, random_state=0)
+    model.fit(data.drop(columns="is_canceled"), data["is_canceled"])
+    return CancellationScorer(preprocessor, model)
+
+
+def test_int_and_float_agents_score_alike(scorer, bookings):
+    booking = bookings[bookings["agent"] == 9].head(1).drop(columns="is_canceled")
+    as_int = booking.astype({"agent": "int64", "children": "int64"})
+    as_json_nulls = booking.assign(company=None).astype({"company": object})
+
+    features = scorer.preprocessor.transform
+    expected = features(_with_optional_columns(booking), drop_invalid_rows=False)
+    pd.testing.assert_frame_equal(features(_with_optional_columns(as_int), drop_invalid_rows=False), expected)
+    assert expected["agent_frequency_encoded"].iloc[0] > 0
+    np.testing.assert_array_equal(scorer.score(as_int), scorer.score(booking))
+    np.testing.assert_array_equal(scorer.score(as_json_nulls), scorer.score(booking))
+
+
+def test_score_returns_one_probability_per_row(scorer, bookings):
+    batch = bookings.drop(columns=["is_canceled", "reservation_status", "reservation_status_date", "company"])
+    proba = scorer.score(batch)
+    assert proba.shape == (len(batch),)
+    assert ((proba >= 0) & (proba <= 1)).all()
+
+
+def test_micro_batcher_matches_direct_scoring(scorer, bookings):
+    batch = bookings.drop(columns="is_canceled")
+    requests = [batch.iloc[i:i + 7] for i in range(0, 70, 7)]
+    batcher = MicroBatcher(scorer.score, max_batch_rows=30, max_wait_ms=20)
+    try:
+        futures = [batcher.submit(request) for request in requests]
+        bad = batcher.submit(batch.iloc[:3].drop(columns="lead_time"))
+        for request, future in zip(requests, futures):
+            np.testing.assert_allclose(future.result(timeout=30), scorer.score(request))
+        with pytest.raises(KeyError):
+            bad.result(timeout=30)
+    finally:
+        batcher.close()
+
+
+def test_micro_batcher_rejects_requests_after_close():
+    batcher = MicroBatcher(lambda batch: np.zeros(len(batch)))
+    batcher.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit(pd.DataFrame({"a": [1]}))
+    batcher.close()  # closing twice is harmless
+
+
+def _post(url, payload):
+    import json
+    import urllib.error
+    import urllib.request
+
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_service_answers_every_request():
+    import threading
+
+    from scoring_service import _LatencyLog, _ScoringServer, make_handler
+
+    def score(batch):
+        if "boom" in batch:
+            raise RuntimeError("model failed")
+        if "a" not in batch:
+            raise KeyError("a")
+        return np.full(len(batch), 0.25)
+
+    batcher = MicroBatcher(score, max_wait_ms=1)
+    latencies = _LatencyLog()
+    server = _ScoringServer(("127.0.0.1", 0), make_handler(batcher, latencies))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/score"
+    try:
+        assert _post(url, {"records": [{"a": 1}, {"a": 2}]}) == (200, {"probabilities": [0.25, 0.25]})
+        assert _post(url, {"records": [{"b": 1}]})[0] == 400
+        status, body = _post(url, {"records": [{"a": 1, "boom": 1}]})
+        assert status == 500 and "model failed" in body["error"]
+        assert latencies.summary()["requests"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+
+
+def test_latency_log_counts_concurrent_requests():
+    import threading
+
+    from scoring_service import _LatencyLog
+
+    latencies = _LatencyLog(size=100)
+    threads = [threading.Thread(target=lambda: [latencies.add(0.001, 2) for _ in range(1000)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    summary = latencies.summary()
+    assert summary["requests"] == 8000 and summary["rows"] == 16000
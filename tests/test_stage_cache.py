@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from util.stage_cache import StageCache, fingerprint, memoize_stage
+
+
+def test_fingerprint_hashes_content():
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    assert fingerprint(df) == fingerprint(df.copy())
+    assert fingerprint(df) != fingerprint(df.assign(a=[1, 2, 4]))
+    assert fingerprint(df) != fingerprint(df.astype({"a": "float64"}))
+    assert fingerprint({"b": 1, "a": 2}) == fingerprint({"a": 2, "b": 1})
+    assert len({fingerprint(value) for value in (1, 1.0, True, "1", [1], (1,), None)}) == 7
+
+
+def test_fingerprint_hashes_nested_index_and_arrays_by_content():
+    # a repr truncates long containers ("...") and would collide
+    a = np.arange(10_000)
+    b = a.copy()
+    b[5_000] = -1
+    assert fingerprint({"x": a}) != fingerprint({"x": b})
+    assert fingerprint([pd.Index(a)]) != fingerprint([pd.Index(b)])
+    assert fingerprint({"agents": pd.Index(["1.0", "9.0"])}) == fingerprint({"agents": pd.Index(["1.0", "9.0"])})
+    assert fingerprint(np.array(["a", None], dtype=object)) != fingerprint(np.array(["a", "b"], dtype=object))
+
+
+def test_fingerprint_rejects_unstable_objects():
+    with pytest.raises(TypeError):
+        fingerprint(object())
+    with pytest.raises(TypeError):
+        fingerprint({"model": object()})
+
+
+def test_memoize_stage_caches_by_input(tmp_path):
+    calls = []
+
+    def stage(df, factor=2):
+        calls.append(1)
+        return df * factor
+
+    cached = memoize_stage(stage, StageCache(tmp_path))
+    df = pd.DataFrame({"a": [1.0, 2.0]})
+    pd.testing.assert_frame_equal(cached(df), df * 2)
+    pd.testing.assert_frame_equal(cached(df.copy()), df * 2)
+    cached(df, factor=3)
+    assert len(calls) == 2
+
+
+def test_put_removes_temp_file_on_failure(tmp_path):
+    cache = StageCache(tmp_path)
+    with pytest.raises(Exception):
+        cache.put("key", lambda: None)  # not picklable
+    assert list(tmp_path.iterdir()) == []
+    assert cache.get("key") == (False, None)
+
+
+def test_get_survives_concurrent_eviction(tmp_path, monkeypatch):
+    cache = StageCache(tmp_path)
+    cache.put("key", [1, 2])
+
+    def evicted(path, *args, **kwargs):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "utime", evicted)
+    assert cache.get("key") == (True, [1, 2])
+
+
+def test_evict_keeps_recently_used_entries(tmp_path):
+    cache = StageCache(tmp_path, max_bytes=10**9)
+    for i in range(3):
+        cache.put(f"k{i}", np.zeros(1000))
+        os.utime(cache._path(f"k{i}"), (i, i))
+    cache.get("k0")  # now the most recent
+    cache.max_bytes = cache.size() // 3 + 1
+    assert cache.evict() == ["k1", "k2"]
+    assert cache.get("k0")[0]
+
+
+def test_memoize_stage_key_includes_module_source(tmp_path, monkeypatch):
+    import util.stage_cache as stage_cache
+    calls = []
+
+    def stage(df):
+        calls.append(1)
+        return df + 1
+
+    cached = memoize_stage(stage, StageCache(tmp_path))
+    df = pd.DataFrame({"a": [1.0]})
+    cached(df)
+    cached(df)
+    assert len(calls) == 1
+    # an edit anywhere in the stage's module gives a new key
+    monkeypatch.setattr(stage_cache, "source_digest", lambda modules: "edited")
+    cached(df)
+    assert len(calls) == 2
+
+
+def test_get_treats_unreadable_entries_as_misses(tmp_path, monkeypatch):
+    import sys
+    import types
+
+    cache = StageCache(tmp_path)
+    cache._path("garbage").write_bytes(b"not a pickle")
+    cache._path("protocol").write_bytes(b"\x80\x09")  # unsupported pickle protocol: ValueError
+    module = types.ModuleType("vanished_module")
+
+    class Gone:
+        pass
+
+    Gone.__module__, Gone.__qualname__ = "vanished_module", "Gone"
+    module.Gone = Gone
+    monkeypatch.setitem(sys.modules, "vanished_module", module)
+    cache.put("gone", Gone())
+    monkeypatch.delitem(sys.modules, "vanished_module")  # unpickling now raises ModuleNotFoundError
+
+    for key in ("garbage", "protocol", "gone"):
+        assert cache.get(key) == (False, None)
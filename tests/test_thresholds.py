@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import accuracy_score, f1_score, recall_score, roc_curve
+
+from util.model_evaluation import HoldoutEvaluator
+from util.thresholds import OBJECTIVES, optimize_thresholds, threshold_curve
+
+
+@pytest.fixture(scope="module")
+def holdout():
+    rng = np.random.default_rng(0)
+    n = 400
+    y = rng.integers(0, 2, size=n)
+    proba = np.round(np.clip(0.4 * y + rng.uniform(0, 0.7, size=n), 0, 1), 2)  # rounded: many ties
+    segments = pd.DataFrame({"hotel": rng.choice(["City", "Resort"], size=n),
+                             "market_segment": rng.choice(["Online", "Groups", "Direct"], size=n)})
+    return y, proba, segments
+
+
+def _sweep(y, proba, cost_fp=1.0, cost_fn=1.0):
+    # brute force: predict again at every candidate threshold
+    rows = []
+    for threshold in np.r_[np.unique(proba)[::-1], -np.inf]:
+        predicted = proba > threshold
+        fp = int((predicted & (y == 0)).sum())
+        fn = int((~predicted & (y == 1)).sum())
+        rows.append({"threshold": threshold,
+                     "f1": f1_score(y, predicted, zero_division=0),
+                     "recall": recall_score(y, predicted, zero_division=0),
+                     "accuracy": accuracy_score(y, predicted),
+                     "cost": cost_fp * fp + cost_fn * fn})
+    return pd.DataFrame(rows)
+
+
+def test_threshold_curve_matches_roc_curve(holdout):
+    y, proba, _ = holdout
+    curve = threshold_curve(y, proba)
+    fpr, tpr, thresholds = roc_curve(y, proba, drop_intermediate=False)
+    # roc_curve predicts "score >= threshold"; here a threshold is the next lower score
+    np.testing.assert_allclose(curve["threshold"].to_numpy()[:-1], thresholds[1:])
+    assert curve["threshold"].iloc[-1] == -np.inf
+    np.testing.assert_allclose(curve["recall"], tpr)
+    np.testing.assert_allclose(curve["fpr"], fpr)
+
+
+@pytest.mark.parametrize("objective", ["f1", "recall", "accuracy", "cost"])
+def test_best_threshold_matches_brute_force_sweep(holdout, objective):
+    y, proba, segments = holdout
+    result = optimize_thresholds(y, proba, segments, by=["hotel"], objectives=[objective], cost_fn=3.0)
+    for segment, mask in [("all", np.ones(len(y), bool))] + [
+            (hotel, (segments["hotel"] == hotel).to_numpy()) for hotel in ["City", "Resort"]]:
+        sweep = _sweep(y[mask], proba[mask], cost_fn=3.0)
+        score = -sweep["cost"] if objective == "cost" else sweep[objective]
+        best = sweep.loc[score.idxmax()]  # first = highest threshold among ties
+        row = result.loc[("all" if segment == "all" else "hotel", segment, objective)]
+        assert row["threshold"] == best["threshold"]
+        assert row["value"] == pytest.approx(best[objective])
+
+
+def test_thresholds_reproduce_in_holdout_evaluator(holdout):
+    y, proba, segments = holdout
+    result = optimize_thresholds(y, proba, segments, by=["hotel"], objectives=["f1", "accuracy"])
+    for (grouping, segment, objective), row in result.iterrows():
+        mask = np.ones(len(y), bool) if grouping == "all" else (segments["hotel"] == segment).to_numpy()
+        evaluator = HoldoutEvaluator(pd.DataFrame({"model": proba[mask]}), y[mask], threshold=row["threshold"])
+        metrics = evaluator.metrics().loc["model"]
+        for metric in ("precision", "recall", "f1", "accuracy"):
+            assert metrics[metric] == pytest.approx(row[metric]), (segment, objective, metric)
+        predicted = proba[mask] > row["threshold"]
+        assert predicted[y[mask] == 1].sum() == row["tp"]
+        assert predicted[y[mask] == 0].sum() == row["fp"]
+
+
+def test_all_objectives_and_min_precision(holdout):
+    y, proba, segments = holdout
+    result = optimize_thresholds(y, proba, segments, min_precision=0.8)
+    assert set(result.index.get_level_values("objective")) == set(OBJECTIVES)
+    assert set(result.index.get_level_values("grouping")) == {"all", "hotel", "market_segment"}
+    assert (result["precision"] >= 0.8).all()
+
+
+def test_missing_segment_labels_are_dropped(holdout):
+    y, proba, segments = holdout
+    segments = segments.copy()
+    segments.loc[:9, "hotel"] = None
+    segments.loc[10:19, "market_segment"] = np.nan
+    result = optimize_thresholds(y, proba, segments, by=["hotel", ["hotel", "market_segment"]],
+                                 objectives=["f1"])
+    labels = result.index.get_level_values("segment")
+    assert not any("nan" in label or "None" in label for label in labels)
+    assert result.loc[("hotel", slice(None), "f1"), "n_rows"].sum() == len(y) - 10
+    assert result.loc[("hotel × market_segment", slice(None), "f1"), "n_rows"].sum() == len(y) - 20
+
+
+def test_empty_input():
+    result = optimize_thresholds([], [])
+    assert result.empty and "threshold" in result.columns
+    assert threshold_curve([], []).empty
+    assert optimize_thresholds([], [], pd.DataFrame({"hotel": pd.Series([], dtype=object)})).empty
+
+
+def test_unknown_objective_and_length_mismatch():
+    with pytest.raises(ValueError, match="unknown objectives"):
+        optimize_thresholds([0, 1], [0.1, 0.9], objectives=["precision"])
+    with pytest.raises(ValueError):
+        optimize_thresholds([0, 1], [0.1])
@@ -0,0 +1,78 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib import cbook
+
+import some_visualization_functions as viz
+
+
+@pytest.fixture
+def ax():
+    fig, ax = plt.subplots()
+    yield ax
+    plt.close(fig)
+
+
+def test_large_data_mode_threshold():
+    assert viz._use_large_data_mode(range(viz.LARGE_DATA_ROWS + 1), None)
+    assert not viz._use_large_data_mode(range(10), None)
+    assert viz._use_large_data_mode(range(10), True)
+
+
+def test_large_data_rate_bars_are_group_means(bookings, ax):
+    viz._rate_barplot(bookings, "adults", "pastel", ax, large_data=True)
+    expected = bookings.groupby("adults")["is_canceled"].mean()
+    heights = [patch.get_height() for patch in ax.patches]
+    np.testing.assert_allclose(heights, expected.to_numpy())
+    assert [label.get_text() for label in ax.get_xticklabels()] == [str(v) for v in expected.index]
+
+
+def test_large_data_rate_bars_with_hue(bookings, ax):
+    viz._rate_barplot(bookings, "adults", "pastel", ax, large_data=True, hue="hotel")
+    expected = bookings.groupby(["hotel", "adults"])["is_canceled"].mean()
+    heights = [patch.get_height() for patch in ax.patches]
+    # bars are drawn hotel by hotel; adults missing for a hotel give a NaN bar
+    expected = expected.unstack("adults").to_numpy().ravel()
+    np.testing.assert_allclose(heights, expected)
+
+
+def test_large_data_boxes_use_all_rows(bookings, ax, monkeypatch):
+    monkeypatch.setattr(viz, "LARGE_DATA_POINT_BUDGET", 5)
+    viz._cancellation_boxplot(bookings, "lead_time", "Set2", ax, large_data=True)
+    for status, median_line in zip([0, 1], ax.lines[4::6]):
+        values = bookings.loc[bookings["is_canceled"] == status, "lead_time"].to_numpy()
+        (stats,) = cbook.boxplot_stats(values)
+        assert median_line.get_ydata()[0] == pytest.approx(stats["med"])
+    fliers = [line for line in ax.lines if line.get_marker() == "d"]
+    assert fliers and all(len(line.get_ydata()) <= 5 for line in fliers)
+
+
+def test_large_data_boxes_skip_empty_groups(bookings, ax):
+    data = bookings.copy()
+    data.loc[data["is_canceled"] == 1, "adr"] = np.nan  # no canceled values to summarise
+    viz._cancellation_boxplot(data, "adr", "Set2", ax, large_data=True)
+    medians = [line for line in ax.lines if line.get_color() == "#424242"]
+    assert len(medians) == 1
+    assert np.mean(medians[0].get_xdata()) == pytest.approx(0)  # the not-canceled box stays at x = 0
+    viz._cancellation_boxplot(data.iloc[:0], "adr", "Set2", ax, large_data=True)
+
+
+@pytest.mark.parametrize("plot", [
+    "plot_guest_information_patterns_in_respect_to_cancellation_both_hotels",
+    "plot_guest_information_patterns_in_respect_to_cancellation_split_by_hotels",
+    "plot_stays_in_week_nights_of_guest_in_respect_to_cancellation_split_by_hotels",
+    "plot_lead_time_and_adr_relationship_with_cancellation_both_hotels",
+    "plot_lead_time_and_adr_relationship_with_cancellation_split_by_hotels",
+])
+def test_large_data_plots_with_one_hotel_missing(bookings, plot, monkeypatch):
+    shown = []
+    monkeypatch.setattr(plt, "show", lambda *args, **kwargs: (shown.append(len(plt.get_fignums())),
+                                                               plt.close("all")))
+    city = bookings[bookings["hotel"] == "City Hotel"].copy()
+    getattr(viz, plot)(city, large_data=True)
+    assert shown and all(shown)
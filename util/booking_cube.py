@@ -0,0 +1,143 @@
+from __future__ import annotations
+from typing import Iterable
+
+import pandas as pd
+
+from util.feature_engineering import MONTH_MAPPING
+
+# dimensions stored in the cube; weekday and month are derived from the date
+CUBE_DIMENSIONS = ["arrival_date", "hotel", "market_segment"]
+MEASURES = ["total_bookings", "cancellations"]
+
+# dimensions computed from arrival_date on request
+_DERIVED = {
+    "weekday": lambda dates: dates.dt.day_name(),
+    "arrival_date_month": lambda dates: dates.dt.month_name(),
+    "arrival_month": lambda dates: dates.dt.to_period("M"),
+}
+
+
+def arrival_dates(df: pd.DataFrame) -> pd.Series:
+    """
+    Arrival dates of booking rows: the EDA notebook's ``arrival_date`` column,
+    or built from the raw year / month name / day columns.
+    """
+    if "arrival_date" in df:
+        return pd.to_datetime(df["arrival_date"], errors="coerce")
+    return pd.to_datetime(pd.DataFrame({
+        "year": df["arrival_date_year"],
+        "month": df["arrival_date_month"].map(MONTH_MAPPING),
+        "day": df["arrival_date_day_of_month"],
+    }), errors="coerce")
+
+
+class BookingCube:
+    """
+    Bookings and cancellations pre-aggregated by arrival date × hotel ×
+    market segment.
+
+    The cube is built from the booking rows in one pass (or incrementally,
+    chunk by chunk) and has one row per (date, hotel, segment) combination,
+    a few thousand for the whole dataset.  Every coarser view the temporal
+    plots need (per day, month, weekday, hotel, ...) is a ``groupby`` on
+    that small table, so rendering all of them costs a single scan of the
+    bookings.
+
+    Examples
+    --------
+    >>> cube = BookingCube.from_frame(data)
+    >>> cube.aggregate(["weekday", "hotel"])
+    >>> plot_development_bookings_by_weekday_by_hotel(cube)   # plots accept a cube or a frame
+    """
+
+    def __init__(self, counts: pd.DataFrame | None = None) -> None:
+        if counts is None:
+            index = pd.MultiIndex.from_arrays([pd.DatetimeIndex([]), [], []], names=CUBE_DIMENSIONS)
+            counts = pd.DataFrame({measure: pd.Series(dtype="int64") for measure in MEASURES}, index=index)
+        self.counts = counts
+        self._table = None
+
+    @staticmethod
+    def _count(df: pd.DataFrame) -> pd.DataFrame:
+        keys = [arrival_dates(df), df["hotel"], df["market_segment"]]
+        # dropna=False: a booking with a missing date or segment still counts towards the other dimensions
+        counts = df["is_canceled"].groupby(keys, dropna=False, sort=False).agg(["count", "sum"])
+        counts.columns = MEASURES
+        counts.index.names = CUBE_DIMENSIONS
+        return counts.astype("int64")
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "BookingCube":
+        """
+        Build the cube from booking rows (needs hotel, market_segment,
+        is_canceled and arrival_date or the raw arrival date columns).
+        """
+        return cls(cls._count(df))
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame]) -> "BookingCube":
+        """
+        Build the cube from an iterable of row chunks, e.g.
+        ``pd.read_csv(path, chunksize=100_000)``; only the partial cubes
+        are kept in memory.
+        """
+        cube = cls()
+        for chunk in chunks:
+            cube.update(chunk)
+        return cube
+
+    @classmethod
+    def of(cls, data: "BookingCube | pd.DataFrame") -> "BookingCube":
+        """
+        *data* itself if it is a cube, else a cube built from it.
+        """
+        return data if isinstance(data, cls) else cls.from_frame(data)
+
+    def update(self, chunk: pd.DataFrame) -> "BookingCube":
+        """
+        Add the bookings of *chunk* to the cube (in place).
+        """
+        partial = self._count(chunk)
+        if len(self.counts):
+            combined = pd.concat([self.counts, partial])
+            partial = combined.groupby(level=CUBE_DIMENSIONS, dropna=False, sort=False).sum()
+        self.counts = partial
+        self._table = None
+        return self
+
+    def aggregate(self, by: list[str], **filters) -> pd.DataFrame:
+        """
+        Total bookings, cancellations and cancellation rate per group.
+
+        Parameters
+        ----------
+        by : list[str]
+            Any of ``arrival_date``, ``hotel``, ``market_segment``,
+            ``weekday`` (day name), ``arrival_date_month`` (month name) and
+            ``arrival_month`` (monthly period).
+        **filters
+            Keep only cube rows with these values, e.g. ``hotel="City Hotel"``.
+
+        Returns
+        -------
+        pd.DataFrame
+            Indexed by *by* (sorted), columns total_bookings, cancellations
+            and cancellation_rate.
+        """
+        table = self._flat()
+        for dimension, value in filters.items():
+            table = table[table[dimension] == value]
+        for dimension in by:
+            if dimension in _DERIVED and dimension not in table:
+                table = table.assign(**{dimension: _DERIVED[dimension](table["arrival_date"])})
+        grouped = table.groupby(by)[MEASURES].sum()
+        grouped["cancellation_rate"] = grouped["cancellations"] / grouped["total_bookings"]
+        return grouped
+
+    def _flat(self) -> pd.DataFrame:
+        if self._table is None:
+            self._table = self.counts.reset_index()
+        return self._table
+
+    def __len__(self) -> int:
+        return len(self.counts)
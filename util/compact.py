@@ -0,0 +1,64 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+
+def memory_footprint(df: pd.DataFrame) -> int:
+    """
+    Memory used by *df* in bytes, including the contents of object columns.
+    """
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def compact_dtypes(
+    df: pd.DataFrame,
+    *,
+    float_dtype: str | np.dtype = np.float32,
+    max_category_ratio: float = 0.5,
+) -> pd.DataFrame:
+    """
+    Return a copy of *df* with memory-lean dtypes.
+
+    • integer columns holding only 0/1 → ``uint8``  
+    • other integer columns → smallest integer type that fits the values  
+    • float columns → *float_dtype* (``float32`` by default)  
+    • object / string columns with few distinct values → ``category``  
+    Boolean columns and nullable integer columns with missing values are
+    left unchanged.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Input data (left unmodified).
+    float_dtype : dtype, keyword-only, default=np.float32
+        Target dtype for float columns.
+    max_category_ratio : float, keyword-only, default=0.5
+        Object columns become ``category`` if
+        ``n_unique / n_rows <= max_category_ratio``.
+
+    Returns
+    -------
+    pd.DataFrame
+        The compacted DataFrame.
+    """
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_bool_dtype(s):
+            out[col] = s
+        elif pd.api.types.is_integer_dtype(s):
+            if s.isna().any():
+                out[col] = s
+            elif len(s) and s.min() >= 0 and s.max() <= 1:
+                out[col] = s.astype(np.uint8)
+            else:
+                s = s.astype(np.int64)
+                out[col] = pd.to_numeric(s, downcast="unsigned" if len(s) and s.min() >= 0 else "integer")
+        elif pd.api.types.is_float_dtype(s):
+            out[col] = s.astype(float_dtype)
+        elif pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+            ratio = s.nunique(dropna=True) / max(len(s), 1)
+            out[col] = s.astype("category") if ratio <= max_category_ratio else s
+        else:
+            out[col] = s
+    return pd.DataFrame(out, index=df.index)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from util.booking_cube import BookingCube, MEASURES, arrival_dates
+
+ALL_HOTELS = None  # key of the series summed over both hotels
+
+
+class _DailySeries:
+    # per-day totals of one hotel with prefix sums for O(1) window sums
+    def __init__(self, dates, bookings, cancellations):
+        self.dates = dates
+        self.bookings = bookings
+        self.cancellations = cancellations
+        self._prefix()
+
+    def _prefix(self):
+        rate = self.cancellations / self.bookings
+        self.cumsums = {
+            name: np.concatenate([[0], np.cumsum(values)])
+            for name, values in (("total_bookings", self.bookings),
+                                 ("cancellations", self.cancellations),
+                                 ("cancellation_rate", rate))
+        }
+
+    def add(self, dates, bookings, cancellations):
+        if not len(self.dates) or dates[0] > self.dates[-1]:
+            # new days after the last known one: extend the prefix sums
+            rate = cancellations / bookings
+            for name, values in (("total_bookings", bookings), ("cancellations", cancellations),
+                                 ("cancellation_rate", rate)):
+                cumsum = self.cumsums[name]
+                self.cumsums[name] = np.concatenate([cumsum, cumsum[-1] + np.cumsum(values)])
+            self.dates = np.concatenate([self.dates, dates])
+            self.bookings = np.concatenate([self.bookings, bookings])
+            self.cancellations = np.concatenate([self.cancellations, cancellations])
+            return
+        # bookings for days already seen: merge the daily totals and rebuild the prefix sums
+        merged = pd.DataFrame(
+            {"total_bookings": np.concatenate([self.bookings, bookings]),
+             "cancellations": np.concatenate([self.cancellations, cancellations])},
+            index=np.concatenate([self.dates, dates]),
+        ).groupby(level=0).sum()
+        self.dates = merged.index.to_numpy()
+        self.bookings = merged["total_bookings"].to_numpy()
+        self.cancellations = merged["cancellations"].to_numpy()
+        self._prefix()
+
+
+class DailyTrends:
+    """
+    Daily bookings and cancellations per hotel, kept up to date as new
+    bookings arrive, with rolling means for any window.
+
+    Each hotel (and the two hotels together) is stored as one row per
+    arrival date with bookings, cancellations and their prefix sums.  A
+    rolling mean over *window* days is then a difference of two prefix
+    sums per day, O(days) for any window and without touching the
+    bookings again.  New bookings are merged in with ``update``; when they
+    only add days after the last known one, the prefix sums are extended
+    instead of rebuilt.
+
+    Like ``DataFrame.rolling`` on the daily totals (what the smoothed
+    trend plots did), the window counts days that have bookings.
+
+    Examples
+    --------
+    >>> trends = DailyTrends.from_frame(data)
+    >>> trends.rolling(14, hotel="City Hotel")
+    >>> trends.update(new_bookings).rolling(28)
+    """
+
+    def __init__(self) -> None:
+        self.series: dict[str | None, _DailySeries] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DailyTrends":
+        """
+        Build from booking rows (hotel, is_canceled and the arrival date).
+        """
+        return cls().update(df)
+
+    @classmethod
+    def from_cube(cls, cube: BookingCube) -> "DailyTrends":
+        """
+        Build from a ``BookingCube`` (no bookings are scanned).
+        """
+        return cls()._add_daily(cube.aggregate(["arrival_date", "hotel"])[MEASURES])
+
+    @classmethod
+    def of(cls, data: "DailyTrends | BookingCube | pd.DataFrame") -> "DailyTrends":
+        """
+        *data* itself if it already is a ``DailyTrends``, else built from
+        a cube or from booking rows.
+        """
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, BookingCube):
+            return cls.from_cube(data)
+        return cls.from_frame(data)
+
+    def update(self, bookings: pd.DataFrame) -> "DailyTrends":
+        """
+        Add new booking rows (in place); returns *self*.
+        """
+        keys = [arrival_dates(bookings).rename("arrival_date"), bookings["hotel"]]
+        daily = bookings["is_canceled"].groupby(keys).agg(["count", "sum"])
+        daily.columns = MEASURES
+        return self._add_daily(daily)
+
+    def _add_daily(self, daily: pd.DataFrame) -> "DailyTrends":
+        # daily: (arrival_date, hotel) -> total_bookings, cancellations, sorted by date
+        if not len(daily):
+            return self
+        totals = daily.groupby(level="arrival_date").sum()
+        parts = [(ALL_HOTELS, totals)] + [
+            (hotel, frame.droplevel("hotel")) for hotel, frame in daily.groupby(level="hotel")
+        ]
+        for hotel, frame in parts:
+            dates = frame.index.to_numpy()
+            bookings = frame["total_bookings"].to_numpy(dtype=np.int64)
+            cancellations = frame["cancellations"].to_numpy(dtype=np.int64)
+            if hotel in self.series:
+                self.series[hotel].add(dates, bookings, cancellations)
+            else:
+                self.series[hotel] = _DailySeries(dates, bookings, cancellations)
+        return self
+
+    @property
+    def hotels(self) -> list[str]:
+        return [hotel for hotel in self.series if hotel is not ALL_HOTELS]
+
+    def _series(self, hotel: str | None) -> _DailySeries:
+        # a hotel without bookings (so far) has no days
+        if hotel not in self.series:
+            empty = np.array([], dtype="datetime64[ns]")
+            return _DailySeries(empty, np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+        return self.series[hotel]
+
+    def daily(self, hotel: str | None = ALL_HOTELS) -> pd.DataFrame:
+        """
+        Daily totals and cancellation rate of *hotel* (both hotels if
+        *None*); no rows for a hotel without bookings.
+        """
+        series = self._series(hotel)
+        daily = pd.DataFrame({"total_bookings": series.bookings, "cancellations": series.cancellations},
+                             index=pd.DatetimeIndex(series.dates, name="arrival_date"))
+        daily["cancellation_rate"] = daily["cancellations"] / daily["total_bookings"]
+        return daily
+
+    def rolling(self, window: int, hotel: str | None = ALL_HOTELS) -> pd.DataFrame:
+        """
+        Rolling means over the last *window* days with bookings (NaN for
+        the first ``window - 1`` days), like
+        ``daily(hotel).rolling(window).mean()``; no rows for a hotel
+        without bookings.
+
+        Returns
+        -------
+        pd.DataFrame
+            Indexed by arrival_date; total_bookings, cancellations and
+            cancellation_rate.
+        """
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        series = self._series(hotel)
+        n_days = len(series.dates)
+        means = {}
+        for name, cumsum in series.cumsums.items():
+            values = np.full(n_days, np.nan)
+            if n_days >= window:
+                values[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+            means[name] = values
+        return pd.DataFrame(means, index=pd.DatetimeIndex(series.dates, name="arrival_date"))
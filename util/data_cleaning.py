@@ -1,53 +1,103 @@
+from __future__ import annotations
+import numpy as np
 import pandas as pd
 
+# columns whose NaNs are filled with the training-set mode
+MODE_COLS = ["children", "total_people", "is_solo_traveler"]
+
+
+def fit_cleaning(train_df: pd.DataFrame) -> dict[str, int | float | str]:
+    """
+    Learn the fill values for the cleaning step from the training split.
+
+    Parameters
+    ----------
+    train_df : pd.DataFrame
+        Training split (after feature engineering).
+
+    Returns
+    -------
+    mode_values : dict
+        {"children": <mode>, "total_people": <mode>, "is_solo_traveler": <mode>};
+        pass it to ``apply_cleaning`` / ``data_cleaning`` to clean any
+        number of frames (also at scoring time) without re-computing it.
+    """
+    return {col: train_df[col].mode()[0] for col in MODE_COLS}
+
+
+def apply_cleaning(df: pd.DataFrame, mode_values: dict, drop_invalid_rows: bool = True) -> pd.DataFrame:
+    """
+    Clean *df* with previously learned fill values, in one pass.
+
+    1. Drop rows where  (adults == 0)  &  (babies > 0)
+       (i.e., keep rows that have at least one adult *or* have no babies).
+    2. Fill NaNs in the ``MODE_COLS`` with *mode_values*.
+
+    The kept rows are copied once; the fills replace single columns of that
+    copy, so no further copies of the frame are made.  *df* itself is left
+    unmodified.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Any split to clean.
+    mode_values : dict
+        Fill values from ``fit_cleaning``.
+    drop_invalid_rows : bool, default=True
+        If *False*, skip step 1 (e.g. at scoring time, where every row
+        needs a prediction); the frame is still copied once.
+
+    Returns
+    -------
+    pd.DataFrame
+        The cleaned frame (original index labels kept).
+    """
+    if drop_invalid_rows:
+        keep = ~((df["adults"] == 0) & (df["babies"] > 0)).to_numpy(dtype=bool, na_value=False)
+        df = df.take(np.flatnonzero(keep))
+    else:
+        df = df.copy()
+    for col, value in mode_values.items():
+        if df[col].hasnans:
+            df[col] = df[col].fillna(value)
+    return df
+
+
 def data_cleaning(train_df: pd.DataFrame,
-                  df: pd.DataFrame
-                  ) -> dict[str, int | float | str]:
+                  df: pd.DataFrame,
+                  mode_values: dict | None = None,
+                  ) -> pd.DataFrame:
     """
-    Clean *train_df* and *other_df* in place.
+    Clean *df* with fill values learned from *train_df*.
 
-    Actions (all done **in place**)
-    -------------------------------
-    1. Compute the training-set modes for:
-         • children  
-         • total_people  
+    Actions
+    -------
+    1. Compute the training-set modes (unless *mode_values* is given) for:
+         • children
+         • total_people
          • is_solo_traveler
-    2. Fill NaNs in those three columns for **both** dataframes with the
-       training-set modes.
-    3. Drop rows where  (adults == 0)  &  (babies > 0)  in **both** dataframes
+    2. Fill NaNs in those three columns of *df* with the training-set modes.
+    3. Drop rows of *df* where  (adults == 0)  &  (babies > 0)
        (i.e., keep rows that have at least one adult *or* have no babies).
 
+    Neither frame is modified; *train_df* is only read.  To clean several
+    splits, learn the modes once with ``fit_cleaning`` and pass them as
+    *mode_values* (or call ``apply_cleaning`` directly).
+
     Parameters
     ----------
     train_df : pd.DataFrame
         Training split used to derive the fill values.
-    other_df : pd.DataFrame
-        Validation / test / hold-out split to clean with the same rules.
+    df : pd.DataFrame
+        Split to clean (may be *train_df* itself).
+    mode_values : dict | None, default=None
+        Fill values from ``fit_cleaning``; computed from *train_df* if *None*.
 
     Returns
     -------
-    mode_values : dict
-        {"children": <mode>, "total_people": <mode>, "is_solo_traveler": <mode>}
-        (useful if you need to clean more datasets later).
+    pd.DataFrame
+        The cleaned *df*.
     """
-    # 1. learn modes from the training data
-    mode_values = {
-        "children":         train_df["children"].mode()[0],
-        "total_people":     train_df["total_people"].mode()[0],
-        "is_solo_traveler": train_df["is_solo_traveler"].mode()[0],
-    }
-
-    # 2. helper to apply fills and row drops on any dataframe (in place)
-    def _apply(df: pd.DataFrame) -> None:
-        df["children"].fillna(        mode_values["children"],        inplace=True)
-        df["total_people"].fillna(    mode_values["total_people"],    inplace=True)
-        df["is_solo_traveler"].fillna(mode_values["is_solo_traveler"], inplace=True)
-
-        # drop rows that violate the adults/babies consistency rule
-        bad_rows = df[(df["adults"] == 0) & (df["babies"] > 0)].index
-        df.drop(index=bad_rows, inplace=True)
-
-    _apply(train_df)
-    _apply(df)
-
-    return df
+    if mode_values is None:
+        mode_values = fit_cleaning(train_df)
+    return apply_cleaning(df, mode_values)
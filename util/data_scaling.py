@@ -1,6 +1,23 @@
 from __future__ import annotations
 import pandas as pd
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler
+
+# method → sklearn.preprocessing scaler class (imported on first use, see scaler_class)
+SCALERS = {
+    "standard": "StandardScaler",
+    "minmax":   "MinMaxScaler",
+    "robust":   "RobustScaler",
+}
+
+
+def scaler_class(method: str) -> type | None:
+    """
+    The sklearn scaler class of *method* (see ``SCALERS``), *None* if unknown.
+    """
+    name = SCALERS.get(method.lower())
+    if name is None:
+        return None
+    import sklearn.preprocessing
+    return getattr(sklearn.preprocessing, name)
 
 
 def scale(
@@ -33,12 +50,7 @@ def scale(
         The scaled DataFrame (copy); or *(scaled_df, scaler)* if
         *return_scaler* is *True*.
     """
-    # Map method → sklearn scaler class
-    scaler_cls = {
-        "standard": StandardScaler,
-        "minmax":   MinMaxScaler,
-        "robust":   RobustScaler,
-    }.get(method.lower())
+    scaler_cls = scaler_class(method)
 
     if scaler_cls is None:
         raise ValueError("method must be 'standard', 'minmax', or 'robust'")
@@ -0,0 +1,238 @@
+from __future__ import annotations
+import hashlib
+import json
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import sklearn
+
+from util.split import split_df
+from util.preprocessor import BookingPreprocessor
+from util.stage_cache import source_digest
+
+SPLIT_NAMES = ("train_data", "val_data", "holdout_test_data")
+
+# file suffix per storage format
+FORMATS = {"parquet": ".parquet", "feather": ".arrow"}
+
+# column holding each row's index in the raw file (restored as the index on load)
+INDEX_COLUMN = "row_index"
+
+# modules whose code determines the prepared data; part of the dataset key
+PIPELINE_MODULES = [
+    "util.split",
+    "util.feature_engineering",
+    "util.encode",
+    "util.data_cleaning",
+    "util.handle_outlier",
+    "util.data_scaling",
+    "util.compact",
+    "util.preprocessor",
+    "util.dataset_store",
+]
+
+
+def file_digest(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of the file at *path*, read in *chunk_size* blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dataset_key(raw_path: str | Path, config: dict) -> str:
+    """
+    Key of a prepared dataset: hash of the raw file content, the pipeline
+    *config* (split sizes, seeds, preprocessor settings, ...), the source of
+    ``PIPELINE_MODULES`` and the pandas / NumPy / scikit-learn versions, so
+    a change to any of them prepares the data again.
+
+    Parameters
+    ----------
+    raw_path : str | Path
+        Raw input file (e.g. ``hotel_bookings.csv``).
+    config : dict
+        JSON-serialisable pipeline configuration.
+
+    Returns
+    -------
+    str
+        16-character hex key.
+    """
+    versions = {"pandas": pd.__version__, "numpy": np.__version__, "sklearn": sklearn.__version__}
+    payload = (file_digest(raw_path) + json.dumps(config, sort_keys=True, default=str)
+               + source_digest(PIPELINE_MODULES) + json.dumps(versions, sort_keys=True))
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def save_splits(
+    splits: dict[str, pd.DataFrame],
+    store_dir: str | Path,
+    key: str,
+    *,
+    config: dict | None = None,
+    fmt: str = "parquet",
+    compression: str = "zstd",
+) -> Path:
+    """
+    Write prepared splits as typed, compressed columnar files.
+
+    Layout: ``<store_dir>/<key>/<split_name>.parquet`` (or ``.arrow``) plus
+    ``metadata.json`` holding the config, row counts and format.  The index
+    of every frame (the row positions in the raw file) is stored in an
+    ``INDEX_COLUMN`` column.
+
+    Parameters
+    ----------
+    splits : dict[str, pd.DataFrame]
+        {split_name: frame}, e.g. ``{"train_data": ..., "val_data": ...}``.
+    store_dir : str | Path
+        Root directory of the store.
+    key : str
+        Dataset key, usually from ``dataset_key``.
+    config : dict | None, keyword-only
+        Pipeline configuration, saved for reference.
+    fmt : {'parquet', 'feather'}, keyword-only, default='parquet'
+        • **parquet** – smallest files, decoded on load
+        • **feather** – Arrow IPC; with ``compression='uncompressed'`` it is
+          memory-mapped zero-copy on load
+    compression : str, keyword-only, default='zstd'
+        Codec ('zstd', 'lz4', 'snappy', 'uncompressed', ...).
+
+    Returns
+    -------
+    Path
+        Directory the splits were written to.
+    """
+    suffix = FORMATS.get(fmt)
+    if suffix is None:
+        raise ValueError("fmt must be 'parquet' or 'feather'")
+
+    out_dir = Path(store_dir) / key
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, df in splits.items():
+        table = pa.Table.from_pandas(df.rename_axis(INDEX_COLUMN).reset_index(), preserve_index=False)
+        path = out_dir / f"{name}{suffix}"
+        if fmt == "parquet":
+            pq.write_table(table, path, compression=compression)
+        else:
+            feather.write_feather(table, path, compression=compression)
+
+    metadata = {
+        "key": key,
+        "format": fmt,
+        "compression": compression,
+        "config": config,
+        "rows": {name: len(df) for name, df in splits.items()},
+    }
+    # written last: its presence marks the dataset as complete
+    (out_dir / "metadata.json").write_text(json.dumps(metadata, indent=2, default=str))
+    return out_dir
+
+
+def has_splits(store_dir: str | Path, key: str) -> bool:
+    """
+    True if a complete prepared dataset with *key* exists in *store_dir*.
+    """
+    return (Path(store_dir) / key / "metadata.json").exists()
+
+
+def load_splits(
+    store_dir: str | Path,
+    key: str,
+    names: list[str] | None = None,
+    columns: list[str] | None = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Load prepared splits written by ``save_splits``, memory-mapped.
+
+    Parameters
+    ----------
+    store_dir : str | Path
+        Root directory of the store.
+    key : str
+        Dataset key.
+    names : list[str] | None, default=None
+        Splits to load; all stored splits if *None*.
+    columns : list[str] | None, default=None
+        Only read these columns (columnar files skip the rest).
+
+    Returns
+    -------
+    dict[str, pd.DataFrame]
+        {split_name: frame} with the dtypes and index they were saved with.
+    """
+    data_dir = Path(store_dir) / key
+    metadata = json.loads((data_dir / "metadata.json").read_text())
+    suffix = FORMATS[metadata["format"]]
+
+    if columns is not None:
+        columns = [INDEX_COLUMN] + [col for col in columns if col != INDEX_COLUMN]
+
+    splits = {}
+    for name in names or list(metadata["rows"]):
+        path = data_dir / f"{name}{suffix}"
+        if metadata["format"] == "parquet":
+            table = pq.read_table(path, columns=columns, memory_map=True)
+        else:
+            table = feather.read_table(path, columns=columns, memory_map=True)
+        splits[name] = table.to_pandas().set_index(INDEX_COLUMN).rename_axis(None)
+    return splits
+
+
+def prepare_splits(
+    raw_path: str | Path,
+    store_dir: str | Path = "prepared_datasets",
+    *,
+    test_size: float = 0.30,
+    random_state: int = 42,
+    scaling_method: str = "minmax",
+    fmt: str = "parquet",
+) -> tuple[dict[str, pd.DataFrame], BookingPreprocessor]:
+    """
+    Return the train / val / holdout splits of ``main.py``, from the store if
+    they were already prepared from the same raw file and config.
+
+    On a cache miss the raw CSV is split (``test_size`` for val + holdout,
+    halved between them) and preprocessed with ``BookingPreprocessor``; the
+    splits and the fitted preprocessor (``preprocessor.joblib``) are saved
+    under the dataset key.  The frames keep the raw file's row index.
+
+    Returns
+    -------
+    tuple[dict[str, pd.DataFrame], BookingPreprocessor]
+        ({"train_data", "val_data", "holdout_test_data"}, fitted preprocessor)
+    """
+    config = {
+        "test_size": test_size,
+        "random_state": random_state,
+        "scaling_method": scaling_method,
+        "preprocessor": vars(BookingPreprocessor(scaling_method=scaling_method)),
+    }
+    key = dataset_key(raw_path, config)
+    preprocessor_path = Path(store_dir) / key / "preprocessor.joblib"
+
+    if has_splits(store_dir, key) and preprocessor_path.exists():
+        return load_splits(store_dir, key), joblib.load(preprocessor_path)
+
+    df = pd.read_csv(raw_path)
+    train_data, temp_test_data = split_df(df, test_size=test_size, random_state=random_state)
+    val_data, holdout_test_data = split_df(temp_test_data, test_size=0.50, random_state=random_state)
+
+    preprocessor = BookingPreprocessor(scaling_method=scaling_method)
+    splits = {
+        "train_data": preprocessor.fit_transform(train_data),
+        "val_data": preprocessor.transform(val_data),
+        "holdout_test_data": preprocessor.transform(holdout_test_data),
+    }
+    out_dir = save_splits(splits, store_dir, key, config=config, fmt=fmt)
+    joblib.dump(preprocessor, out_dir / "preprocessor.joblib")
+    return splits, preprocessor
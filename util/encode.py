@@ -1,7 +1,21 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
 import numpy as np
 import pandas as pd
 
-def encode(df: pd.DataFrame, method: str, columns: list[str]) -> pd.DataFrame:
+if TYPE_CHECKING:
+    import scipy.sparse as sp
+
+def encode(
+    df: pd.DataFrame,
+    method: str,
+    columns: list[str],
+    *,
+    params: dict | None = None,
+    return_params: bool = False,
+    dtype: type | np.dtype = int,
+) -> pd.DataFrame | tuple[pd.DataFrame, dict]:
     """
     Encode *columns* in *df* using one-hot, frequency, or circular encoding.
 
@@ -14,26 +28,48 @@ def encode(df: pd.DataFrame, method: str, columns: list[str]) -> pd.DataFrame:
         (aliases: 'one-hot', 'ohe', 'freq', 'cyclic', 'sincos').
     columns : list[str]
         List of column names to encode.
+    params : dict | None, keyword-only, default=None
+        Previously learned encoding state, one entry per column:
+        • **onehot**    – sorted list of categories (the first one is dropped)  
+        • **frequency** – {value: count} map (unseen values get 0)  
+        • **circular**  – maximum value of the column  
+        If *None*, the state is learned from *df* itself.
+    return_params : bool, keyword-only, default=False
+        If *True*, also return the state used, so it can be passed as
+        *params* when encoding validation / test / new data.
+    dtype : dtype, keyword-only, default=int
+        dtype of the one-hot dummy columns (e.g. ``np.uint8`` or ``bool``
+        to save memory; ``int`` gives int64).
 
     Returns
     -------
     pandas.DataFrame
-        A new DataFrame containing the encoded features.
+        A new DataFrame containing the encoded features; or
+        *(encoded_df, params)* if *return_params* is *True*.
     """
     m = method.lower()
 
     if m in {'onehot', 'one-hot', 'one_hot', 'ohe'}:
-        df = pd.get_dummies(df, columns=columns, drop_first=True, dtype=int)
+        if params is None:
+            params = {col: sorted(df[col].dropna().unique().tolist()) for col in columns}
+        # fixed categories keep the dummy columns stable across batches
+        df = df.assign(**{col: pd.Categorical(df[col], categories=params[col]) for col in columns})
+        df = pd.get_dummies(df, columns=columns, drop_first=True, dtype=dtype)
 
     elif m in {'frequency', 'freq'}:
+        if params is None:
+            params = {col: df[col].value_counts().to_dict() for col in columns}
+        df = df.copy()
         for col in columns:
-            freq_map = df[col].value_counts().to_dict()
-            df[f"{col}_frequency_encoded"] = df[col].map(freq_map)
+            df[f"{col}_frequency_encoded"] = df[col].map(params[col]).fillna(0).astype(np.int64)
         df.drop(columns=columns, inplace=True)
 
     elif m in {'circular', 'cyclic', 'sincos'}:
+        if params is None:
+            params = {col: df[col].max() for col in columns}
+        df = df.copy()
         for col in columns:
-            max_val = df[col].max()
+            max_val = params[col]
             df[f"{col}_sin"] = np.sin(2 * np.pi * df[col] / max_val)
             df[f"{col}_cos"] = np.cos(2 * np.pi * df[col] / max_val)
         df.drop(columns=columns, inplace=True)
@@ -41,7 +77,80 @@ def encode(df: pd.DataFrame, method: str, columns: list[str]) -> pd.DataFrame:
     else:
         raise ValueError("method must be 'onehot', 'frequency', or 'circular'")
 
-    return df
+    return (df, params) if return_params else df
+
+
+def encode_sparse(
+    df: pd.DataFrame,
+    columns: list[str],
+    *,
+    params: dict | None = None,
+    return_params: bool = False,
+    drop_first: bool = True,
+    dtype: type | np.dtype = np.float64,
+) -> tuple[sp.csr_matrix, list[str]] | tuple[sp.csr_matrix, list[str], dict]:
+    """
+    One-hot encode *columns* straight into a SciPy CSR matrix.
+
+    The dummies are never materialized as dense columns, so even
+    high-cardinality columns such as ``country`` and ``agent`` can be
+    one-hot encoded (see ``SPARSE_ONEHOT_COLS``).  The matrix is laid out
+    like ``encode(df, 'onehot', columns)``: the remaining (numeric) columns
+    of *df* first, then the dummies of each column in *columns* order.
+    Models that accept sparse input (e.g. ``LogisticRegression``, XGBoost)
+    can be trained on it directly.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Source data (left unchanged).  All columns not in *columns* must be
+        numeric; drop the target first.
+    columns : list[str]
+        Categorical columns to one-hot encode.
+    params : dict | None, keyword-only, default=None
+        {column: sorted list of categories}, as for ``encode(..., 'onehot')``.
+        Unseen categories and NaN get an all-zero row.  Learned from *df*
+        if *None*.
+    return_params : bool, keyword-only, default=False
+        If *True*, also return the categories used.
+    drop_first : bool, keyword-only, default=True
+        Drop the first category of each column (as ``encode`` does).
+    dtype : dtype, keyword-only, default=np.float64
+        dtype of the matrix.
+
+    Returns
+    -------
+    tuple
+        *(X, feature_names)*, or *(X, feature_names, params)* if
+        *return_params* is *True*.  ``feature_names[j]`` names column *j*
+        of *X*.
+    """
+    import scipy.sparse as sp
+
+    if params is None:
+        params = {col: sorted(df[col].dropna().unique().tolist()) for col in columns}
+
+    n_rows = len(df)
+    offset = 1 if drop_first else 0
+    blocks, feature_names = [], []
+
+    rest = [col for col in df.columns if col not in columns]
+    if rest:
+        blocks.append(sp.csr_matrix(df[rest].to_numpy(dtype=dtype, na_value=np.nan)))
+        feature_names += rest
+
+    for col in columns:
+        categories = params[col]
+        codes = pd.Categorical(df[col], categories=categories).codes.astype(np.int64)
+        rows = np.flatnonzero(codes >= offset)
+        blocks.append(sp.csr_matrix(
+            (np.ones(len(rows), dtype=dtype), (rows, codes[rows] - offset)),
+            shape=(n_rows, len(categories) - offset),
+        ))
+        feature_names += [f"{col}_{category}" for category in categories[offset:]]
+
+    X = sp.hstack(blocks, format="csr", dtype=dtype) if blocks else sp.csr_matrix((n_rows, 0), dtype=dtype)
+    return (X, feature_names, params) if return_params else (X, feature_names)
 
 
 
@@ -67,4 +176,7 @@ ONEHOT_COLS = [
 
 FREQUENCY_COLS = ["country", "agent"]
 
-CIRCULAR_COLS = ["arrival_date_week_number", "booking_date_week_number"]
\ No newline at end of file
+CIRCULAR_COLS = ["arrival_date_week_number", "booking_date_week_number"]
+
+# for encode_sparse: country and agent can be one-hot encoded instead of frequency encoded
+SPARSE_ONEHOT_COLS = ONEHOT_COLS + FREQUENCY_COLS
\ No newline at end of file
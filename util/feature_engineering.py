@@ -1,11 +1,153 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+import numpy as np
 import pandas as pd
 
-def feature_engineering(df):
+# (month, day) pairs flagged by is_booking_on_special_day / is_arrival_on_special_day
+SPECIAL_DAYS = [
+    (1, 1),   # New Year's Day
+    (12, 31), # New Year's Eve
+    (12, 25), # Christmas Day
+    (12, 24), # Christmas's Eve
+    (2, 14),  # Valentine's Day
+    (10, 31), # Halloween
+    (5, 1),   # Labor Day
+]
+
+# Lookup table indexed by [month, day_of_month]; True where the date is a special day
+_SPECIAL_DAY_TABLE = np.zeros((13, 32), dtype=bool)
+for _month, _day in SPECIAL_DAYS:
+    _SPECIAL_DAY_TABLE[_month, _day] = True
+
+# Meal types that mean no meal is included in the booking
+NO_MEAL_TYPES = ['Undefined', 'SC']
+
+# Below this many rows parallel_feature_engineering runs in-process: sending the
+# partitions to the workers and back costs more than it saves
+PARALLEL_MIN_ROWS = 20_000
+
+# 0/1 flag columns of the engineered frame: the raw 'is_repeated_guest' and every derived flag
+FLAG_COLUMNS = [
+    'is_repeated_guest',
+    'is_reserved_room_same_with_assigned_room',
+    'is_only_children_booking',
+    'is_only_adult_booking',
+    'is_only_adults_on_weekday',
+    'is_booking_on_special_day',
+    'is_arrival_on_special_day',
+    'is_arrival_on_weekend',
+    'is_booking_on_weekend',
+    'is_premium_room_downgraded',
+    'is_room_upgraded_to_premium',
+    'is_early_refundable_booking',
+    'is_late_non_refundable_booking',
+    'is_long_stay_no_meal',
+    'has_kids_but_no_meal',
+    'is_low_activity_agent',
+    'is_repeated_guest_but_changed_room',
+    'is_late_booking',
+    'is_solo_traveler',
+]
+
+MONTH_MAPPING = {
+    'January': 1, 'February': 2, 'March': 3, 'April': 4,
+    'May': 5, 'June': 6, 'July': 7, 'August': 8,
+    'September': 9, 'October': 10, 'November': 11, 'December': 12
+}
+
+SEASON_MAPPING = {
+    12: 'Winter', 1: 'Winter', 2: 'Winter',
+    3: 'Spring', 4: 'Spring', 5: 'Spring',
+    6: 'Summer', 7: 'Summer', 8: 'Summer',
+    9: 'Fall', 10: 'Fall', 11: 'Fall'
+}
+
+
+def _is_special_day(month, day):
+    """
+    Return 1 where (month, day) is in SPECIAL_DAYS, else 0 (int64), via table lookup.
+    """
+    month = np.asarray(month, dtype=np.int64)
+    day = np.asarray(day, dtype=np.int64)
+    return _SPECIAL_DAY_TABLE[month, day].astype(np.int64)
+
+
+def _days_from_parts(year, month, day):
+    """
+    Builds a datetime64[D] array from integer year, month and day columns, without string parsing.
+    Raises ValueError for impossible dates (e.g. February 30th), like pd.to_datetime does.
+    """
+    month = pd.Series(month)
+    if month.isna().any():
+        raise ValueError("unknown month name in 'arrival_date_month'")
+    year = np.asarray(year, dtype=np.int64)
+    month = month.to_numpy(dtype=np.int64)
+    day = np.asarray(day, dtype=np.int64)
+
+    months = ((year - 1970) * 12 + (month - 1)).astype('datetime64[M]')
+    days = months.astype('datetime64[D]') + (day - 1).astype('timedelta64[D]')
+    if ((day < 1) | (days.astype('datetime64[M]') != months)).any():
+        raise ValueError("invalid arrival date (day out of range for month)")
+    return days
+
+
+def calendar_features(days):
+    """
+    Calendar lookups for an array of dates, computed once per unique date and broadcast to the rows.
+
+    The hotel data has only ~800 distinct arrival dates, so the cost depends on the number of unique
+    days rather than the number of rows.
+
+    Parameters:
+    days (array-like of datetime64): Dates, one per row.
+
+    Returns:
+    dict[str, np.ndarray]: Per-row arrays 'year', 'month', 'day', 'week' (ISO week, int32),
+    'day_name', 'month_name', 'season' (object) and 'is_weekend' (int64).
+    """
+    codes, uniques = pd.factorize(np.asarray(days, dtype='datetime64[ns]'))
+    unique_dates = pd.DatetimeIndex(uniques)
+    months = unique_dates.month.to_numpy()
+    table = {
+        'year': unique_dates.year.to_numpy(),
+        'month': months,
+        'day': unique_dates.day.to_numpy(),
+        'week': unique_dates.isocalendar().week.to_numpy().astype('int32'),
+        'day_name': unique_dates.day_name().to_numpy(dtype=object),
+        'month_name': unique_dates.month_name().to_numpy(dtype=object),
+        'season': np.array([SEASON_MAPPING[m] for m in months], dtype=object),
+        'is_weekend': np.isin(unique_dates.weekday.to_numpy(), [5, 6]).astype(np.int64),
+    }
+    return {name: values[codes] for name, values in table.items()}
+
+
+def low_activity_agents(df, threshold=1000):
+    """
+    Returns the agent IDs with fewer than *threshold* bookings in the given DataFrame.
+
+    Parameters:
+    df (pd.DataFrame): Input dataframe containing the raw 'agent' column.
+    threshold (int): Minimum number of bookings for an agent not to count as low-activity.
+
+    Returns:
+    pd.Index: Agent IDs (as strings, missing agents as 'unknown') considered low-activity.
+    """
+    agent_counts = df['agent'].fillna('unknown').astype(str).value_counts()
+    return agent_counts[agent_counts < threshold].index
+
+
+def feature_engineering(df, rare_agents=None):
     """
     Adds custom features to the given DataFrame.
 
     Parameters:
     df (pd.DataFrame): Input dataframe containing hotel booking data.
+    rare_agents (list-like, optional): Agent IDs flagged by 'is_low_activity_agent'.
+        If None, they are computed from *df* itself with low_activity_agents(df).
+        Pass the IDs learned on the training data to engineer new batches consistently.
 
     Returns:
     pd.DataFrame: Dataframe with new features added.
@@ -41,12 +183,14 @@ def feature_engineering(df):
     df['is_only_adult_booking'] = ((df['adults'] > 0) & (df['children'] == 0) & (df['babies'] == 0)).astype(int)
 
     # Create the arrival_date as a full datetime object from year, month, and day
-    df['arrival_date_full'] = pd.to_datetime(
-        df['arrival_date_year'].astype(str) + '-' + df['arrival_date_month'] + '-' + df['arrival_date_day_of_month'].astype(str)
-    )
+    df['arrival_date_month_integer_version'] = df['arrival_date_month'].map(MONTH_MAPPING)
+    arrival_days = _days_from_parts(
+        df['arrival_date_year'], df['arrival_date_month_integer_version'], df['arrival_date_day_of_month'])
+    df['arrival_date_full'] = arrival_days.astype('datetime64[ns]')
+    arrival = calendar_features(arrival_days)
 
     # Get the weekday name for the arrival date (e.g., 'Monday', 'Tuesday', etc.)
-    df['arrival_weekday'] = df['arrival_date_full'].dt.day_name()
+    df['arrival_weekday'] = arrival['day_name']
     
     #A binary feature indicating if a booking includes only adults and is on weekdays—possibly suggesting a business trip, 
     # which may be less prone to cancellation.
@@ -58,62 +202,43 @@ def feature_engineering(df):
     ).astype(int)
     
     # Calculate booking date as arrival_date_full minus lead_time days
-    df['booking_date_full'] = df['arrival_date_full'] - pd.to_timedelta(df['lead_time'], unit='d')
+    booking_days = arrival_days - df['lead_time'].to_numpy(dtype=np.int64).astype('timedelta64[D]')
+    df['booking_date_full'] = booking_days.astype('datetime64[ns]')
+    booking = calendar_features(booking_days)
     
     # Extract year, month, week number, and day of the month from 'booking_date_full'
-    df['booking_date_year'] = pd.to_datetime(df['booking_date_full']).dt.year
-    df['booking_date_month'] = pd.to_datetime(df['booking_date_full']).dt.month_name()
-    df['booking_date_week_number'] = pd.to_datetime(df['booking_date_full']).dt.isocalendar().week.astype('int32')
-    df['booking_date_day_of_month'] = pd.to_datetime(df['booking_date_full']).dt.day
-    df['booking_weekday'] = df['booking_date_full'].dt.day_name()
+    df['booking_date_year'] = booking['year']
+    df['booking_date_month'] = booking['month_name']
+    df['booking_date_week_number'] = booking['week']
+    df['booking_date_day_of_month'] = booking['day']
+    df['booking_weekday'] = booking['day_name']
     
     # Create season-related features for booking and arrival dates
-    season_mapping = {
-    12: 'Winter', 1: 'Winter', 2: 'Winter',
-    3: 'Spring', 4: 'Spring', 5: 'Spring',
-    6: 'Summer', 7: 'Summer', 8: 'Summer',
-    9: 'Fall', 10: 'Fall', 11: 'Fall'
-    }
-    df['booking_season'] = df['booking_date_full'].dt.month.map(season_mapping)
-    df['arrival_season'] = df['arrival_date_full'].dt.month.map(season_mapping)
+    df['booking_season'] = booking['season']
+    df['arrival_season'] = arrival['season']
     
-    # Create integer versions of booking_date_month and arrival_date_month columns
-    month_mapping = {
-    'January': 1, 'February': 2, 'March': 3, 'April': 4,
-    'May': 5, 'June': 6, 'July': 7, 'August': 8,
-    'September': 9, 'October': 10, 'November': 11, 'December': 12
-    }
-    df['booking_date_month_integer_version'] = df['booking_date_month'].map(month_mapping)
-    df['arrival_date_month_integer_version'] = df['arrival_date_month'].map(month_mapping)
+    # Create integer version of booking_date_month (arrival_date_month's is created above)
+    df['booking_date_month_integer_version'] = booking['month'].astype(np.int64)
     
     # Create special day-related features for booking and arrival dates
-    special_days = [
-    (1, 1),   # New Year's Day
-    (12, 31),  # New Year's Eve
-    (12, 25), # Christmas Day
-    (12, 24), # Christmas's Eve
-    (2, 14),  # Valentine's Day
-    (10, 31), # Halloween
-    (5, 1)  # Labor Day
-    ]
-    df['is_booking_on_special_day'] = df.apply(
-        lambda x: int((x['booking_date_month_integer_version'], x['booking_date_day_of_month']) in special_days), axis=1)
-    df['is_arrival_on_special_day'] = df.apply(
-        lambda x: int((x['arrival_date_month_integer_version'], x['arrival_date_day_of_month']) in special_days), axis=1)
+    df['is_booking_on_special_day'] = _is_special_day(
+        df['booking_date_month_integer_version'], df['booking_date_day_of_month'])
+    df['is_arrival_on_special_day'] = _is_special_day(
+        df['arrival_date_month_integer_version'], df['arrival_date_day_of_month'])
     
     # Check if the arrival and booking date is a weekend (Saturday or Sunday)
-    df['is_arrival_on_weekend'] = df['arrival_date_full'].dt.weekday.isin([5, 6]).astype(int)
-    df['is_booking_on_weekend'] = df['booking_date_full'].dt.weekday.isin([5, 6]).astype(int)
+    df['is_arrival_on_weekend'] = arrival['is_weekend']
+    df['is_booking_on_weekend'] = booking['is_weekend']
     
     # Calculate number of bookings before a booking 
     df['total_previous_bookings'] = df['previous_cancellations'] + df['previous_bookings_not_canceled']
     
     # Calculate the percentage of cancellations before a booking (if total_previous_bookings is 0, this also becomes 0)
-    df['previous_cancellation_percentage'] = df.apply(
-    lambda x: (x['previous_cancellations'] / x['total_previous_bookings'] * 100) 
-    if x['total_previous_bookings'] > 0 else 0,
-    axis=1
-    )
+    previous_cancellations = df['previous_cancellations'].to_numpy(dtype=np.float64)
+    total_previous_bookings = df['total_previous_bookings'].to_numpy(dtype=np.float64)
+    percentage = np.zeros(len(df), dtype=np.float64)
+    np.divide(previous_cancellations, total_previous_bookings, out=percentage, where=total_previous_bookings > 0)
+    df['previous_cancellation_percentage'] = percentage * 100
     
     # Calculate ratio of the number of changes about a booking and lead time
     # Add a small value (1e-10) to avoid division by zero errors
@@ -166,17 +291,14 @@ def feature_engineering(df):
     df['lead_time_to_total_stay_ratio'] = df['lead_time'] / (df['stays_in_weekend_nights'] + df['stays_in_week_nights'] + 1e-10)
 
     # Create binary feature for reservations with meal type 'Undefined' or 'SC', and total stay duration (weekend + weekday nights) > 3
-    df['is_long_stay_no_meal'] = df.apply(
-        lambda x: (x['meal'] in ['Undefined', 'SC']) and ((x['stays_in_weekend_nights'] + x['stays_in_week_nights']) > 3),
-        axis=1
+    no_meal = df['meal'].isin(NO_MEAL_TYPES)
+    df['is_long_stay_no_meal'] = (
+        no_meal & ((df['stays_in_weekend_nights'] + df['stays_in_week_nights']) > 3)
     ).astype(int)
 
     # Create binary feature for bookings with children or babies but meal type is 'Undefined' or 'SC'
     # This may indicate families who might be more likely to cancel due to lack of included meals
-    df['has_kids_but_no_meal'] = df.apply(
-        lambda x: ((x['children'] + x['babies']) > 0) and (x['meal'] in ['Undefined', 'SC']),
-        axis=1
-    ).astype(int)
+    df['has_kids_but_no_meal'] = (((df['children'] + df['babies']) > 0) & no_meal).astype(int)
     
     #fillna for country
     df['country'] = df['country'].fillna('unknown')
@@ -184,10 +306,9 @@ def feature_engineering(df):
     # create new column "is_low_activity_agent"
     df['agent'] = df['agent'].fillna('unknown')
     df['agent'] = df['agent'].astype(str) #agent column is logically categorical
-    # Count agent IDs
-    agent_counts = df['agent'].value_counts()
     # Identify agents with fewer than 1000 bookings — considered low-activity agents
-    rare_agents = agent_counts[agent_counts < 1000].index
+    if rare_agents is None:
+        rare_agents = low_activity_agents(df)
     # create the column
     df['is_low_activity_agent'] = df['agent'].isin(rare_agents).astype(int)
     
@@ -225,4 +346,65 @@ def feature_engineering(df):
     )
 
 
-    return df
\ No newline at end of file
+    return df
+
+
+_POOL = None
+_POOL_WORKERS = 0
+
+
+def _worker_pool(n_workers):
+    # one long-lived pool per process, only re-created when more workers are needed
+    global _POOL, _POOL_WORKERS
+    if _POOL is None or _POOL_WORKERS < n_workers:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False)
+        _POOL = ProcessPoolExecutor(max_workers=n_workers)
+        _POOL_WORKERS = n_workers
+    return _POOL
+
+
+def parallel_feature_engineering(df, n_jobs=-1, n_partitions=None, rare_agents=None, min_rows=PARALLEL_MIN_ROWS):
+    """
+    Runs feature_engineering on row partitions of the DataFrame in a process pool.
+
+    Every feature is computed from its own row, except 'is_low_activity_agent', which
+    needs the agent counts of the whole DataFrame. Those are computed once up front and
+    passed to every worker, so the result is identical to feature_engineering(df).
+    Partitions are concatenated back in their original order.
+
+    The worker processes are started on the first call and reused by later calls
+    (e.g. every transform of a BookingPreprocessor), so only the first call pays
+    the process start-up. DataFrames with fewer than *min_rows* rows are processed
+    in-process.
+
+    Parameters:
+    df (pd.DataFrame): Input dataframe containing hotel booking data (left unmodified).
+    n_jobs (int): Number of worker processes; -1 uses all CPU cores.
+    n_partitions (int, optional): Number of row blocks; defaults to n_jobs.
+    rare_agents (list-like, optional): As in feature_engineering; computed from *df* if None.
+    min_rows (int): Run serially below this many rows (default PARALLEL_MIN_ROWS).
+
+    Returns:
+    pd.DataFrame: Dataframe with new features added.
+    """
+    if rare_agents is None:
+        rare_agents = low_activity_agents(df)
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    n_partitions = min(n_partitions or n_jobs, max(len(df), 1))
+
+    bounds = np.linspace(0, len(df), n_partitions + 1).astype(int)
+    partitions = [df.iloc[start:stop].copy() for start, stop in zip(bounds[:-1], bounds[1:])]
+    worker = partial(feature_engineering, rare_agents=pd.Index(rare_agents))
+
+    if n_jobs == 1 or n_partitions == 1 or len(df) < min_rows:
+        results = [worker(part) for part in partitions]
+    else:
+        try:
+            results = list(_worker_pool(min(n_jobs, n_partitions)).map(worker, partitions))
+        except BrokenProcessPool:
+            global _POOL
+            _POOL = None  # a worker died; start a fresh pool on the next call
+            raise
+    return pd.concat(results)
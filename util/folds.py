@@ -0,0 +1,230 @@
+from __future__ import annotations
+import json
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+
+from util.data_scaling import scale
+from util.oversampling import FastSMOTE
+from util.smote_function import apply_smote
+from util.split import split_df
+
+# SMOTE implementations FoldCache can use
+SMOTE_BACKENDS = ("imblearn", "fast")
+
+
+def stratified_folds(
+    y: pd.Series | np.ndarray,
+    n_splits: int = 5,
+    random_state: int | None = 42,
+    stratify: bool = True,
+) -> list[np.ndarray]:
+    """
+    Partition the row positions of *y* into *n_splits* (stratified) folds.
+
+    Fold *i* is split off the rows not yet assigned with ``split_df`` and
+    ``test_size = 1 / (n_splits - i)``, so the folds have equal sizes and
+    class ratios, like ``StratifiedKFold``.  Only a frame of row positions
+    is split; the data itself is never copied.
+
+    Returns
+    -------
+    list[np.ndarray]
+        Sorted row positions of each fold.
+    """
+    labels = np.asarray(y)
+    remaining = pd.DataFrame({"position": np.arange(len(labels))})
+    folds = []
+    for i in range(n_splits - 1):
+        remaining, fold = split_df(
+            remaining,
+            test_size=1 / (n_splits - i),
+            random_state=random_state,
+            stratify=labels[remaining["position"]] if stratify else None,
+        )
+        folds.append(np.sort(fold["position"].to_numpy()))
+    folds.append(np.sort(remaining["position"].to_numpy()))
+    return folds
+
+
+class FoldCache:
+    """
+    Cross-validation folds computed once and shared by every model.
+
+    The folds are stored as row-position arrays.  Per-fold training and
+    test frames, optionally scaled (scaler fitted on the fold's training
+    rows) and/or SMOTE-resampled (training rows only), are built on first
+    request and afterwards returned from the cache by reference, so every
+    model evaluation sees the same folds and nothing is resampled twice.
+
+    A ``FoldCache`` is also a scikit-learn CV splitter: pass it as
+    ``cv=`` to ``cross_val_score``, ``learning_curve`` or the search CVs
+    (those fit on the raw fold rows; use ``evaluate`` for scaled or SMOTE
+    folds).
+
+    Parameters
+    ----------
+    X : pd.DataFrame
+        Features (e.g. the preprocessed ``train_data`` without the target).
+    y : pd.Series
+        Target.
+    n_splits : int, default=5
+    random_state : int | None, default=42
+    stratify : bool, default=True
+        Keep the class ratio of *y* in every fold.
+    smote_backend : {'imblearn', 'fast'}, default='imblearn'
+        SMOTE implementation of the ``smote`` folds:
+
+        • **imblearn** – ``util.smote_function.apply_smote``, the
+          resampling of the model-training notebooks
+        • **fast** – ``util.oversampling.FastSMOTE``: the same SMOTE rule,
+          but with its own random draws (so the fold scores differ from
+          imblearn's by sampling noise); its neighbour graph is built once
+          per fold and shared by all *sampling_strategy* / *random_state*
+          values
+
+    Examples
+    --------
+    >>> folds = FoldCache(X_train, y_train, n_splits=5)
+    >>> cross_val_score(model, X_train, y_train, cv=folds, scoring="f1")
+    >>> folds.evaluate(KNeighborsClassifier(), scoring="recall", smote={"k_neighbors": 5})
+    >>> fast = FoldCache(X_train, y_train, smote_backend="fast")   # for sweeps over sampling_strategy
+    """
+
+    def __init__(
+        self,
+        X: pd.DataFrame,
+        y: pd.Series,
+        n_splits: int = 5,
+        random_state: int | None = 42,
+        stratify: bool = True,
+        smote_backend: str = "imblearn",
+    ) -> None:
+        if len(X) != len(y):
+            raise ValueError(f"X has {len(X)} rows but y has {len(y)}")
+        if smote_backend not in SMOTE_BACKENDS:
+            raise ValueError(f"smote_backend must be one of {SMOTE_BACKENDS}")
+        self.X = X
+        self.y = y
+        self.n_splits = n_splits
+        self.smote_backend = smote_backend
+        self.folds_ = stratified_folds(y, n_splits, random_state, stratify)
+        self._cache: dict = {}
+
+    # ---- scikit-learn splitter interface ----
+
+    def get_n_splits(self, X=None, y=None, groups=None) -> int:
+        return self.n_splits
+
+    def split(self, X=None, y=None, groups=None):
+        """
+        Yield ``(train_positions, test_positions)`` for every fold.
+        """
+        if X is not None and len(X) != len(self.y):
+            raise ValueError(f"FoldCache was built for {len(self.y)} rows, got {len(X)}")
+        for i in range(self.n_splits):
+            yield self.train_positions(i), self.folds_[i]
+
+    def train_positions(self, i: int) -> np.ndarray:
+        """
+        Row positions outside fold *i* (cached).
+        """
+        key = ("train", i)
+        if key not in self._cache:
+            self._cache[key] = np.concatenate([fold for j, fold in enumerate(self.folds_) if j != i])
+        return self._cache[key]
+
+    # ---- fold-local artifacts ----
+
+    def fold(
+        self,
+        i: int,
+        scaling_method: str | None = None,
+        smote: bool | dict | None = None,
+    ) -> tuple[pd.DataFrame, pd.Series, pd.DataFrame, pd.Series]:
+        """
+        Training and test data of fold *i*, built once and then cached.
+
+        Parameters
+        ----------
+        i : int
+            Fold number (its rows are the test part).
+        scaling_method : {'standard', 'minmax', 'robust'} | None, default=None
+            Scale all numeric columns with a scaler fitted on the training
+            part (see ``util.data_scaling.scale``).
+        smote : bool | dict | None, default=None
+            Oversample the training part with the *smote_backend*; a dict
+            holds its parameters (``sampling_strategy``, ``k_neighbors``,
+            ``random_state``, ...); ``True`` or ``{}`` uses the defaults,
+            ``False`` / *None*: no SMOTE.
+
+        Returns
+        -------
+        tuple
+            (X_train, y_train, X_test, y_test) – shared, do not modify.
+        """
+        smote_params = None if smote in (None, False) else ({} if smote is True else dict(smote))
+        key = ("fold", i, scaling_method, json.dumps(smote_params, sort_keys=True, default=str))
+        if key in self._cache:
+            return self._cache[key]
+
+        if smote_params is not None and self.smote_backend == "imblearn":
+            X_train, y_train, X_test, y_test = self.fold(i, scaling_method)
+            X_train, y_train = apply_smote(X_train, y_train, **smote_params)
+        elif smote_params is not None:
+            # the scaled (or raw) fold is an artifact of its own, shared by all SMOTE settings
+            X_train, y_train, X_test, y_test = self.fold(i, scaling_method)
+            sampler_params = dict(smote_params)
+            sampling_strategy = sampler_params.pop("sampling_strategy", "auto")
+            random_state = sampler_params.pop("random_state", None)
+            sampler_key = ("smote", i, scaling_method, json.dumps(sampler_params, sort_keys=True, default=str))
+            if sampler_key not in self._cache:
+                self._cache[sampler_key] = FastSMOTE(**sampler_params).fit(X_train, y_train)
+            X_train, y_train = self._cache[sampler_key].resample(sampling_strategy, random_state)
+        elif scaling_method is not None:
+            X_train, y_train, X_test, y_test = self.fold(i)
+            X_train, scaler = scale(X_train, method=scaling_method, return_scaler=True)
+            columns = list(scaler.feature_names_in_)
+            X_test = X_test.copy()
+            X_test[columns] = scaler.transform(X_test[columns])
+        else:
+            train, test = self.train_positions(i), self.folds_[i]
+            X_train, y_train = self.X.iloc[train], self.y.iloc[train]
+            X_test, y_test = self.X.iloc[test], self.y.iloc[test]
+
+        self._cache[key] = (X_train, y_train, X_test, y_test)
+        return self._cache[key]
+
+    def evaluate(
+        self,
+        estimator,
+        scoring: str = "recall",
+        scaling_method: str | None = None,
+        smote: bool | dict | None = None,
+    ) -> np.ndarray:
+        """
+        Fit a clone of *estimator* on every fold and score it on the fold's
+        test part (cached fold data, see ``fold``).
+
+        Returns
+        -------
+        np.ndarray
+            One score per fold.
+        """
+        scorer = get_scorer(scoring)
+        scores = []
+        for i in range(self.n_splits):
+            X_train, y_train, X_test, y_test = self.fold(i, scaling_method, smote)
+            model = clone(estimator).fit(X_train, y_train)
+            scores.append(scorer(model, X_test, y_test))
+        return np.array(scores)
+
+    def clear(self, keep_indices: bool = True) -> None:
+        """
+        Drop the cached fold data (and the training positions unless
+        *keep_indices*).
+        """
+        self._cache = {key: value for key, value in self._cache.items()
+                       if keep_indices and key[0] == "train"}
@@ -1,13 +1,133 @@
-def handle_outlier(df):
-    df = df[df['adr'] >= 0]
-    df = df[df['stays_in_weekend_nights'] <= 8]
-    df = df[df['stays_in_week_nights'] <= 20]
-    df = df[df['adults'] <= 6]
-    df = df[df['babies'] <= 5]
-    df = df[df['previous_bookings_not_canceled'] <= 20]
-    df = df[df['booking_changes'] <= 10]
-    df = df[df['adr'] != 5400]  # drop that one line with 5400
-    df = df[df['required_car_parking_spaces'] <= 4]
-    df = df[df['total_people'] <= 6]
-    
-    return df
\ No newline at end of file
+from __future__ import annotations
+import operator
+
+import numpy as np
+import pandas as pd
+
+# (column, comparison, threshold): rows are kept where  df[column] <comparison> threshold
+OUTLIER_RULES = [
+    ("adr", ">=", 0),
+    ("stays_in_weekend_nights", "<=", 8),
+    ("stays_in_week_nights", "<=", 20),
+    ("adults", "<=", 6),
+    ("babies", "<=", 5),
+    ("previous_bookings_not_canceled", "<=", 20),
+    ("booking_changes", "<=", 10),
+    ("adr", "!=", 5400),  # drop that one line with 5400
+    ("required_car_parking_spaces", "<=", 4),
+    ("total_people", "<=", 6),
+]
+
+_COMPARISONS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def _rule_name(rule: tuple) -> str:
+    column, comparison, threshold = rule
+    return f"{column} {comparison} {threshold}"
+
+
+def _rule_masks(df: pd.DataFrame, rules: list[tuple]) -> list[np.ndarray]:
+    # one boolean keep-array per rule; missing values fail every rule except '!=', as NaN does
+    # in float comparisons - set explicitly, since '!=' on a nullable (Int64) NA gives NA, not True
+    masks = []
+    for column, comparison, threshold in rules:
+        compare = _COMPARISONS.get(comparison)
+        if compare is None:
+            raise ValueError(f"unknown comparison {comparison!r}; use one of {list(_COMPARISONS)}")
+        kept = compare(df[column], threshold).to_numpy(dtype=bool, na_value=False)
+        if comparison == "!=":
+            kept |= df[column].isna().to_numpy()
+        masks.append(kept)
+    return masks
+
+
+def outlier_mask(df: pd.DataFrame, rules: list[tuple] = OUTLIER_RULES) -> np.ndarray:
+    """
+    Evaluate all outlier rules in one pass and return the rows to keep.
+
+    Nothing is copied: use the mask to filter (``df[mask]``), to weight or
+    to audit rows.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Data after feature engineering (needs ``total_people``).
+    rules : list[tuple], default=OUTLIER_RULES
+        ``(column, comparison, threshold)`` triples; *comparison* is one of
+        '<', '<=', '>', '>=', '==', '!='.  A row is kept if it satisfies
+        every rule.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array, True for rows that pass all rules.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for kept in _rule_masks(df, rules):
+        mask &= kept
+    return mask
+
+
+def outlier_report(df: pd.DataFrame, rules: list[tuple] = OUTLIER_RULES) -> pd.DataFrame:
+    """
+    Per-rule drop counts for *df*.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per rule, indexed by rule name ("adr >= 0", ...), with
+        • **violations** – rows that fail this rule
+        • **dropped**    – rows whose first failed rule (in *rules* order) is
+          this one, i.e. what the rule removes when applied in sequence;
+          the column sums to the total number of dropped rows
+    """
+    remaining = np.ones(len(df), dtype=bool)
+    records = []
+    for rule, kept in zip(rules, _rule_masks(df, rules)):
+        records.append({
+            "rule": _rule_name(rule),
+            "violations": int((~kept).sum()),
+            "dropped": int((remaining & ~kept).sum()),
+        })
+        remaining &= kept
+    return pd.DataFrame.from_records(records, index="rule", columns=["rule", "violations", "dropped"])
+
+
+def outlier_audit(df: pd.DataFrame, rules: list[tuple] = OUTLIER_RULES) -> pd.Series:
+    """
+    Name of the first rule each row fails (NaN for kept rows), indexed like *df*.
+    """
+    first = np.full(len(df), -1)
+    for i, kept in reversed(list(enumerate(_rule_masks(df, rules)))):
+        first[~kept] = i
+    names = np.array([_rule_name(rule) for rule in rules] + [np.nan], dtype=object)
+    return pd.Series(names[first], index=df.index, name="outlier_rule")
+
+
+def handle_outlier(df: pd.DataFrame, rules: list[tuple] = OUTLIER_RULES) -> pd.DataFrame:
+    """
+    Drop the rows of *df* that fail any outlier rule.
+
+    All rules are evaluated into a single mask (see ``outlier_mask``) and
+    the frame is filtered once.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Training data after feature engineering (left unmodified).
+    rules : list[tuple], default=OUTLIER_RULES
+        ``(column, comparison, threshold)`` triples.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows that pass every rule.
+    """
+    return df[outlier_mask(df, rules)]
@@ -0,0 +1,298 @@
+from __future__ import annotations
+import importlib.util
+import json
+import math
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.stats import loguniform, randint
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterSampler
+
+from util.dataset_store import load_splits
+from util.stage_cache import fingerprint
+
+# the search spaces of the [4] Model_training notebooks
+SEARCH_SPACES = {
+    "knn": {
+        "n_neighbors": randint(1, 100),
+        "weights": ["uniform", "distance"],
+        "algorithm": ["auto", "ball_tree", "kd_tree", "brute"],
+        "leaf_size": randint(10, 50),
+        "metric": ["euclidean", "manhattan"],
+    },
+    "decision_tree": {
+        "max_depth": randint(5, 50),
+        "min_samples_split": randint(2, 20),
+        "min_samples_leaf": randint(1, 10),
+        "criterion": ["gini", "entropy"],
+    },
+    "random_forest": {
+        "n_estimators": randint(100, 300),
+        "max_depth": randint(10, 50),
+        "min_samples_split": randint(2, 10),
+        "min_samples_leaf": randint(1, 5),
+        "bootstrap": [True, False],
+    },
+    "logistic_regression": {
+        "C": loguniform(1e-4, 1e2),
+        "penalty": ["l1", "l2"],
+        "solver": ["liblinear", "saga"],
+    },
+    "xgboost": {
+        "n_estimators": [64, 80, 96],
+        "max_depth": [3, 6, 9],
+        "learning_rate": [0.1, 0.2, 0.05],
+        "subsample": [1.0, 0.8],
+    },
+}
+
+# families that need a package outside requirements.txt
+OPTIONAL_PACKAGES = {"xgboost": "xgboost"}
+
+
+def available_models(names: list[str]) -> list[str]:
+    """
+    The families of *names* whose estimator package is installed.
+    """
+    return [name for name in names
+            if name not in OPTIONAL_PACKAGES or importlib.util.find_spec(OPTIONAL_PACKAGES[name]) is not None]
+
+
+def make_model(name: str, params: dict):
+    """
+    Unfitted estimator of model family *name* with *params* (the fixed
+    settings of the notebooks, e.g. ``random_state=42``, are added).
+    """
+    if name == "knn":
+        from sklearn.neighbors import KNeighborsClassifier
+        return KNeighborsClassifier(**params)
+    if name == "decision_tree":
+        from sklearn.tree import DecisionTreeClassifier
+        return DecisionTreeClassifier(random_state=42, **params)
+    if name == "random_forest":
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(random_state=42, **params)
+    if name == "logistic_regression":
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(max_iter=1000, random_state=42, **params)
+    if name == "xgboost":
+        import xgboost as xgb  # optional dependency, only needed for this family
+        return xgb.XGBClassifier(random_state=42, eval_metric="logloss", tree_method="auto", **params)
+    raise ValueError(f"unknown model {name!r}; use one of {list(SEARCH_SPACES)}")
+
+
+def halving_fractions(min_fraction: float, eta: int) -> list[float]:
+    """
+    Training-set fractions of the successive-halving rungs, ending at 1.0.
+
+    >>> halving_fractions(1 / 9, 3)
+    [0.1111111111111111, 0.3333333333333333, 1.0]
+    """
+    n_rungs = max(int(math.floor(math.log(1 / min_fraction, eta) + 1e-9)), 0) + 1
+    return [eta ** (rung - n_rungs + 1) for rung in range(n_rungs - 1)] + [1.0]
+
+
+def _json_params(params: dict) -> dict:
+    # sampled values come back as NumPy scalars
+    return {name: value.item() if isinstance(value, np.generic) else value for name, value in params.items()}
+
+
+# ---- worker side: every process loads the prepared splits once ----
+
+_DATA: dict = {}
+
+
+def _load_data(store_dir, key, target, random_state):
+    splits = load_splits(store_dir, key, names=["train_data", "val_data"])
+    train, val = splits["train_data"], splits["val_data"]
+    # one fixed permutation, so every rung trains on a superset of the rows of the one below
+    order = np.random.default_rng(random_state).permutation(len(train))
+    _DATA.update(
+        X_train=train.drop(columns=target).iloc[order].reset_index(drop=True),
+        y_train=train[target].iloc[order].reset_index(drop=True),
+        X_val=val.drop(columns=target),
+        y_val=val[target],
+    )
+
+
+def _run_trial(model, trial, params, rung, fraction, scoring):
+    n_rows = max(int(round(fraction * len(_DATA["y_train"]))), 1)
+    estimator = make_model(model, params)
+    start = time.perf_counter()
+    estimator.fit(_DATA["X_train"].iloc[:n_rows], _DATA["y_train"].iloc[:n_rows])
+    score = get_scorer(scoring)(estimator, _DATA["X_val"], _DATA["y_val"])
+    return {
+        "model": model,
+        "trial": trial,
+        "rung": rung,
+        "fraction": fraction,
+        "n_train_rows": n_rows,
+        "score": float(score),
+        "seconds": time.perf_counter() - start,
+        "params": params,
+    }
+
+
+# ---- driver ----
+
+def _read_checkpoint(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    lines = path.read_text().splitlines()
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            # a trial that was being written when the search was killed:
+            # drop it, so new trials are not appended to the partial line
+            path.write_text("".join(json.dumps(record) + "\n" for record in records))
+            break
+    return records
+
+
+def run_search(
+    store_dir: str | Path,
+    key: str,
+    models: list[str] | None = None,
+    *,
+    n_iter: int = 50,
+    scoring: str = "recall",
+    eta: int = 3,
+    min_fraction: float = 1 / 9,
+    n_jobs: int = -1,
+    checkpoint_dir: str | Path = "search_checkpoints",
+    target: str = "is_canceled",
+    random_state: int = 42,
+    search_spaces: dict | None = None,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """
+    Random search with successive halving over several model families,
+    resumable from a checkpoint.
+
+    All families are tuned on the same prepared dataset (the store written
+    by ``util.dataset_store.prepare_splits``), which every worker process
+    loads once, memory-mapped.  *n_iter* configurations per family are
+    sampled; each is trained on ``min_fraction`` of the training split and
+    scored on the validation split, the best ``1 / eta`` of each family go
+    on to ``eta`` times more training rows, and so on up to the full split.
+    Trials of all families in a rung run together in a process pool.
+
+    Every finished trial is appended to a JSON-lines checkpoint named after
+    the search settings; running the same search again skips the trials
+    that are already in it, so an interrupted search resumes where it
+    stopped.
+
+    Parameters
+    ----------
+    store_dir, key : str | Path, str
+        Location of the prepared splits (``train_data`` and ``val_data``).
+    models : list[str] | None, default=None
+        Families to tune (keys of *search_spaces*); if *None*, all whose
+        package is installed (xgboost is optional and left out with a
+        warning when missing).
+    n_iter : int, default=50
+        Configurations sampled per family.
+    scoring : str, default='recall'
+        scikit-learn scorer name, evaluated on the validation split.
+    eta : int, default=3
+        Halving rate: the top ``ceil(n / eta)`` trials of a rung advance.
+    min_fraction : float, default=1/9
+        Training fraction of the first rung; 1.0 disables halving.
+    n_jobs : int, default=-1
+        Worker processes; -1 uses all CPU cores, 1 runs in this process.
+    checkpoint_dir : str | Path, default='search_checkpoints'
+        Where the checkpoint files are kept.
+    target : str, default='is_canceled'
+    random_state : int, default=42
+        Seeds the configuration sampling and the training-row order.
+    search_spaces : dict | None, default=None
+        {family: parameter distributions}; defaults to ``SEARCH_SPACES``.
+    verbose : bool, default=True
+        Print one line per rung.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per trial and rung: model, trial, rung, fraction,
+        n_train_rows, score, seconds and params (a dict).
+    """
+    search_spaces = search_spaces or SEARCH_SPACES
+    if not models:
+        models = available_models(list(search_spaces))
+        skipped = [name for name in search_spaces if name not in models]
+        if skipped:
+            warnings.warn(f"skipping {skipped}: {', '.join(OPTIONAL_PACKAGES[name] for name in skipped)} "
+                          f"not installed", stacklevel=2)
+    fractions = halving_fractions(min_fraction, eta)
+
+    configs = {
+        model: [_json_params(p) for p in ParameterSampler(search_spaces[model], n_iter, random_state=random_state)]
+        for model in models
+    }
+    search_id = fingerprint({"key": key, "configs": configs, "scoring": scoring, "fractions": fractions,
+                             "target": target, "random_state": random_state})
+    checkpoint = Path(checkpoint_dir) / f"{search_id}.jsonl"
+    checkpoint.parent.mkdir(parents=True, exist_ok=True)
+
+    records = _read_checkpoint(checkpoint)
+    done = {(r["model"], r["trial"], r["rung"]) for r in records}
+    if verbose and records:
+        print(f"resuming from {checkpoint} ({len(records)} trials done)")
+
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    init_args = (store_dir, key, target, random_state)
+    pool = ProcessPoolExecutor(max_workers=n_jobs, initializer=_load_data, initargs=init_args) if n_jobs > 1 else None
+    if pool is None:
+        _load_data(*init_args)
+
+    try:
+        with checkpoint.open("a") as out:
+            alive = {model: list(range(len(configs[model]))) for model in models}
+            for rung, fraction in enumerate(fractions):
+                todo = [(model, trial) for model in models for trial in alive[model]
+                        if (model, trial, rung) not in done]
+                tasks = [(model, trial, configs[model][trial], rung, fraction, scoring) for model, trial in todo]
+                start = time.perf_counter()
+                if pool is None:
+                    finished = (_run_trial(*task) for task in tasks)
+                else:
+                    finished = (future.result() for future in
+                                as_completed([pool.submit(_run_trial, *task) for task in tasks]))
+                for record in finished:
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                    records.append(record)
+                if verbose:
+                    print(f"rung {rung}: {len(tasks)} trials on {fraction:.0%} of the training rows "
+                          f"({time.perf_counter() - start:.1f}s, {sum(map(len, alive.values())) - len(tasks)} from checkpoint)")
+
+                if rung < len(fractions) - 1:
+                    scores = {(r["model"], r["trial"]): r["score"] for r in records if r["rung"] == rung}
+                    for model in models:
+                        ranked = sorted(alive[model], key=lambda trial: -scores[model, trial])
+                        alive[model] = sorted(ranked[:math.ceil(len(ranked) / eta)])
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    results = pd.DataFrame.from_records(records)
+    return results.sort_values(["model", "rung", "score"], ascending=[True, True, False], ignore_index=True)
+
+
+def best_trials(results: pd.DataFrame) -> pd.DataFrame:
+    """
+    Best trial of each family on its highest rung (usually the full
+    training split), from ``run_search`` results; sorted by score.
+    """
+    top = results[results["rung"] == results.groupby("model")["rung"].transform("max")]
+    best = top.loc[top.groupby("model")["score"].idxmax()]
+    return best.sort_values("score", ascending=False).set_index("model")
@@ -0,0 +1,214 @@
+from __future__ import annotations
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import DistanceMetric, get_scorer
+from sklearn.neighbors import NearestNeighbors
+
+from util.folds import FoldCache
+from util.stage_cache import fingerprint
+
+
+def _neighbor_weights(distances: np.ndarray, weights: str) -> np.ndarray | None:
+    # same rule as KNeighborsClassifier: 1 / distance, exact matches take all the weight
+    if weights == "uniform":
+        return None
+    if weights != "distance":
+        raise ValueError("weights must be 'uniform' or 'distance'")
+    with np.errstate(divide="ignore"):
+        inverse = 1.0 / distances
+    exact = np.isinf(inverse)
+    exact_rows = exact.any(axis=1)
+    inverse[exact_rows] = exact[exact_rows]
+    return inverse
+
+
+def _stable_order(distances: np.ndarray, indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # neighbours of every row by (distance, training index)
+    order = np.lexsort((indices, distances), axis=1)
+    return np.take_along_axis(distances, order, axis=1), np.take_along_axis(indices, order, axis=1)
+
+
+class KNeighborsIndex:
+    """
+    k-nearest-neighbour classifier that answers many ``n_neighbors`` /
+    ``weights`` settings from one neighbour search.
+
+    ``fit`` builds the index (KD-tree, ball tree or brute force, through
+    ``sklearn.neighbors.NearestNeighbors``) once.  The neighbours of a
+    query set are searched once for the largest k requested and kept; any
+    smaller k is a slice of that result, so sweeping k costs one search
+    instead of one per value.
+
+    Neighbours at equal distance are taken in training-row order, so the
+    k neighbours are always the first k by (distance, training index),
+    whatever the algorithm and whichever larger k was searched.  Rows
+    whose k-th neighbour is tied with the next one (common on one-hot
+    features) get their neighbours from an exact scan of the training
+    rows.  Predictions equal ``KNeighborsClassifier`` with the same
+    settings unless such ties occur; sklearn breaks them in an order that
+    depends on the algorithm.
+
+    Parameters
+    ----------
+    metric : str, default='euclidean'
+    algorithm : {'auto', 'ball_tree', 'kd_tree', 'brute'}, default='auto'
+    leaf_size : int, default=30
+    n_jobs : int | None, default=None
+        Parallel jobs of the neighbour search.
+
+    Examples
+    --------
+    >>> index = KNeighborsIndex(metric="manhattan").fit(X_train, y_train)
+    >>> for k in (5, 15, 45):
+    ...     recall_score(y_val, index.predict(X_val, n_neighbors=k))   # one search in total
+    """
+
+    def __init__(self, metric: str = "euclidean", algorithm: str = "auto",
+                 leaf_size: int = 30, n_jobs: int | None = None) -> None:
+        self.metric = metric
+        self.algorithm = algorithm
+        self.leaf_size = leaf_size
+        self.n_jobs = n_jobs
+
+    def fit(self, X, y) -> "KNeighborsIndex":
+        self.classes_, self._y = np.unique(np.asarray(y), return_inverse=True)
+        self._X = np.asarray(X, dtype=np.float64)
+        self.index_ = NearestNeighbors(metric=self.metric, algorithm=self.algorithm,
+                                       leaf_size=self.leaf_size, n_jobs=self.n_jobs).fit(X)
+        self._query_key = None
+        return self
+
+    def kneighbors(self, X, n_neighbors: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (distances, indices) of the *n_neighbors* nearest training rows of
+        every row of *X*, ordered by (distance, training index) and sliced
+        from the cached search when possible.
+        """
+        key = fingerprint(X)
+        if key != self._query_key or n_neighbors > self._distances.shape[1]:
+            self._distances, self._indices = self._search(X, n_neighbors)
+            self._query_key = key
+        return self._distances[:, :n_neighbors], self._indices[:, :n_neighbors]
+
+    def _search(self, X, n_neighbors: int) -> tuple[np.ndarray, np.ndarray]:
+        # one neighbour more than asked: a tie between the k-th and the next one means the
+        # search may have returned an arbitrary subset of the rows at the k-th distance
+        n_train = len(self._X)
+        distances, indices = self.index_.kneighbors(X, min(n_neighbors + 1, n_train))
+        if n_neighbors >= n_train:
+            return _stable_order(distances, indices)
+        tied = np.flatnonzero(distances[:, n_neighbors] == distances[:, n_neighbors - 1])
+        distances, indices = _stable_order(distances[:, :n_neighbors], indices[:, :n_neighbors])
+        if len(tied):
+            distances[tied], indices[tied] = self._exact_neighbors(np.asarray(X, dtype=np.float64)[tied],
+                                                                   n_neighbors)
+        return distances, indices
+
+    def _exact_neighbors(self, X: np.ndarray, n_neighbors: int) -> tuple[np.ndarray, np.ndarray]:
+        # first n_neighbors training rows by (distance, index), from all distances; in blocks of
+        # about 4M distances
+        metric = DistanceMetric.get_metric(self.metric)
+        n_train = len(self._X)
+        block_size = max(1, 4_000_000 // n_train)
+        distances = np.empty((len(X), n_neighbors))
+        indices = np.empty((len(X), n_neighbors), dtype=np.int64)
+        for start in range(0, len(X), block_size):
+            block = metric.pairwise(X[start:start + block_size], self._X)
+            kth = np.partition(block, n_neighbors - 1, axis=1)[:, n_neighbors - 1:n_neighbors]
+            closer = block < kth
+            # rows at the k-th distance fill the remaining places in training-row order
+            at_kth = block == kth
+            needed = n_neighbors - closer.sum(axis=1, keepdims=True)
+            chosen = closer | (at_kth & (np.cumsum(at_kth, axis=1) <= needed))
+            _, columns = np.nonzero(chosen)  # row-major: training index order within a row
+            columns = columns.reshape(-1, n_neighbors)
+            chosen_distances = np.take_along_axis(block, columns, axis=1)
+            distances[start:start + block_size], indices[start:start + block_size] = \
+                _stable_order(chosen_distances, columns)
+        return distances, indices
+
+    def predict_proba(self, X, n_neighbors: int = 5, weights: str = "uniform") -> np.ndarray:
+        distances, indices = self.kneighbors(X, n_neighbors)
+        labels = self._y[indices]
+        w = _neighbor_weights(distances, weights)
+        proba = np.zeros((len(labels), len(self.classes_)))
+        for c in range(len(self.classes_)):
+            hit = labels == c
+            proba[:, c] = hit.sum(axis=1) if w is None else (w * hit).sum(axis=1)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict(self, X, n_neighbors: int = 5, weights: str = "uniform") -> np.ndarray:
+        return self.classes_[self.predict_proba(X, n_neighbors, weights).argmax(axis=1)]
+
+
+class _FixedKNN:
+    # scorer adapter: an index with one n_neighbors / weights setting
+    _estimator_type = "classifier"
+
+    def __init__(self, index, n_neighbors, weights):
+        self.index, self.n_neighbors, self.weights = index, n_neighbors, weights
+        self.classes_ = index.classes_
+
+    def predict(self, X):
+        return self.index.predict(X, self.n_neighbors, self.weights)
+
+    def predict_proba(self, X):
+        return self.index.predict_proba(X, self.n_neighbors, self.weights)
+
+
+def knn_sweep(
+    folds: FoldCache,
+    n_neighbors: list[int],
+    weights: list[str] = ("uniform", "distance"),
+    *,
+    metric: str = "euclidean",
+    algorithm: str = "auto",
+    leaf_size: int = 30,
+    scoring: str = "recall",
+    scaling_method: str | None = None,
+    n_jobs: int | None = None,
+) -> pd.DataFrame:
+    """
+    Cross-validated scores of every (n_neighbors, weights) combination,
+    with one index and one neighbour search per fold.
+
+    Parameters
+    ----------
+    folds : FoldCache
+        Shared CV folds (``util.folds``); *scaling_method* picks the cached
+        scaled version of each fold.
+    n_neighbors : list[int]
+        k values to score; the neighbours are searched at ``max(n_neighbors)``.
+        Distance ties are broken by training-row order (see
+        ``KNeighborsIndex``), so every k scores exactly as a
+        ``KNeighborsIndex`` searched at that k alone.
+    weights : list[str], default=('uniform', 'distance')
+    metric, algorithm, leaf_size, n_jobs :
+        Passed to ``KNeighborsIndex``.
+    scoring : str, default='recall'
+        scikit-learn scorer name.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per (n_neighbors, weights) with mean_score, std_score and
+        the per-fold scores, sorted by mean_score.
+    """
+    scorer = get_scorer(scoring)
+    combos = list(product(sorted(set(n_neighbors)), weights))
+    scores = np.empty((len(combos), folds.n_splits))
+    for i in range(folds.n_splits):
+        X_train, y_train, X_test, y_test = folds.fold(i, scaling_method)
+        index = KNeighborsIndex(metric, algorithm, leaf_size, n_jobs).fit(X_train, y_train)
+        index.kneighbors(X_test, max(n_neighbors))
+        for j, (k, weight) in enumerate(combos):
+            scores[j, i] = scorer(_FixedKNN(index, k, weight), X_test, y_test)
+
+    results = pd.DataFrame(combos, columns=["n_neighbors", "weights"])
+    results["mean_score"] = scores.mean(axis=1)
+    results["std_score"] = scores.std(axis=1)
+    for i in range(folds.n_splits):
+        results[f"fold{i}_score"] = scores[:, i]
+    return results.sort_values("mean_score", ascending=False, ignore_index=True)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+import importlib
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Module-level ``plt = LazyModule("matplotlib.pyplot")`` keeps the usual
+    ``plt.figure(...)`` call sites but moves the import cost from importing
+    the calling module to the first function that actually plots.  The
+    real module is taken from ``sys.modules`` / imported then, so patches
+    applied to it (e.g. replacing ``plt.show``) are seen through the proxy.
+
+    Examples
+    --------
+    >>> sns = LazyModule("seaborn")
+    >>> sns.barplot(...)    # seaborn is imported here
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self._module = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attribute: str):
+        # only called for names not set on the proxy itself
+        return getattr(self._load(), attribute)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
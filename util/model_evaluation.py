@@ -0,0 +1,278 @@
+from __future__ import annotations
+import hashlib
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from util.stage_cache import StageCache, fingerprint
+
+METRICS = ["accuracy", "precision", "recall", "f1", "roc_auc"]
+
+
+def _n_workers(n_jobs: int | None) -> int:
+    n_jobs = n_jobs or 1
+    if n_jobs < 1:
+        return os.cpu_count() or 1
+    return n_jobs
+
+
+def _model_key(model) -> str:
+    # content hash of a fitted model: its pickle, not its (parameter-only) repr
+    return hashlib.sha256(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+class HoldoutEvaluator:
+    """
+    Holdout metrics with bootstrap confidence intervals and paired
+    comparisons for several candidate models.
+
+    Every model is asked for its probabilities once (models in parallel);
+    all metrics are then computed from the cached probabilities.  A
+    bootstrap resample is represented by how often it draws each holdout
+    row, so the confusion counts of all models and all resamples of a
+    block are one matrix product, and ROC-AUC is computed from the same
+    weights over the scores sorted once per model (ties count one half,
+    as in ``roc_auc_score``).  Blocks of resamples run on *n_jobs* threads
+    and are seeded per block, so the results do not depend on *n_jobs*.
+
+    All models are evaluated on the same resamples, so the differences in
+    ``compare`` are paired.
+
+    Parameters
+    ----------
+    probabilities : pd.DataFrame
+        P(is_canceled = 1) per holdout row, one column per model.
+    y : pd.Series | np.ndarray
+        True labels (0 / 1).
+    threshold : float, default=0.5
+        A row is predicted positive if its probability exceeds *threshold*
+        (``predict`` of sklearn classifiers at 0.5).
+
+    Examples
+    --------
+    >>> evaluator = HoldoutEvaluator.from_models({"Random Forest": rf_model, "XGBoost": xgb_model},
+    ...                                          X_holdout, y_holdout)
+    >>> evaluator.metrics()
+    >>> evaluator.bootstrap(n_resamples=5000).confidence_intervals()
+    >>> evaluator.compare()
+    """
+
+    def __init__(self, probabilities: pd.DataFrame, y, threshold: float = 0.5) -> None:
+        y = np.asarray(y)
+        if len(y) != len(probabilities):
+            raise ValueError(f"{len(probabilities)} probabilities but {len(y)} labels")
+        self.probabilities_ = probabilities
+        self.y = y.astype(bool)
+        self.threshold = threshold
+        self.bootstrap_ = None
+        self._prepare()
+
+    @classmethod
+    def from_models(
+        cls,
+        models: dict,
+        X: pd.DataFrame,
+        y,
+        threshold: float = 0.5,
+        n_jobs: int | None = -1,
+        cache: StageCache | None = None,
+    ) -> "HoldoutEvaluator":
+        """
+        Score *X* once with every model of *models* ({name: fitted
+        classifier}) and build the evaluator from the probabilities.
+
+        Models are scored on *n_jobs* threads.  With a *cache* the
+        probabilities are stored under a hash of *X* and the pickled model,
+        so re-running the evaluation does not predict again.
+        """
+        data_key = fingerprint(X) if cache is not None else None
+
+        def score(item):
+            name, model = item
+            key = fingerprint({"data": data_key, "model": _model_key(model)}) if cache is not None else None
+            if cache is not None:
+                hit, proba = cache.get(key)
+                if hit:
+                    return proba
+            proba = np.asarray(model.predict_proba(X))[:, 1]
+            if cache is not None:
+                cache.put(key, proba)
+            return proba
+
+        with ThreadPoolExecutor(max_workers=min(_n_workers(n_jobs), len(models))) as pool:
+            scores = list(pool.map(score, models.items()))
+        probabilities = pd.DataFrame(dict(zip(models, scores)), index=getattr(X, "index", None))
+        return cls(probabilities, y, threshold)
+
+    def _prepare(self):
+        # per-row indicator columns of the confusion counts and the tie groups for ROC-AUC
+        y = self.y
+        predicted = self.probabilities_.to_numpy() > self.threshold
+        # columns: tp, fp, fn of model 0, then of model 1, ...
+        self._confusion = np.column_stack([
+            indicator for j in range(predicted.shape[1])
+            for indicator in (y & predicted[:, j], ~y & predicted[:, j], y & ~predicted[:, j])
+        ]).astype(np.float64)
+
+        import scipy.sparse as sp
+        self._groups = []
+        rows = np.arange(len(y))
+        for name in self.probabilities_:
+            # rows with equal scores form one group, ordered by score
+            _, group = np.unique(self.probabilities_[name].to_numpy(), return_inverse=True)
+            n_groups = group.max() + 1 if len(group) else 0
+            positives = sp.csr_matrix((y.astype(np.float64), (rows, group)), shape=(len(y), n_groups))
+            negatives = sp.csr_matrix(((~y).astype(np.float64), (rows, group)), shape=(len(y), n_groups))
+            self._groups.append((positives.T.tocsr(), negatives.T.tocsr()))
+
+    def _scores(self, weights: np.ndarray) -> dict[str, np.ndarray]:
+        # metrics for every row of *weights* (how often each holdout row is drawn), shape (b, n_models)
+        n = weights.sum(axis=1, keepdims=True)
+        counts = weights @ self._confusion
+        tp, fp, fn = counts[:, 0::3], counts[:, 1::3], counts[:, 2::3]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = {
+                "accuracy": (n - fp - fn) / n,
+                # zero_division=0, as sklearn reports it
+                "precision": np.where(tp + fp > 0, tp / (tp + fp), 0.0),
+                "recall": np.where(tp + fn > 0, tp / (tp + fn), 0.0),
+                "f1": np.where(2 * tp + fp + fn > 0, 2 * tp / (2 * tp + fp + fn), 0.0),
+            }
+            auc = np.empty_like(tp)
+            for j, (positives, negatives) in enumerate(self._groups):
+                # weighted positives / negatives per score group, groups in ascending score order
+                pos = (positives @ weights.T).T
+                neg = (negatives @ weights.T).T
+                below = np.cumsum(neg, axis=1) - neg
+                n_pos, n_neg = pos.sum(axis=1), neg.sum(axis=1)
+                auc[:, j] = (pos * (below + 0.5 * neg)).sum(axis=1) / (n_pos * n_neg)
+            scores["roc_auc"] = auc  # NaN if a resample has a single class
+        return scores
+
+    def metrics(self) -> pd.DataFrame:
+        """
+        Point estimates on the holdout set: one row per model, one column
+        per metric in ``METRICS``.
+        """
+        scores = self._scores(np.ones((1, len(self.y))))
+        return pd.DataFrame({metric: scores[metric][0] for metric in METRICS}, index=self.probabilities_.columns)
+
+    def bootstrap(
+        self,
+        n_resamples: int = 2000,
+        random_state: int | None = 42,
+        n_jobs: int | None = -1,
+        block_size: int | None = None,
+    ) -> "HoldoutEvaluator":
+        """
+        Draw *n_resamples* bootstrap resamples of the holdout rows and
+        compute every metric of every model on each (in place).
+
+        Parameters
+        ----------
+        n_resamples : int, default=2000
+        random_state : int | None, default=42
+        n_jobs : int | None, default=-1
+            Threads, one block of resamples each at a time; -1 uses all
+            CPU cores.
+        block_size : int | None, default=None
+            Resamples per block; by default about 4M weight entries per
+            block.
+
+        Returns
+        -------
+        HoldoutEvaluator
+            *self*; the per-resample scores are in ``bootstrap_``
+            ({metric: array of shape (n_resamples, n_models)}).
+        """
+        n_rows = len(self.y)
+        block_size = block_size or max(1, 4_000_000 // max(n_rows, 1))
+        blocks = [(start, min(block_size, n_resamples - start)) for start in range(0, n_resamples, block_size)]
+
+        def run(block):
+            start, size = block
+            rng = np.random.default_rng([random_state, start] if random_state is not None else None)
+            draws = rng.integers(n_rows, size=(size, n_rows))
+            draws += np.arange(size)[:, None] * n_rows
+            weights = np.bincount(draws.ravel(), minlength=size * n_rows).reshape(size, n_rows)
+            return self._scores(weights.astype(np.float64))
+
+        n_workers = min(_n_workers(n_jobs), len(blocks))
+        if n_workers == 1:
+            results = [run(block) for block in blocks]
+        else:
+            with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                results = list(pool.map(run, blocks))
+        self.bootstrap_ = {metric: np.concatenate([r[metric] for r in results]) for metric in METRICS}
+        return self
+
+    def _require_bootstrap(self):
+        if self.bootstrap_ is None:
+            raise RuntimeError("call bootstrap() first")
+
+    def confidence_intervals(self, confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Percentile bootstrap intervals.
+
+        Returns
+        -------
+        pd.DataFrame
+            Indexed by (model, metric); columns estimate (holdout value),
+            lower, upper and std (bootstrap standard error).
+        """
+        self._require_bootstrap()
+        alpha = (1 - confidence) / 2
+        estimates = self.metrics()
+        rows = {}
+        for j, name in enumerate(self.probabilities_.columns):
+            for metric in METRICS:
+                samples = self.bootstrap_[metric][:, j]
+                lower, upper = np.nanquantile(samples, [alpha, 1 - alpha])
+                rows[(name, metric)] = {"estimate": estimates.loc[name, metric], "lower": lower,
+                                        "upper": upper, "std": np.nanstd(samples)}
+        return pd.DataFrame.from_dict(rows, orient="index").rename_axis(["model", "metric"])
+
+    def compare(self, pairs: list[tuple[str, str]] | None = None, confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Paired comparison of models on the same bootstrap resamples.
+
+        Parameters
+        ----------
+        pairs : list[tuple[str, str]] | None, default=None
+            (model a, model b) pairs; all pairs by default.
+        confidence : float, default=0.95
+
+        Returns
+        -------
+        pd.DataFrame
+            Indexed by (model_a, model_b, metric); columns difference
+            (a - b on the holdout set), lower / upper (interval of the
+            difference) and p_value (two-sided bootstrap test of "no
+            difference": twice ``(k + 1) / (B + 1)`` for *k* of *B*
+            resamples on the rarer side of 0, so it is never 0).  All NaN
+            if no resample defines the metric for both models.
+        """
+        self._require_bootstrap()
+        names = list(self.probabilities_.columns)
+        pairs = pairs if pairs is not None else list(combinations(names, 2))
+        alpha = (1 - confidence) / 2
+        estimates = self.metrics()
+        rows = {}
+        for a, b in pairs:
+            i, j = names.index(a), names.index(b)
+            for metric in METRICS:
+                diff = self.bootstrap_[metric][:, i] - self.bootstrap_[metric][:, j]
+                diff = diff[~np.isnan(diff)]
+                if len(diff):
+                    lower, upper = np.quantile(diff, [alpha, 1 - alpha])
+                    extreme = min((diff <= 0).sum(), (diff >= 0).sum())
+                    p_value = min(1.0, 2 * (extreme + 1) / (len(diff) + 1))
+                else:
+                    lower = upper = p_value = np.nan
+                rows[(a, b, metric)] = {"difference": estimates.loc[a, metric] - estimates.loc[b, metric],
+                                        "lower": lower, "upper": upper, "p_value": p_value}
+        return pd.DataFrame.from_dict(rows, orient="index").rename_axis(["model_a", "model_b", "metric"])
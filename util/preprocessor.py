@@ -0,0 +1,390 @@
+from __future__ import annotations
+import copy
+from typing import Iterator
+import numpy as np
+import pandas as pd
+
+from util.feature_engineering import (
+    FLAG_COLUMNS, feature_engineering, parallel_feature_engineering, low_activity_agents,
+)
+from util.encode import encode, ONEHOT_COLS, FREQUENCY_COLS, CIRCULAR_COLS
+from util.data_cleaning import MODE_COLS, fit_cleaning, apply_cleaning
+from util.handle_outlier import handle_outlier, OUTLIER_RULES
+from util.data_scaling import scale, scaler_class
+from util.compact import memory_footprint
+
+# ID / count columns that are integers in some chunks and float (with NaN) in others;
+# read them as float everywhere so chunks encode like the whole file
+CSV_DTYPES = {"agent": "float64", "children": "float64", "company": "float64"}
+
+
+class BookingPreprocessor:
+    """
+    Fit/transform version of the ``main.py`` preprocessing flow.
+
+    ``fit`` learns every statistic of the pipeline once, on the training
+    split; ``transform`` then applies feature engineering, encoding,
+    cleaning and scaling to any batch in a single pass without re-fitting,
+    so that the output columns are identical for every batch.
+
+    Learned state (available after ``fit``)
+    ---------------------------------------
+    rare_agents_ : pd.Index
+        Agent IDs flagged by ``is_low_activity_agent``.
+    encoding_params_ : dict
+        {"onehot": categories, "frequency": count maps, "circular": maxima},
+        as returned by ``encode(..., return_params=True)``.
+    modes_ : dict
+        Training-set modes used to fill NaNs in ``MODE_COLS``.
+    scaler_ : sklearn scaler
+        Scaler fitted on the outlier-filtered training data.
+    scaled_columns_ : list[str]
+        Columns transformed by ``scaler_`` (every numeric feature).
+    binary_columns_ : list[str]
+        0/1 columns: ``FLAG_COLUMNS`` and the one-hot dummies.
+    exact_binary_columns_ : list[str]
+        Binary columns the scaler provably leaves at 0 / 1 (min-max
+        scaling, both values seen in training); ``uint8`` in compact mode.
+    columns_ : list[str]
+        Output columns, in order (the target is included when present).
+    memory_report_ : dict
+        Bytes used by the training data after each stage of ``fit``
+        (raw, feature_engineering, encode, clean, handle_outlier, scale).
+
+    Parameters
+    ----------
+    scaling_method : {'standard', 'minmax', 'robust'}, default='minmax'
+        Passed to ``util.data_scaling.scale``.
+    onehot_cols, frequency_cols, circular_cols : list[str]
+        Columns per encoding method (defaults from ``util.encode``).
+    target : str, default='is_canceled'
+        Label column; kept as is (never scaled) and optional in ``transform``.
+    low_activity_agent_threshold : int, default=1000
+        Agents with fewer training bookings than this are low-activity.
+    drop_outliers : bool, default=True
+        Apply ``handle_outlier`` to the training data before fitting the scaler.
+    outlier_rules : list[tuple], default=OUTLIER_RULES
+        ``(column, comparison, threshold)`` rules passed to ``handle_outlier``.
+    compact : bool, default=False
+        Memory-lean output: binary columns are ``uint8`` and all other
+        features ``float32`` up to scaling.  Every feature is scaled as
+        usual; afterwards the ``exact_binary_columns_`` are ``uint8`` again
+        and everything else ``float32``.  Several times smaller than the
+        default all-``float64`` output (see ``memory_report_``).
+    n_jobs : int, default=1
+        Worker processes for feature engineering (``parallel_feature_engineering``);
+        -1 uses all CPU cores.  The output does not depend on it.
+
+    Example
+    -------
+    >>> preprocessor = BookingPreprocessor(scaling_method="minmax")
+    >>> train_data = preprocessor.fit_transform(train_raw)
+    >>> val_data = preprocessor.transform(val_raw)
+
+    Files that do not fit in memory can be processed chunk by chunk:
+
+    >>> preprocessor = BookingPreprocessor().fit_csv("train.csv", chunksize=100_000)
+    >>> preprocessor.transform_csv("nightly_extract.csv", "nightly_prepared.csv")
+    """
+
+    def __init__(
+        self,
+        scaling_method: str = "minmax",
+        onehot_cols: list[str] = ONEHOT_COLS,
+        frequency_cols: list[str] = FREQUENCY_COLS,
+        circular_cols: list[str] = CIRCULAR_COLS,
+        target: str = "is_canceled",
+        low_activity_agent_threshold: int = 1000,
+        drop_outliers: bool = True,
+        outlier_rules: list[tuple] = OUTLIER_RULES,
+        compact: bool = False,
+        n_jobs: int = 1,
+    ) -> None:
+        self.scaling_method = scaling_method
+        self.onehot_cols = list(onehot_cols)
+        self.frequency_cols = list(frequency_cols)
+        self.circular_cols = list(circular_cols)
+        self.target = target
+        self.low_activity_agent_threshold = low_activity_agent_threshold
+        self.drop_outliers = drop_outliers
+        self.outlier_rules = [tuple(rule) for rule in outlier_rules]
+        self.compact = compact
+        self.n_jobs = n_jobs
+
+    # ------------------------------------------------------------------ fit
+    def fit(self, train: pd.DataFrame) -> "BookingPreprocessor":
+        """
+        Learn all preprocessing state from the raw training split.
+
+        Parameters
+        ----------
+        train : pd.DataFrame
+            Raw bookings in the ``hotel_bookings.csv`` schema (left unmodified).
+
+        Returns
+        -------
+        BookingPreprocessor
+            The fitted preprocessor (*self*).
+        """
+        self._fit(train)
+        return self
+
+    def fit_transform(self, train: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fit on *train* and return it preprocessed (outliers removed if
+        *drop_outliers*), without running the pipeline a second time.
+        """
+        return self._fit(train)
+
+    def _fit(self, train: pd.DataFrame) -> pd.DataFrame:
+        self.memory_report_ = {"raw": memory_footprint(train)}
+        self.rare_agents_ = low_activity_agents(train, self.low_activity_agent_threshold)
+        df = self._engineer(train.copy())
+        self.memory_report_["feature_engineering"] = memory_footprint(df)
+
+        self.encoding_params_ = {}
+        for method, columns in self._encoding_steps():
+            df, self.encoding_params_[method] = encode(
+                df, method=method, columns=columns, return_params=True, dtype=self._dummy_dtype())
+        self.binary_columns_ = self._binary_columns()
+        self.memory_report_["encode"] = memory_footprint(df)
+
+        self.modes_ = fit_cleaning(df)
+        df = apply_cleaning(df, self.modes_)
+        self._set_columns(df)
+        df = self._compact(df)
+        self.memory_report_["clean"] = memory_footprint(df)
+
+        if self.drop_outliers:
+            df = handle_outlier(df, self.outlier_rules)
+        self.memory_report_["handle_outlier"] = memory_footprint(df)
+
+        df, self.scaler_ = scale(df, method=self.scaling_method, columns=self.scaled_columns_, return_scaler=True)
+        self.exact_binary_columns_ = self._exact_binary_columns()
+        df = self._compact_scaled(df)
+        self.memory_report_["scale"] = memory_footprint(df)
+        return df
+
+    # ------------------------------------------------------------ transform
+    def transform(self, batch: pd.DataFrame, drop_invalid_rows: bool = True) -> pd.DataFrame:
+        """
+        Preprocess a raw batch with the state learned in ``fit``.
+
+        Rows violating the adults/babies consistency rule are dropped (as in
+        ``data_cleaning``) unless *drop_invalid_rows* is *False*; outliers
+        are not.  Categories unseen during
+        ``fit`` get all-zero dummies and a frequency of 0.
+
+        Parameters
+        ----------
+        batch : pd.DataFrame
+            Raw bookings in the ``hotel_bookings.csv`` schema, with or without
+            the target column (left unmodified).
+        drop_invalid_rows : bool, default=True
+            Set to *False* when scoring, so every input row gets an output row.
+
+        Returns
+        -------
+        pd.DataFrame
+            The preprocessed batch with columns ``columns_`` (minus the
+            target if *batch* does not contain it).
+        """
+        if not hasattr(self, "scaler_"):
+            raise RuntimeError("BookingPreprocessor is not fitted yet; call fit() first")
+
+        df = self._features(batch.copy(), drop_invalid_rows)
+        columns = [col for col in self.columns_ if col != self.target or col in df.columns]
+        df = self._compact(df.reindex(columns=columns, fill_value=0))
+        df[self.scaled_columns_] = self.scaler_.transform(df[self.scaled_columns_])
+        return self._compact_scaled(df)
+
+    # ------------------------------------------------------------ streaming
+    def fit_csv(self, path: str, chunksize: int = 100_000, **read_csv_kwargs) -> "BookingPreprocessor":
+        """
+        Fit on a raw training CSV without loading it into memory at once.
+
+        Two passes over the file are made, each holding one chunk at a time:
+        the first accumulates agent counts, category vocabularies, frequency
+        counts, circular maxima and mode counts; the second engineers,
+        encodes, cleans and outlier-filters every chunk and feeds it to the
+        scaler's ``partial_fit``.  The learned state equals that of
+        ``fit(pd.read_csv(path))``.  The preprocessor is only updated once
+        both passes have succeeded.
+
+        Parameters
+        ----------
+        path : str
+            Raw bookings CSV in the ``hotel_bookings.csv`` schema.
+        chunksize : int, default=100_000
+            Rows per chunk; bounds peak memory.
+        **read_csv_kwargs
+            Forwarded to ``pd.read_csv``; ``CSV_DTYPES`` are applied unless
+            overridden by *dtype*.
+
+        Returns
+        -------
+        BookingPreprocessor
+            The fitted preprocessor (*self*).
+        """
+        scaler_cls = scaler_class(self.scaling_method)
+        if scaler_cls is None or not hasattr(scaler_cls, "partial_fit"):
+            raise ValueError("streaming fit supports scaling_method 'standard' or 'minmax'")
+
+        # learned state is built on a copy: a failure part-way leaves self as it was
+        fitted = copy.copy(self)
+
+        # pass 1: statistics that only need counting
+        agent_counts = pd.Series(dtype="int64")
+        categories = {col: set() for col in self.onehot_cols}
+        frequencies = {col: pd.Series(dtype="int64") for col in self.frequency_cols}
+        maxima = {}
+        mode_counts = {col: pd.Series(dtype="int64") for col in MODE_COLS}
+        for chunk in _read_chunks(path, chunksize, **read_csv_kwargs):
+            agent_counts = agent_counts.add(
+                chunk["agent"].fillna("unknown").astype(str).value_counts(), fill_value=0)
+            df = feature_engineering(chunk, rare_agents=[])
+            for col in self.onehot_cols:
+                categories[col].update(df[col].dropna().unique().tolist())
+            for col in self.frequency_cols:
+                frequencies[col] = frequencies[col].add(df[col].value_counts(), fill_value=0)
+            for col in self.circular_cols:
+                maxima[col] = max(maxima.get(col, df[col].max()), df[col].max())
+            for col in MODE_COLS:
+                mode_counts[col] = mode_counts[col].add(df[col].value_counts(), fill_value=0)
+
+        fitted.rare_agents_ = agent_counts[agent_counts < self.low_activity_agent_threshold].index
+        fitted.encoding_params_ = {
+            "onehot": {col: sorted(values) for col, values in categories.items()},
+            "frequency": {col: counts.astype("int64").to_dict() for col, counts in frequencies.items()},
+            "circular": maxima,
+        }
+        # Series.mode() picks the smallest of tied values; do the same
+        fitted.modes_ = {
+            col: counts[counts == counts.max()].sort_index().index[0]
+            for col, counts in mode_counts.items()
+        }
+        fitted.binary_columns_ = fitted._binary_columns()
+
+        # pass 2: scaler parameters on the engineered, cleaned, outlier-free rows
+        fitted.scaler_ = scaler_cls()
+        fitted.columns_ = None
+        for chunk in _read_chunks(path, chunksize, **read_csv_kwargs):
+            df = fitted._features(chunk)
+            if fitted.columns_ is None:
+                fitted._set_columns(df)
+            df = fitted._compact(df)
+            if self.drop_outliers:
+                df = handle_outlier(df, self.outlier_rules)
+            if df.empty:
+                continue
+            fitted.scaler_.partial_fit(df[fitted.scaled_columns_])
+        if fitted.columns_ is None:
+            raise ValueError(f"no usable training rows in {path}")
+        fitted.exact_binary_columns_ = fitted._exact_binary_columns()
+        self.__dict__.update(fitted.__dict__)
+        return self
+
+    def transform_csv(
+        self,
+        path: str,
+        out_path: str,
+        chunksize: int = 100_000,
+        **read_csv_kwargs,
+    ) -> int:
+        """
+        Stream a raw CSV through ``transform`` and append each preprocessed
+        chunk to *out_path*, so peak memory is bounded by *chunksize*.
+
+        Parameters
+        ----------
+        path : str
+            Raw bookings CSV in the ``hotel_bookings.csv`` schema.
+        out_path : str
+            Destination CSV (overwritten; header written once).
+        chunksize : int, default=100_000
+            Rows per chunk.
+        **read_csv_kwargs
+            Forwarded to ``pd.read_csv``, as in ``fit_csv``.
+
+        Returns
+        -------
+        int
+            Number of rows written.
+        """
+        n_rows = 0
+        for i, chunk in enumerate(_read_chunks(path, chunksize, **read_csv_kwargs)):
+            df = self.transform(chunk)
+            df.to_csv(out_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+            n_rows += len(df)
+        return n_rows
+
+    # -------------------------------------------------------------- helpers
+    def _features(self, df: pd.DataFrame, drop_invalid_rows: bool = True) -> pd.DataFrame:
+        # feature engineering, encoding and cleaning with the fitted state
+        df = self._engineer(df)
+        for method, columns in self._encoding_steps():
+            df = encode(df, method=method, columns=columns, params=self.encoding_params_[method],
+                        dtype=self._dummy_dtype())
+        return apply_cleaning(df, self.modes_, drop_invalid_rows)
+
+    def _engineer(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.n_jobs == 1:
+            return feature_engineering(df, rare_agents=self.rare_agents_)
+        return parallel_feature_engineering(df, n_jobs=self.n_jobs, rare_agents=self.rare_agents_)
+
+    def _set_columns(self, df: pd.DataFrame) -> None:
+        self.columns_ = df.columns.tolist()
+        self.scaled_columns_ = [
+            col for col in df.select_dtypes(include="number").columns if col != self.target
+        ]
+
+    def _binary_columns(self) -> list[str]:
+        # known 0/1 columns by construction, never inferred from the training values
+        return [col for col in FLAG_COLUMNS if col != self.target] + self._dummy_columns()
+
+    def _exact_binary_columns(self) -> list[str]:
+        # min-max scaling maps 0 -> 0 and 1 -> 1 only if both values were seen in training
+        if self.scaling_method.lower() != "minmax":
+            return []
+        data_min = dict(zip(self.scaled_columns_, self.scaler_.data_min_))
+        data_max = dict(zip(self.scaled_columns_, self.scaler_.data_max_))
+        return [col for col in self.binary_columns_ if data_min.get(col) == 0 and data_max.get(col) == 1]
+
+    def _compact(self, df: pd.DataFrame) -> pd.DataFrame:
+        # before scaling: uint8 for the 0/1 columns, float32 for the other features
+        if not self.compact:
+            return df
+        dtypes = {col: np.float32 for col in self.scaled_columns_}
+        dtypes.update({col: np.uint8 for col in self.binary_columns_ if col in df.columns})
+        return df.astype(dtypes)
+
+    def _compact_scaled(self, df: pd.DataFrame) -> pd.DataFrame:
+        # after scaling: uint8 where the scaled values are still exactly 0 / 1, float32 elsewhere
+        if not self.compact:
+            return df
+        dtypes = {col: np.float32 for col in self.scaled_columns_}
+        dtypes.update({col: np.uint8 for col in self.exact_binary_columns_})
+        return df.astype(dtypes)
+
+    def _dummy_dtype(self) -> type:
+        return np.uint8 if self.compact else int
+
+    def _dummy_columns(self) -> list[str]:
+        return [
+            f"{col}_{category}"
+            for col, categories in self.encoding_params_["onehot"].items()
+            for category in categories[1:]
+        ]
+
+    def _encoding_steps(self) -> list[tuple[str, list[str]]]:
+        return [
+            ("onehot", self.onehot_cols),
+            ("frequency", self.frequency_cols),
+            ("circular", self.circular_cols),
+        ]
+
+
+def _read_chunks(path: str, chunksize: int, **read_csv_kwargs) -> Iterator[pd.DataFrame]:
+    # fixed dtypes: a chunk without missing agents would otherwise read them as int ("9" instead of "9.0")
+    dtype = {**CSV_DTYPES, **(read_csv_kwargs.pop("dtype", None) or {})}
+    return pd.read_csv(path, chunksize=chunksize, dtype=dtype, **read_csv_kwargs)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from util.preprocessor import BookingPreprocessor
+
+
+class CancellationScorer:
+    """
+    Warm scoring pipeline: a fitted ``BookingPreprocessor`` plus a fitted
+    classifier, loaded once and reused for every batch.
+
+    Parameters
+    ----------
+    preprocessor : BookingPreprocessor
+        Fitted preprocessor (e.g. ``preprocessor.joblib`` written by
+        ``util.dataset_store.prepare_splits``).
+    model : estimator
+        Fitted classifier with ``predict_proba`` (Random Forest, XGBoost,
+        ...) trained on the preprocessor's output.  If it was fitted on a
+        DataFrame, its ``feature_names_in_`` fix the column order.
+    """
+
+    def __init__(self, preprocessor: BookingPreprocessor, model) -> None:
+        self.preprocessor = preprocessor
+        self.model = model
+        names = getattr(model, "feature_names_in_", None)
+        self.feature_names = list(names) if names is not None else [
+            col for col in preprocessor.columns_ if col != preprocessor.target
+        ]
+        missing = set(self.feature_names) - set(preprocessor.columns_)
+        if missing:
+            raise ValueError(f"model expects columns the preprocessor does not produce: {sorted(missing)[:5]}")
+
+    @classmethod
+    def load(cls, preprocessor_path: str, model_path: str) -> "CancellationScorer":
+        """
+        Load a scorer from a joblib/pickle file each (``joblib.load`` reads both);
+        a ``.npz`` model is a ``util.compiled_forest.CompiledForest``.
+        """
+        import joblib
+        if str(model_path).endswith(".npz"):
+            from util.compiled_forest import CompiledForest
+            model = CompiledForest.load(model_path)
+        else:
+            model = joblib.load(model_path)
+        return cls(joblib.load(preprocessor_path), model)
+
+    def score(self, batch: pd.DataFrame) -> np.ndarray:
+        """
+        Cancellation probability for every row of *batch*.
+
+        Parameters
+        ----------
+        batch : pd.DataFrame
+            Raw bookings in the ``hotel_bookings.csv`` schema (the target
+            and the reservation_status columns are optional).
+
+        Returns
+        -------
+        np.ndarray
+            P(is_canceled = 1), one value per input row, in input order.
+        """
+        batch = _with_optional_columns(batch)
+        X = self.preprocessor.transform(batch, drop_invalid_rows=False)[self.feature_names]
+        return self.model.predict_proba(X)[:, 1]
+
+
+def _with_optional_columns(batch: pd.DataFrame) -> pd.DataFrame:
+    # columns feature_engineering drops anyway may be absent in scoring requests; the nullable
+    # ID / count columns are float64 in training (NaN), but arrive as int when a batch has no
+    # nulls or as object when it has only nulls: agent 9 must encode as "9.0", as in training
+    missing = {col: np.nan for col in ("company", "reservation_status", "reservation_status_date") if col not in batch}
+    numeric = {col: pd.to_numeric(batch[col]).astype(np.float64) for col in ("children", "agent") if col in batch}
+    return batch.assign(**missing, **numeric)
+
+
+class MicroBatcher:
+    """
+    Collect concurrent scoring requests into larger batches.
+
+    Requests are queued; a background thread takes the first waiting request
+    and keeps adding requests until *max_batch_rows* rows are collected or
+    *max_wait_ms* has passed, scores them with one call and resolves every
+    request's future with its slice of the result.  This amortises the
+    per-call overhead of pandas and the model over many small requests.
+
+    Parameters
+    ----------
+    score : callable
+        ``score(batch: pd.DataFrame) -> np.ndarray`` (e.g. ``CancellationScorer.score``).
+    max_batch_rows : int, default=4096
+        Upper bound on rows per scoring call (one large request may exceed it).
+    max_wait_ms : float, default=5.0
+        How long to wait for more requests once one is queued.
+    """
+
+    def __init__(self, score, max_batch_rows: int = 4096, max_wait_ms: float = 5.0) -> None:
+        self._score = score
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self._queue: queue.Queue = queue.Queue()
+        # guards _closed, so no request is queued behind the stop marker
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, batch: pd.DataFrame) -> Future:
+        """
+        Queue *batch* for scoring; the future resolves to its probabilities.
+
+        Raises
+        ------
+        RuntimeError
+            If the batcher has been closed.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put((batch, future))
+        return future
+
+    def score(self, batch: pd.DataFrame, timeout: float | None = None) -> np.ndarray:
+        """
+        Blocking ``submit(batch).result(timeout)``.
+        """
+        return self.submit(batch).result(timeout)
+
+    def close(self) -> None:
+        """
+        Stop the background thread after the queued requests are served;
+        later ``submit`` calls raise ``RuntimeError``.
+        """
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            pending = [item]
+            n_rows = len(item[0])
+            deadline = time.perf_counter() + self.max_wait
+            stop = False
+            while n_rows < self.max_batch_rows:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                pending.append(item)
+                n_rows += len(item[0])
+            self._flush(pending)
+            if stop:
+                return
+
+    def _flush(self, pending: list) -> None:
+        try:
+            frames = [batch for batch, _ in pending]
+            probabilities = self._score(pd.concat(frames, ignore_index=True))
+        except Exception as exc:
+            if len(pending) > 1:
+                # score the requests one by one so a bad one does not fail the others
+                for item in pending:
+                    self._flush([item])
+            else:
+                pending[0][1].set_exception(exc)
+            return
+        start = 0
+        for batch, future in pending:
+            future.set_result(probabilities[start:start + len(batch)])
+            start += len(batch)
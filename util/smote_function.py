@@ -1,5 +1,3 @@
-from imblearn.over_sampling import SMOTE
-
 def apply_smote(X, y, sampling_strategy='auto', k_neighbors=5, random_state=42, n_jobs=None):
     """
     Applies SMOTE (Synthetic Minority Over-sampling Technique) to balance class distribution.
@@ -26,7 +24,7 @@ def apply_smote(X, y, sampling_strategy='auto', k_neighbors=5, random_state=42,
         Controls randomness for reproducibility.
 
     n_jobs : int or None (default=None)
-        Number of CPU cores to use during resampling. Use -1 for all available cores.
+        Number of CPU cores to use for the nearest-neighbour search. Use -1 for all available cores.
 
     Returns:
     --------
@@ -36,11 +34,18 @@ def apply_smote(X, y, sampling_strategy='auto', k_neighbors=5, random_state=42,
     y_resampled : array-like
         Resampled target vector.
     """
+    from imblearn.over_sampling import SMOTE
+
+    if n_jobs is not None:
+        # SMOTE itself has no n_jobs in recent imbalanced-learn releases; pass it to the
+        # neighbour search, which is what SMOTE(k_neighbors=k) builds internally
+        from sklearn.neighbors import NearestNeighbors
+        k_neighbors = NearestNeighbors(n_neighbors=k_neighbors + 1, n_jobs=n_jobs)
+
     smote = SMOTE(
         sampling_strategy=sampling_strategy,
         k_neighbors=k_neighbors,
         random_state=random_state,
-        n_jobs=n_jobs
     )
     X_resampled, y_resampled = smote.fit_resample(X, y)
     return X_resampled, y_resampled
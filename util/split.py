@@ -1,4 +1,3 @@
-from sklearn.model_selection import train_test_split
 import pandas as pd
 
 def split_df(
@@ -30,6 +29,8 @@ def split_df(
     tuple[pd.DataFrame, pd.DataFrame]
         (train_df, test_df)
     """
+    from sklearn.model_selection import train_test_split
+
     train_df, test_df = train_test_split(
         df,
         test_size=test_size,
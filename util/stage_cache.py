@@ -0,0 +1,291 @@
+from __future__ import annotations
+import functools
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+
+def fingerprint(obj: Any) -> str:
+    """
+    Content hash of a stage input.
+
+    DataFrames / Series / Index objects are hashed by values, index, names
+    and dtypes (``pd.util.hash_pandas_object``); NumPy arrays by their bytes
+    (object arrays element by element); dicts, lists, tuples and sets by
+    their items, recursively, so frames and arrays nested in containers are
+    hashed by content too.  Scalars (``None``, bool, int, float, str,
+    bytes, NumPy scalars), paths, dtypes and classes / functions (by
+    qualified name) are hashed by value.
+
+    Parameters
+    ----------
+    obj : Any
+        Stage argument.
+
+    Returns
+    -------
+    str
+        Hex SHA-256 digest.
+
+    Raises
+    ------
+    TypeError
+        If *obj* (or an item of it) has no stable serialization; a ``repr``
+        may contain memory addresses or omit the data.
+    """
+    digest = hashlib.sha256()
+    _update(digest, obj)
+    return digest.hexdigest()
+
+
+def _update(digest, obj: Any) -> None:
+    # every value is prefixed with its type, so e.g. 1, 1.0, True and "1" differ
+    digest.update(type(obj).__name__.encode() + b":")
+    if isinstance(obj, pd.DataFrame):
+        digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        digest.update(repr(list(zip(obj.columns, obj.dtypes.astype(str)))).encode())
+    elif isinstance(obj, pd.Series):
+        digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        digest.update(repr((obj.name, str(obj.dtype))).encode())
+    elif isinstance(obj, pd.Index):
+        digest.update(pd.util.hash_pandas_object(obj).to_numpy().tobytes())
+        digest.update(repr((obj.names, str(obj.dtype))).encode())
+    elif isinstance(obj, np.ndarray):
+        digest.update(repr((obj.shape, str(obj.dtype))).encode())
+        if obj.dtype.hasobject:
+            _update(digest, obj.ravel().tolist())
+        else:
+            digest.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        # order-independent: items sorted by the hash of their key
+        items = sorted((fingerprint(key), value) for key, value in obj.items())
+        _update(digest, items)
+    elif isinstance(obj, (list, tuple)):
+        digest.update(str(len(obj)).encode())
+        for item in obj:
+            _update(digest, item)
+    elif isinstance(obj, (set, frozenset)):
+        _update(digest, sorted(fingerprint(item) for item in obj))
+    elif isinstance(obj, np.generic):
+        digest.update(str(obj.dtype).encode() + obj.tobytes())
+    elif obj is None or isinstance(obj, (bool, int, float, str)):
+        digest.update(json.dumps(obj).encode())
+    elif isinstance(obj, bytes):
+        digest.update(obj)
+    elif isinstance(obj, (Path, np.dtype)):
+        digest.update(str(obj).encode())
+    elif isinstance(obj, type) or inspect.isfunction(obj) or inspect.isbuiltin(obj):
+        digest.update(f"{obj.__module__}.{obj.__qualname__}".encode())
+    else:
+        raise TypeError(f"cannot fingerprint {type(obj).__name__!r}: no stable serialization")
+
+
+def source_digest(modules: list[str]) -> str:
+    """
+    SHA-256 of the source code of *modules* (dotted names), for keys that
+    must change whenever the code producing the cached data changes.
+    """
+    digest = hashlib.sha256()
+    for name in modules:
+        digest.update(name.encode())
+        digest.update(inspect.getsource(importlib.import_module(name)).encode())
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    On-disk cache of pipeline stage outputs with size-based LRU eviction.
+
+    Every entry is one pickle file named after its key.  A hit refreshes the
+    file's modification time; when the total size exceeds *max_bytes* the
+    least recently used entries are deleted first.
+
+    Parameters
+    ----------
+    cache_dir : str | Path, default='.stage_cache'
+        Directory holding the entries (created if missing).
+    max_bytes : int, default=2 GiB
+        Size budget of the directory.
+    """
+
+    def __init__(self, cache_dir: str | Path = ".stage_cache", max_bytes: int = 2 * 1024**3) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """
+        Return *(True, value)* on a hit, *(False, None)* on a miss.
+
+        An entry that cannot be read or unpickled (truncated, corrupt, or
+        pickled by incompatible library versions) is a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except Exception:  # unpickling can raise nearly anything, e.g. AttributeError or ValueError
+            return False, None
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass  # evicted by another process since it was read; the value is still valid
+        return True, value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store *value* under *key* (atomically), then evict down to *max_bytes*.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)  # e.g. unpicklable value or full disk
+            raise
+        self.evict()
+
+    def evict(self) -> list[str]:
+        """
+        Delete least recently used entries until the cache fits *max_bytes*.
+
+        Returns
+        -------
+        list[str]
+            Keys of the deleted entries.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[0])
+        total = sum(size for _, size, _ in entries)
+        evicted = []
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted.append(path.stem)
+        return evicted
+
+    def size(self) -> int:
+        """
+        Total size of the cached entries in bytes.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        # (mtime, size, path) of every entry; entries deleted meanwhile by another process are skipped
+        entries = []
+        for path in self.cache_dir.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def clear(self) -> None:
+        """
+        Delete every entry.
+        """
+        for path in self.cache_dir.glob("*.pkl"):
+            path.unlink(missing_ok=True)
+
+
+_default_cache: StageCache | None = None
+
+
+def default_cache() -> StageCache:
+    """
+    Process-wide ``StageCache`` in ``.stage_cache`` (created on first use).
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = StageCache()
+    return _default_cache
+
+
+def _code_digest(func: Callable) -> str:
+    # source of the stage's module (helpers included); a stage defined where no module
+    # source is available (a notebook cell, the interactive prompt) falls back to its own source
+    try:
+        return source_digest([func.__module__])
+    except (AttributeError, ImportError, OSError, TypeError):
+        pass
+    try:
+        return hashlib.sha256(inspect.getsource(func).encode()).hexdigest()
+    except (OSError, TypeError):
+        return ""
+
+
+def memoize_stage(func: Callable, cache: StageCache | None = None, name: str | None = None) -> Callable:
+    """
+    Wrap a ``util`` stage so that its output is cached by input fingerprint.
+
+    The key combines the stage name, the source code of the stage's module
+    and the fingerprint of every bound argument, i.e. the input frame(s)
+    and parameters such as ``method``, ``columns``, ``test_size`` or
+    ``random_state``.  A repeated call with the same inputs and unchanged
+    code loads the stored output instead of running the stage; an edit to
+    the stage's module gives new keys.  Code the stage calls in other
+    modules is not part of the key.
+
+    Stages that modify their input in place (``feature_engineering``) only
+    do so on a cache miss; always use the return value.
+
+    Parameters
+    ----------
+    func : Callable
+        Stage function, e.g. ``util.encode.encode``.
+    cache : StageCache | None, default=None
+        Cache to use; ``default_cache()`` if *None*.
+    name : str | None, default=None
+        Stage name in the key; defaults to ``module.qualname`` of *func*.
+        Bump it (e.g. 'encode-v2') when code outside the stage's module
+        changes its output.
+
+    Returns
+    -------
+    Callable
+        The memoized stage, with the same signature as *func*.
+
+    Example
+    -------
+    >>> from util.encode import encode, ONEHOT_COLS
+    >>> cached_encode = memoize_stage(encode)
+    >>> df = cached_encode(df, method="onehot", columns=ONEHOT_COLS)
+    """
+    signature = inspect.signature(func)
+    stage_name = name or f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        digest = hashlib.sha256(stage_name.encode())
+        digest.update(_code_digest(func).encode())
+        for arg_name, value in bound.arguments.items():
+            digest.update(arg_name.encode())
+            digest.update(fingerprint(value).encode())
+        key = digest.hexdigest()
+
+        store = cache or default_cache()
+        hit, value = store.get(key)
+        if hit:
+            return value
+        value = func(*args, **kwargs)
+        store.put(key, value)
+        return value
+
+    return wrapper
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# objective → what is maximised (cost is minimised); see optimize_thresholds
+OBJECTIVES = ["f1", "youden", "accuracy", "cost", "recall"]
+
+
+def _candidates(y: np.ndarray, proba: np.ndarray, codes: np.ndarray) -> pd.DataFrame:
+    # confusion counts at every distinct score of every segment, one sort for all segments
+    order = np.lexsort((-proba, codes))
+    y, proba, codes = y[order], proba[order], codes[order]
+    n_rows = len(y)
+    if n_rows == 0:
+        columns = {"threshold": np.float64, "tp": np.int64, "fp": np.int64, "code": codes.dtype,
+                   "fn": np.int64, "tn": np.int64}
+        return pd.DataFrame({name: np.array([], dtype=dtype) for name, dtype in columns.items()})
+
+    cum_tp = np.cumsum(y)
+    cum_fp = np.cumsum(~y)
+    # first position of every segment and the counts before it
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], n_rows] - 1
+    base_tp = np.r_[0, cum_tp][starts]
+    base_fp = np.r_[0, cum_fp][starts]
+    positives = cum_tp[ends] - base_tp
+    negatives = cum_fp[ends] - base_fp
+
+    # a candidate is the last row of a run of equal scores within a segment; its threshold is
+    # the next lower score of the segment (-inf after the lowest), so "probability > threshold"
+    # predicts exactly the rows up to it, as sklearn's predict and HoldoutEvaluator do
+    new_segment = np.r_[codes[1:] != codes[:-1], True]
+    last = np.r_[proba[1:] != proba[:-1], True] | new_segment
+    positions = np.flatnonzero(last)
+    segment = np.searchsorted(starts, positions, side="right") - 1
+    tp = cum_tp[positions] - base_tp[segment]
+    fp = cum_fp[positions] - base_fp[segment]
+    below = np.where(new_segment[positions], -np.inf, np.r_[proba[1:], -np.inf][positions])
+
+    # plus "no row positive" (threshold = the highest score) first in every segment
+    n_segments = len(starts)
+    table = pd.DataFrame({
+        "segment": np.r_[np.arange(n_segments), segment],
+        "threshold": np.r_[proba[starts], below],
+        "tp": np.r_[np.zeros(n_segments, dtype=np.int64), tp],
+        "fp": np.r_[np.zeros(n_segments, dtype=np.int64), fp],
+    })
+    table = table.iloc[np.argsort(table["segment"].to_numpy(), kind="stable")].reset_index(drop=True)
+    table["code"] = codes[starts][table["segment"]]
+    table["fn"] = positives[table["segment"]] - table["tp"]
+    table["tn"] = negatives[table["segment"]] - table["fp"]
+    return table.drop(columns="segment")
+
+
+def _with_rates(table: pd.DataFrame) -> pd.DataFrame:
+    tp, fp, fn, tn = (table[c].to_numpy(dtype=np.float64) for c in ("tp", "fp", "fn", "tn"))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # zero_division=0, as sklearn reports it
+        table["precision"] = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        table["recall"] = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        table["fpr"] = np.where(fp + tn > 0, fp / (fp + tn), 0.0)
+        table["f1"] = np.where(2 * tp + fp + fn > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+        table["accuracy"] = (tp + tn) / (tp + fp + fn + tn)
+    return table
+
+
+def threshold_curve(y, proba) -> pd.DataFrame:
+    """
+    Confusion counts and rates at every distinct predicted probability.
+
+    Parameters
+    ----------
+    y : array-like
+        True labels (0 / 1).
+    proba : array-like
+        Predicted P(is_canceled = 1).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per candidate threshold, from "no booking predicted
+        canceled" (threshold = the highest probability) down to "every
+        booking" (threshold -inf); a booking is predicted canceled if its
+        probability is ``> threshold``, the rule of sklearn's ``predict``
+        and of ``HoldoutEvaluator``.
+        Columns threshold, tp, fp, fn, tn, precision, recall, fpr, f1 and
+        accuracy.
+    """
+    y, proba = np.asarray(y).astype(bool), np.asarray(proba, dtype=np.float64)
+    table = _candidates(y, proba, np.zeros(len(y), dtype=np.int64)).drop(columns="code")
+    return _with_rates(table)
+
+
+def optimize_thresholds(
+    y,
+    proba,
+    segments: pd.DataFrame | pd.Series | None = None,
+    by: list[str | list[str]] | None = None,
+    objectives: list[str] | None = None,
+    cost_fp: float = 1.0,
+    cost_fn: float = 1.0,
+    min_precision: float | None = None,
+    min_rows: int = 1,
+) -> pd.DataFrame:
+    """
+    Best decision threshold per segment for several objectives.
+
+    The probabilities are sorted once (per segment, in the same sort); the
+    confusion counts at every distinct probability of every segment are
+    then cumulative sums, so all segments, candidates and objectives cost
+    O(n log n) in total and nothing is predicted again.
+
+    Parameters
+    ----------
+    y : array-like
+        True labels (0 / 1) of the holdout rows.
+    proba : array-like
+        Cached P(is_canceled = 1) of the same rows, e.g. a column of
+        ``HoldoutEvaluator.probabilities_``.
+    segments : pd.DataFrame | pd.Series | None, default=None
+        Segment labels of the rows (e.g. the raw ``hotel`` and
+        ``market_segment`` columns), aligned with *y*.  Rows with a missing
+        label in any column of a segmentation are left out of it.
+    by : list[str | list[str]] | None, default=None
+        Segmentations to optimise: a column name or a list of names (their
+        combinations); by default each column of *segments* on its own.
+        The whole holdout set ("all") is always included.
+    objectives : list[str] | None, default=None
+        Any of ``OBJECTIVES`` (all by default):
+
+        - **f1** – maximise F1;
+        - **youden** – maximise recall − false-positive rate;
+        - **accuracy** – maximise accuracy;
+        - **cost** – minimise ``cost_fp · FP + cost_fn · FN``, e.g. the cost
+          of walking a guest after overbooking (false positive) against an
+          empty room (false negative);
+        - **recall** – maximise recall, meaningful with *min_precision*.
+    cost_fp, cost_fn : float, default=1.0
+        Costs of the *cost* objective.
+    min_precision : float | None, default=None
+        Only consider thresholds with at least this precision (for every
+        objective).
+    min_rows : int, default=1
+        Skip segments with fewer holdout rows.
+
+    Returns
+    -------
+    pd.DataFrame
+        Indexed by (grouping, segment, objective); columns threshold
+        (predict canceled if probability ``> threshold``, as
+        ``HoldoutEvaluator(threshold=...)`` does; -inf: always),
+        value (of the objective), n_rows, tp, fp, fn, tn, precision,
+        recall, fpr, f1, accuracy and cost.  Ties go to the highest
+        threshold.
+    """
+    objectives = OBJECTIVES if objectives is None else objectives
+    unknown = set(objectives) - set(OBJECTIVES)
+    if unknown:
+        raise ValueError(f"unknown objectives {sorted(unknown)}; choose from {OBJECTIVES}")
+    y, proba = np.asarray(y).astype(bool), np.asarray(proba, dtype=np.float64)
+    if len(y) != len(proba):
+        raise ValueError(f"{len(proba)} probabilities but {len(y)} labels")
+
+    if isinstance(segments, pd.Series):
+        segments = segments.to_frame()
+    if segments is not None:
+        if len(segments) != len(y):
+            raise ValueError(f"segments has {len(segments)} rows but y has {len(y)}")
+        segments = segments.reset_index(drop=True)
+    groupings = [("all", None)] + [
+        (" × ".join(cols), cols) for cols in ([c] if isinstance(c, str) else list(c)
+                                              for c in (by if by is not None else
+                                                        (segments.columns if segments is not None else [])))
+    ]
+
+    results = []
+    for grouping, cols in groupings:
+        if cols is None:
+            codes, labels = np.zeros(len(y), dtype=np.int64), np.array(["all"], dtype=object)
+        elif len(cols) == 1:
+            codes, labels = pd.factorize(segments[cols[0]])
+            labels = np.asarray(labels, dtype=object)
+        else:
+            codes, uniques = pd.factorize(pd.MultiIndex.from_frame(segments[cols]))
+            labels = np.array([" / ".join(map(str, key)) for key in uniques], dtype=object)
+            # as in the single-column case: a missing label in any column leaves the row unsegmented
+            codes[segments[cols].isna().any(axis=1).to_numpy()] = -1
+        keep = codes >= 0  # rows without a segment label
+        table = _with_rates(_candidates(y[keep], proba[keep], codes[keep]))
+        table["n_rows"] = table[["tp", "fp", "fn", "tn"]].sum(axis=1)
+        table = table[table["n_rows"] >= min_rows].reset_index(drop=True)
+        if table.empty:
+            continue
+        table["cost"] = cost_fp * table["fp"] + cost_fn * table["fn"]
+
+        allowed = np.ones(len(table), dtype=bool)
+        if min_precision is not None:
+            allowed = (table["precision"] >= min_precision).to_numpy()
+        values = {
+            "f1": table["f1"],
+            "youden": table["recall"] - table["fpr"],
+            "accuracy": table["accuracy"],
+            "cost": -table["cost"],
+            "recall": table["recall"],
+        }
+        chosen = []
+        for objective in objectives:
+            score = values[objective].where(allowed, -np.inf)
+            # rows are in descending threshold order per segment: idxmax keeps the highest threshold
+            best = score.groupby(table["code"]).idxmax().to_numpy()
+            best = best[allowed[best]]
+            rows = table.loc[best].assign(objective=objective, value=values[objective].loc[best])
+            if objective == "cost":
+                rows["value"] = rows["cost"]
+            chosen.append(rows)
+        if chosen:
+            # segments in order of appearance, objectives in the order asked for
+            rows = pd.concat(chosen)
+            rows = rows.iloc[np.argsort(rows["code"].to_numpy(), kind="stable")]
+            results.append(rows.assign(grouping=grouping, segment=labels[rows["code"].to_numpy()]))
+
+    columns = ["threshold", "value", "n_rows", "tp", "fp", "fn", "tn", "precision", "recall", "fpr", "f1",
+               "accuracy", "cost"]
+    if not results:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(results).set_index(["grouping", "segment", "objective"])[columns]